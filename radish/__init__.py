@@ -14,5 +14,6 @@ from .terrain import world, pick
 from .hookregistry import before, after
 from .stepregistry import step, given, when, then, steps
 from .customtyperegistry import custom_type, register_custom_type, TypeBuilder
+from .examplesproviderregistry import examples_provider
 from .extensionregistry import extension
 from .exceptions import ValidationError
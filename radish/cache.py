@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+
+"""
+    This module provides on-disk caches which are kept between radish runs
+"""
+
+import os
+import io
+import json
+import errno
+import shutil
+import hashlib
+import tempfile
+
+from . import __VERSION__
+from .compat import RE_PATTERN_TYPE, pickle
+from .customtyperegistry import CustomTypeRegistry
+from .matcher import StepMatch
+from .utils import get_func_code
+
+
+def get_cache_key(*parts):
+    """
+        Returns a hash over the given parts and the radish version
+
+        :param parts: the strings or bytes to hash
+
+        :rtype: str
+    """
+    digest = hashlib.sha1()
+    for part in (__VERSION__,) + parts:
+        if not isinstance(part, bytes):
+            part = part.encode("utf-8")
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def read_cache_file(path):
+    """
+        Reads the JSON content of the given cache file
+
+        :param str path: the path to the cache file
+
+        :returns: the content or None if the file is missing or corrupted
+    """
+    try:
+        with io.open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def write_cache_file(path, content):
+    """
+        Writes the given content as JSON to the given cache file.
+        The file is replaced atomically so that concurrent runs never
+        read a partially written cache.
+        Caches are optional - thus, errors are ignored.
+
+        :param str path: the path to the cache file
+        :param content: the JSON serializable content
+    """
+    try:
+        _write_file_atomically(path, json.dumps(content, ensure_ascii=False).encode("utf-8"))
+    except (TypeError, ValueError):
+        pass
+
+
+def _write_file_atomically(path, data):
+    """
+        Writes the given bytes to the given file by replacing it atomically.
+        Errors are ignored.
+
+        :param str path: the path to the file
+        :param bytes data: the data to write
+    """
+    directory = os.path.dirname(path)
+    try:
+        try:
+            os.makedirs(directory)
+        except OSError:
+            # another process may have created the directory in the meantime
+            if not os.path.isdir(directory):
+                raise
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with io.open(fd, "wb") as f:
+            f.write(data)
+        # os.replace does not exist in Python 2
+        getattr(os, "replace", os.rename)(tmp_path, path)
+    except (IOError, OSError):
+        pass
+
+
+def get_step_modules_key(module_paths, step_funcs=()):
+    """
+        Returns the key for the steps registered by the given modules.
+        It covers the source of the step modules, the modification time and size
+        of the other files implementing the given step functions - e.g. step
+        libraries imported by the step modules - and the registered custom types.
+
+        :param list module_paths: the paths of the loaded step modules
+        :param step_funcs: the registered step functions
+
+        :rtype: str
+    """
+    parts = []
+    for path in sorted(module_paths):
+        parts.append(os.path.abspath(path))
+        with open(path, "rb") as f:
+            parts.append(f.read())
+
+    module_paths = set(os.path.abspath(p) for p in module_paths)
+    step_func_paths = set(os.path.abspath(get_func_code(f).co_filename) for f in step_funcs
+                          if hasattr(f, "__code__") or hasattr(f, "func_code"))
+    for path in sorted(step_func_paths - module_paths):
+        parts.append(path)
+        try:
+            stat = os.stat(path)
+        except OSError:  # e.g. the step function is implemented in a zip archive
+            continue
+        parts.append(repr(stat.st_mtime))
+        parts.append(str(stat.st_size))
+
+    for name, func in sorted(CustomTypeRegistry().custom_types.items()):
+        parts.append(name)
+        parts.append(str(getattr(func, "pattern", None)))
+        parts.append("{0}.{1}".format(getattr(func, "__module__", None), getattr(func, "__name__", repr(func))))
+    return get_cache_key(*parts)
+
+
+def get_step_pattern_identity(pattern):
+    """
+        Returns the identity of the given registered step pattern
+        which can be stored in a cache file.
+
+        :param pattern: the registered step pattern
+
+        :rtype: tuple
+    """
+    if isinstance(pattern, RE_PATTERN_TYPE):
+        return ("regex", pattern.pattern, pattern.flags)
+    return ("parse", pattern, 0)
+
+
+def remove_cache_path(path):
+    """
+        Removes the given cache file or directory if it exists
+
+        :param str path: the path to remove
+    """
+    try:
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    except OSError as e:
+        if e.errno != errno.ENOENT:
+            raise
+
+
+class StepBindingCache(object):
+    """
+        Caches to which step pattern a step sentence is bound between radish runs.
+
+        The bindings are only valid as long as the key is the same - which is
+        derived from the source of the step modules and the custom types.
+        A missing, corrupted or stale cache file results in an empty cache.
+    """
+    VERSION = 1
+    FILENAME = "step-bindings.json"
+
+    def __init__(self, cache_dir, key):
+        self.path = os.path.join(cache_dir, self.FILENAME)
+        self.key = key
+        self.bindings = {}
+        self.hits = 0
+        self.misses = 0
+        self._changed = False
+        self._matches = {}
+        self._step_patterns = None
+        self._step_patterns_generation = None
+
+    def load(self):
+        """
+            Loads the bindings from the cache file
+
+            :returns: the cache itself
+        """
+        self.bindings = {}
+        content = read_cache_file(self.path)
+        if not isinstance(content, dict):
+            return self
+
+        if content.get("version") != self.VERSION or content.get("key") != self.key:
+            return self
+
+        bindings = content.get("bindings")
+        if not isinstance(bindings, dict):
+            return self
+
+        for sentence, identity in bindings.items():
+            if isinstance(identity, list) and len(identity) == 3 and isinstance(identity[2], int):
+                self.bindings[sentence] = (identity[0], identity[1], identity[2])
+        return self
+
+    def clear(self):
+        """
+            Removes all bindings and the cache file
+        """
+        self.bindings = {}
+        self._matches = {}
+        self._changed = False
+        remove_cache_path(self.path)
+
+    def save(self):
+        """
+            Writes the bindings to the cache file if they have changed
+        """
+        if not self._changed:
+            return
+
+        write_cache_file(self.path, {
+            "version": self.VERSION,
+            "key": self.key,
+            "bindings": self.bindings
+        })
+        self._changed = False
+
+    def _get_step_patterns(self, steps):
+        """
+            Returns the compiled step patterns of the given steps by their identity
+        """
+        if self._step_patterns is None or self._step_patterns_generation != steps.generation:
+            self._step_patterns = {
+                get_step_pattern_identity(p): s for p, s in steps.step_patterns.items()
+            }
+            self._step_patterns_generation = steps.generation
+        return self._step_patterns
+
+    def match(self, sentence, steps):
+        """
+            Matches the given sentence with the step pattern it was bound to.
+
+            :param string sentence: the step sentence to match
+            :param StepIndex steps: the registered steps
+
+            :returns: the match or None if the sentence is not bound
+            :rtype: StepMatch
+        """
+        # steps with the same sentence share the match
+        # so that their arguments are only evaluated once.
+        step_match = self._matches.get((sentence, steps.generation))
+        if step_match is not None:
+            self.hits += 1
+            return step_match
+
+        identity = self.bindings.get(sentence)
+        try:
+            step_pattern = self._get_step_patterns(steps).get(identity) if identity else None
+        except TypeError:  # the identity from a corrupted cache file is not hashable
+            step_pattern = None
+        result = step_pattern.search(sentence) if step_pattern else None
+        if not result:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        step_match = StepMatch(argument_match=result[0], func=step_pattern.func, step_pattern=step_pattern)
+        self._matches[(sentence, steps.generation)] = step_match
+        return step_match
+
+    def bind(self, sentence, step_match):
+        """
+            Binds the given sentence to the step pattern of the given match
+
+            :param string sentence: the step sentence
+            :param StepMatch step_match: the match of the sentence
+        """
+        identity = get_step_pattern_identity(step_match.step_pattern.pattern)
+        if self.bindings.get(sentence) != identity:
+            self.bindings[sentence] = identity
+            self._changed = True
+
+
+class FeatureCache(object):
+    """
+        Caches the parsed Features between radish runs.
+
+        Every feature file has its own cache file which contains the pickled Feature
+        with all its Scenarios - regardless of any tag expression.
+        The cached Feature is only valid as long as the key is the same - which is
+        derived from the path, modification time, size and content of the feature file
+        and the radish version. The language of a feature file is given by its content.
+    """
+    VERSION = 2
+    DIRECTORY = "features"
+
+    def __init__(self, cache_dir):
+        #: Holds the configured radish cache directory
+        self.cache_dir = cache_dir
+        self.directory = os.path.join(cache_dir, self.DIRECTORY)
+        self.hits = 0
+        self.misses = 0
+
+    def get_path(self, featurefile):
+        """
+            Returns the path to the cache file of the given feature file
+
+            :param str featurefile: the path to the feature file
+
+            :rtype: str
+        """
+        return os.path.join(self.directory, get_cache_key(os.path.abspath(featurefile)) + ".pickle")
+
+    @staticmethod
+    def get_key(featurefile, content):
+        """
+            Returns the key of the given feature file
+
+            :param str featurefile: the path to the feature file
+            :param bytes content: the content of the feature file
+
+            :rtype: str
+        """
+        stat = os.stat(featurefile)
+        return get_cache_key(os.path.abspath(featurefile), repr(stat.st_mtime), str(stat.st_size),
+                             hashlib.sha1(content).hexdigest(), str(FeatureCache.VERSION))
+
+    def load(self, featurefile, key):
+        """
+            Loads the cached Feature of the given feature file
+
+            :param str featurefile: the path to the feature file
+            :param str key: the current key of the feature file
+
+            :returns: the cached Feature or None if the cache file is missing, corrupted or stale
+            :rtype: Feature
+        """
+        try:
+            with io.open(self.get_path(featurefile), "rb") as f:
+                content = pickle.load(f)
+        except Exception:  # pylint: disable=broad-except
+            # unpickling a corrupted file can raise about any exception
+            content = None
+
+        if not isinstance(content, dict) or content.get("key") != key:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return content["feature"]
+
+    def save(self, featurefile, key, feature):
+        """
+            Writes the given parsed Feature to the cache file of the given feature file
+
+            :param str featurefile: the path to the feature file
+            :param str key: the key of the feature file
+            :param Feature feature: the parsed Feature
+        """
+        try:
+            data = pickle.dumps({"key": key, "feature": feature}, pickle.HIGHEST_PROTOCOL)
+        except Exception:  # pylint: disable=broad-except
+            # the Feature contains objects which cannot be pickled
+            return
+
+        _write_file_atomically(self.get_path(featurefile), data)
+
+    def clear(self):
+        """
+            Removes all cached Features
+        """
+        remove_cache_path(self.directory)
@@ -4,6 +4,8 @@
 This module provide Python 2 / Python 3 compatability
 """
 
+import re
+import abc
 import sys
 
 try:
@@ -11,6 +13,21 @@ try:
 except ImportError:
     from StringIO import StringIO
 
+# cPickle is the fast pickle implementation in Python 2
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+# os.scandir does not exist in Python < 3.5
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
 
 # flags to indicate Python versions
 PY2 = sys.version_info[0] == 2
@@ -18,6 +35,15 @@ PY2 = sys.version_info[0] == 2
 # RecursionError does not exist in Python < 3.5
 RecursionError = RuntimeError if sys.version_info < (3, 5) else RecursionError
 
+# re._pattern_type does not exist in Python >= 3.7
+RE_PATTERN_TYPE = type(re.compile(""))
+
+# abc.ABC does not exist in Python 2
+ABC = abc.ABCMeta("ABC", (object, ), {})
+
+# basestring does not exist in Python 3
+STRING_TYPES = (str, unicode) if PY2 else (str, )  # noqa: F821 pylint: disable=undefined-variable
+
 
 def u(text):  # pragma: no cover
     """
@@ -4,10 +4,17 @@
     Providing radish core functionality.
 """
 
+import io
+import os
+import multiprocessing
 from threading import Lock
 from collections import OrderedDict
 
-from .parser import FeatureParser
+from .parser import FeatureParser, PreconditionReference
+from .scenario import Scenario
+from .externalexamples import ExternalExamples
+from .exceptions import FeatureFileSyntaxError
+from .cache import FeatureCache
 
 
 class Configuration(object):
@@ -42,13 +49,17 @@ class Core(object):
     """
         Provide some core functionalities like parsing and storing of the feature files
     """
-    def __init__(self):
+    def __init__(self, feature_cache=None):
         self.features = []
         self._features_to_run = OrderedDict()
         self._feature_id_lock = Lock()
         self._feature_id = 0
         self._scenario_id_lock = Lock()
         self._scenario_id = 0
+        #: Holds the cache of the parsed features between runs - if any
+        self.feature_cache = feature_cache
+        #: Holds the parsed features of preconditions by their canonical path and tags
+        self._precondition_features = {}
 
     @property
     def features_to_run(self):
@@ -75,18 +86,62 @@ class Core(object):
             self._scenario_id += 1
             return self._scenario_id
 
-    def parse_features(self, feature_files, tag_expr):
+    def parse_features(self, feature_files, tag_expr, jobs=1):
         """
             Parses the given feature files
+
+            :param list feature_files: the feature files to parse
+            :param tag_expr: the tag expression to filter the Scenarios
+            :param int jobs: the amount of worker processes which parse the feature files.
+                             The feature files are parsed in this process if it's 1.
         """
+        if jobs > 1 and len(feature_files) > 1:
+            self._parse_features_in_parallel(feature_files, tag_expr, jobs)
+            return
+
         for featurefile in feature_files:
             feature = self.parse_feature(featurefile, tag_expr, featureid=self.next_feature_id)
+            self._add_feature_to_run(featurefile, feature)
 
-            if feature is not None:
-                for scenario in feature.scenarios:
-                    scenario.absolute_id = self.next_scenario_id
+    def _parse_features_in_parallel(self, feature_files, tag_expr, jobs):
+        """
+            Parses the given feature files in a pool of worker processes.
+
+            The feature and scenario ids are assigned in the order of the
+            feature files - exactly like the feature files were parsed in this process.
+            The workers don't resolve the preconditions. They are resolved in this process
+            in the order of the feature files so that every precondition feature is parsed once.
+        """
+        cache_dir = self.feature_cache.cache_dir if self.feature_cache is not None else None
+        tasks = [(featurefile, tag_expr, self.next_feature_id, cache_dir) for featurefile in feature_files]
+        pool = multiprocessing.Pool(min(jobs, len(tasks)))
+        try:
+            results = pool.map(parse_feature_file, tasks, chunksize=max(len(tasks) // (jobs * 4), 1))
+        finally:
+            pool.close()
+            pool.join()
+
+        for (featurefile, _, featureid, _), result in zip(tasks, results):
+            if result is None:
+                # parse the feature file again in this process to raise the error
+                feature = self.parse_feature(featurefile, tag_expr, featureid=featureid)
+            else:
+                feature, references, cache_hits, cache_misses = result
+                self._add_parsed_feature(featurefile, feature, references, tag_expr)
+                if self.feature_cache is not None:
+                    self.feature_cache.hits += cache_hits
+                    self.feature_cache.misses += cache_misses
+            self._add_feature_to_run(featurefile, feature)
+
+    def _add_feature_to_run(self, featurefile, feature):
+        """
+            Adds the given parsed feature to the features to run
+        """
+        if feature is not None:
+            for scenario in feature.scenarios:
+                scenario.absolute_id = self.next_scenario_id
 
-                self._features_to_run[featurefile] = feature
+            self._features_to_run[featurefile] = feature
 
     def parse_feature(self, featurefile, tag_expr, inherited_tags=None, featureid=0):
         """
@@ -96,11 +151,256 @@ class Core(object):
             :returns: the parsed feature
             :rtype: Feature
         """
-        featureparser = FeatureParser(self, featurefile, featureid, tag_expr, inherited_tags=inherited_tags)
-        feature = featureparser.parse()
+        feature, references = self.parse_feature_without_preconditions(featurefile, tag_expr, inherited_tags,
+                                                                       featureid)
+        self._add_parsed_feature(featurefile, feature, references, tag_expr)
+        return feature
+
+    def parse_feature_without_preconditions(self, featurefile, tag_expr, inherited_tags=None, featureid=0):
+        """
+            Parses the given feature file without resolving the preconditions from other feature files.
+            The parsed feature is not added to the parsed features.
+
+            :returns: the parsed feature or None if no scenario matches the tag expression
+                      and the references to the preconditions from other feature files
+            :rtype: tuple
+        """
+        if self.feature_cache is not None and not inherited_tags:
+            parsed = self._parse_cached_feature(featurefile, featureid, tag_expr)
+            if parsed is not None:
+                feature, references = parsed
+                return filter_scenarios(feature, tag_expr), references
+
+        # the language of feature files without language comment is detected from their first keyword
+        featureparser = FeatureParser(self, featurefile, featureid, tag_expr, inherited_tags=inherited_tags,
+                                      language=None)
+        feature = featureparser.parse(resolve_preconditions=False)
+        return feature, featureparser.precondition_references
+
+    def _add_parsed_feature(self, featurefile, feature, references, tag_expr):
+        """
+            Resolves the preconditions of the given parsed feature and adds it to the parsed features
+        """
+        if references:
+            self.resolve_preconditions(featurefile, feature, references, tag_expr)
+
+        if feature is not None:
+            self.features.append(feature)
+
+    def resolve_preconditions(self, featurefile, feature, references, tag_expr):
+        """
+            Resolves the preconditions of the given feature.
+
+            The feature files of the preconditions form a dependency graph which
+            is walked depth-first with an explicit stack: every precondition feature
+            is parsed once and resolved after all the precondition features it depends on.
+            A feature file which is required while it is still being resolved is a cycle.
+
+            :param str featurefile: the feature file of the given feature
+            :param Feature feature: the parsed feature or None if no scenario matched
+            :param list references: the precondition references of the feature file
+            :param tag_expr: the tag expression to filter the Scenarios
+
+            :raises FeatureFileSyntaxError: if the preconditions are cycling or
+                                            a precondition scenario does not exist
+        """
+        # every entry holds the canonical path, the reference which requires the feature,
+        # the precondition key, the feature, its precondition references and the references
+        # which are not visited yet
+        stack = [(os.path.realpath(featurefile), None, None, feature, references, iter(references))]
+        while stack:
+            _, _, key, feature, references, pending = stack[-1]
+            reference = next(pending, None)
+            if reference is not None:
+                self._check_precondition_cycle(stack, reference)
+                reference_key = self._get_precondition_key(reference, tag_expr)
+                if reference_key not in self._precondition_features:
+                    featureparser = FeatureParser(self, reference.featurefile, 0, tag_expr,
+                                                  inherited_tags=reference.inherited_tags, language=None)
+                    reference_feature = featureparser.parse(resolve_preconditions=False)
+                    stack.append((reference_key[0], reference, reference_key, reference_feature,
+                                  featureparser.precondition_references,
+                                  iter(featureparser.precondition_references)))
+                continue
+
+            # all precondition features of this feature are resolved
+            stack.pop()
+            for reference in references:
+                self._get_precondition_template(reference, tag_expr)
+
+            if feature is not None:
+                for scenario in feature.scenarios:
+                    self._replace_precondition_references(scenario, tag_expr)
+
+            if key is not None:
+                self._precondition_features[key] = feature
+                if feature is not None:
+                    self.features.append(feature)
+
+    @staticmethod
+    def _check_precondition_cycle(stack, reference):
+        """
+            Checks if the feature file of the given reference is being resolved already.
+
+            :raises FeatureFileSyntaxError: if the preconditions are cycling
+        """
+        path = os.path.realpath(reference.featurefile)
+        paths = [entry[0] for entry in stack]
+        if path not in paths:
+            return
+
+        cycle = [entry[1] for entry in stack[paths.index(path) + 1:]] + [reference]
+        raise FeatureFileSyntaxError("Your feature '{0}' has cycling preconditions: {1}".format(
+            cycle[0].path, " -> ".join(str(r) for r in cycle)))
+
+    @staticmethod
+    def _get_precondition_key(reference, tag_expr):
+        """
+            Returns the key of the precondition feature required by the given reference
+        """
+        return (os.path.realpath(reference.featurefile), tag_expr,
+                frozenset(t.name for t in reference.inherited_tags))
+
+    def _get_precondition_template(self, reference, tag_expr):
+        """
+            Returns the scenario of the precondition feature required by the given reference.
+            The precondition feature is shared by all scenarios which use it - thus, the
+            returned scenario must not be used directly but as template for the precondition.
+
+            :raises FeatureFileSyntaxError: if the precondition scenario does not exist
+        """
+        feature = self._precondition_features[self._get_precondition_key(reference, tag_expr)]
+        if feature is None or reference.scenario_sentence not in feature:
+            raise FeatureFileSyntaxError(
+                "Cannot import precondition scenario '{0}' from feature '{1}': "
+                "No such scenario".format(reference.scenario_sentence, reference.featurefile))
+
+        return feature[reference.scenario_sentence]
+
+    def _replace_precondition_references(self, scenario, tag_expr):
+        """
+            Replaces the precondition references of the given scenario and of its
+            preconditions with the precondition scenarios.
+
+            :returns: if any precondition reference was replaced
+            :rtype: bool
+        """
+        replaced = False
+        for index, precondition in enumerate(scenario.preconditions):
+            if isinstance(precondition, PreconditionReference):
+                # every scenario gets its own instance of the precondition scenario to run its steps
+                template = self._get_precondition_template(precondition, tag_expr)
+                scenario.preconditions[index] = template.create_instance()
+                replaced = True
+            elif self._replace_precondition_references(precondition, tag_expr):
+                replaced = True
 
+        if replaced:
+            # number the steps again now that the steps of the preconditions are known
+            Scenario.after_parse(scenario)
+        return replaced
+
+    def _parse_cached_feature(self, featurefile, featureid, tag_expr):
+        """
+            Loads the feature with all its scenarios from the feature cache.
+            If the feature is not cached yet it's parsed and written to the cache.
+
+            Features with preconditions from other feature files or external Examples are not cached
+            because they depend on other files. Features with preconditions from other feature files
+            are parsed again with the tag expression if there is one because the FeatureParser
+            skips the features which cannot match it - together with their preconditions.
+            Feature files which cannot be parsed are not cached either - they are
+            parsed without the cache to raise the error.
+
+            :returns: the feature and the references to the preconditions from other feature files
+                      or None if the feature file has to be parsed without the cache
+            :rtype: tuple
+        """
+        with io.open(featurefile, "rb") as f:
+            content = f.read()
+
+        key = FeatureCache.get_key(featurefile, content)
+        feature = self.feature_cache.load(featurefile, key)
+        references = []
         if feature is None:
-            return None
+            featureparser = FeatureParser(Core(), featurefile, featureid, language=None)
+            try:
+                feature = featureparser.parse(resolve_preconditions=False)
+            except Exception:  # pylint: disable=broad-except
+                return None
+
+            if feature is None:
+                return None
+
+            references = featureparser.precondition_references
+            if references and tag_expr:
+                return None
+
+            if not references and not has_external_examples(feature):
+                self.feature_cache.save(featurefile, key, feature)
+
+        feature.id = featureid
+        return feature, references
 
-        self.features.append(feature)
+
+def has_external_examples(feature):
+    """
+        Returns if a Scenario Outline of the given feature has Examples from an external source
+
+        :param Feature feature: the feature
+    """
+    return any(isinstance(getattr(s, "examples", None), ExternalExamples) for s in feature.scenarios)
+
+
+def filter_scenarios(feature, tag_expr):
+    """
+        Removes the scenarios which do not match the given tag expression from the given feature.
+        The scenarios are renumbered exactly like the FeatureParser numbers them
+        if it filters the scenarios while parsing.
+
+        :param Feature feature: the feature with all its scenarios
+        :param tag_expr: the tag expression or None
+
+        :returns: the feature or None if no scenario matches the tag expression
+        :rtype: Feature
+    """
+    if not tag_expr:
         return feature
+
+    feature.scenarios = [s for s in feature.scenarios
+                         if tag_expr.evaluate([t.name for t in s.tags + feature.tags])]
+    if not feature.scenarios:
+        return None
+
+    previous_scenario = None
+    for scenario in feature.scenarios:
+        if previous_scenario is None:
+            scenario.id = 1
+        else:
+            # the scenarios of Scenario Outlines and Loops are numbered when they are built
+            scenario.id = previous_scenario.id + len(getattr(previous_scenario, "scenarios", [])) + 1
+        previous_scenario = scenario
+    return feature
+
+
+def parse_feature_file(task):
+    """
+        Parses a feature file in a worker process without resolving its preconditions
+
+        :param tuple task: the feature file, the tag expression, the feature id and the cache directory
+
+        :returns: the parsed feature, the references to the preconditions from other feature files
+                  and the hits and misses of the feature cache
+                  or None if the feature file could not be parsed
+        :rtype: tuple
+    """
+    featurefile, tag_expr, featureid, cache_dir = task
+    core = Core(FeatureCache(cache_dir) if cache_dir is not None else None)
+    try:
+        feature, references = core.parse_feature_without_preconditions(featurefile, tag_expr, featureid=featureid)
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+    if core.feature_cache is None:
+        return feature, references, 0, 0
+    return feature, references, core.feature_cache.hits, core.feature_cache.misses
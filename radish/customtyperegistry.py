@@ -4,8 +4,14 @@
     This module provides the Argument-Expression Registry
 """
 
+import ast
+import operator
+import functools
+from collections import OrderedDict
+
 from singleton import singleton
 
+from .compat import PY2
 from .exceptions import RadishError
 
 from parse_type import TypeBuilder
@@ -18,6 +24,10 @@ class CustomTypeRegistry(object):
     """
     def __init__(self):
         self.custom_types = {}
+        #: Holds the generation of the custom types.
+        #  It's incremented on every change so that compiled
+        #  step patterns know when they have to be rebuilt.
+        self.generation = 0
 
     def register(self, name, func):
         """
@@ -27,18 +37,59 @@ class CustomTypeRegistry(object):
             raise RadishError("Cannot register custom type with name {0} because it already exists".format(name))
 
         self.custom_types[name] = func
+        self.generation += 1
+
+
+#: Holds the default maximum number of cached conversions per custom type
+DEFAULT_CACHE_SIZE = 1024
 
 
-def custom_type(name, pattern):
+def cached_custom_type(func, maxsize=DEFAULT_CACHE_SIZE):
+    """
+    Returns a custom type which caches the conversions of the given custom type.
+    The least recently used conversion is discarded if more than `maxsize` texts are cached.
+
+    Only custom types returning immutable values - or values which are
+    safe to be shared between steps - should be cached.
+
+    :param function func: the custom type
+    :param int maxsize: the maximum number of cached conversions
+    """
+    cache = OrderedDict()
+
+    @functools.wraps(func)
+    def _converter(text):
+        """
+        Converts the given text with the custom type if it's not cached
+        """
+        try:
+            value = cache.pop(text)
+        except KeyError:
+            value = func(text)
+            if len(cache) >= maxsize:
+                cache.popitem(last=False)
+        cache[text] = value
+        return value
+
+    _converter.cache = cache
+    return _converter
+
+
+def custom_type(name, pattern, cache=False, cache_size=DEFAULT_CACHE_SIZE):
     """
     Decorator for custom type pattern
+
+    :param str name: the name of the custom type
+    :param str pattern: the regex pattern the custom type matches
+    :param bool cache: cache the conversions of recurring texts
+    :param int cache_size: the maximum number of cached conversions
     """
     def _decorator(func):
         """
         Actual decorator
         """
         func.pattern = pattern
-        CustomTypeRegistry().register(name, func)
+        CustomTypeRegistry().register(name, cached_custom_type(func, cache_size) if cache else func)
 
         return func
     return _decorator
@@ -52,7 +103,64 @@ def register_custom_type(**kwargs):
         CustomTypeRegistry().register(name, func)
 
 
-@custom_type("MathExpression", r"[0-9 +\-*/%.e]+")
+#: Holds the operators allowed in math expressions
+MATH_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.div if PY2 else operator.truediv,  # pylint: disable=no-member
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+#: Holds the maximum exponent in math expressions to prevent endless calculations
+MAX_MATH_EXPONENT = 1024
+
+
+def evaluate_math_expression(text):
+    """
+    Evaluates the given arithmetic expression without using eval.
+    Only numbers and the operators from MATH_OPERATORS are allowed.
+
+    :param str text: the math expression
+
+    :returns: the result of the math expression
+    """
+    try:
+        expression = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError("Invalid math expression '{0}': {1}".format(text, e))
+
+    return _evaluate_math_node(expression.body, text)
+
+
+def _evaluate_math_node(node, text):
+    """
+    Evaluates a node of the syntax tree of a math expression
+    """
+    if isinstance(node, ast.BinOp) and type(node.op) in MATH_OPERATORS:
+        left = _evaluate_math_node(node.left, text)
+        right = _evaluate_math_node(node.right, text)
+        if isinstance(node.op, ast.Pow) and abs(right) > MAX_MATH_EXPONENT:
+            raise ValueError("Exponent of math expression '{0}' is too large".format(text))
+        return MATH_OPERATORS[type(node.op)](left, right)
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in MATH_OPERATORS:
+        return MATH_OPERATORS[type(node.op)](_evaluate_math_node(node.operand, text))
+
+    # ast.Num is deprecated since Python 3.8 in favor of ast.Constant
+    number = getattr(node, "value", getattr(node, "n", None))
+    if type(number) in (int, float) + ((long, ) if PY2 else ()):  # noqa: F821 pylint: disable=undefined-variable
+        return number
+
+    raise ValueError("Invalid math expression '{0}'".format(text))
+
+
+@custom_type("MathExpression", r"[0-9 +\-*/%.e]+", cache=True)
 def math_expression_type(text):
     """
     Custom Type which expects a valid math expression
@@ -62,7 +170,7 @@ def math_expression_type(text):
     :returns: calculated float number from the math expression
     :rtype: float
     """
-    return float(eval(text))
+    return float(evaluate_math_expression(text))
 
 
 @custom_type('QuotedString', r'"(?:[^"\\]|\\.)*"')
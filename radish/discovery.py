@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+"""
+    This module provides the discovery of the feature files in directories
+"""
+
+import io
+import os
+import re
+import fnmatch
+from multiprocessing.pool import ThreadPool
+
+from .compat import scandir
+
+
+#: Holds the name of the files with the patterns of the files and directories to ignore
+IGNORE_FILE = ".radishignore"
+
+#: Holds the pattern of the feature file names
+FEATURE_FILE_PATTERN = "*.feature"
+
+
+def read_ignore_file(path):
+    """
+        Reads the patterns of the given ignore file.
+        Empty lines and lines starting with a # are skipped.
+
+        :param str path: the path to the ignore file
+
+        :returns: the patterns
+        :rtype: list
+    """
+    with io.open(path, "r", encoding="utf-8") as f:
+        lines = (line.strip() for line in f)
+        return [line for line in lines if line and not line.startswith("#")]
+
+
+def list_directory(directory):
+    """
+        Lists the entries of the given directory.
+        Unreadable directories have no entries - like with `os.walk`.
+
+        :param str directory: the directory to list
+
+        :returns: the name, the path, if it's a directory and if it's a symbolic link of every entry
+        :rtype: list
+    """
+    try:
+        if scandir is not None:
+            return [(e.name, e.path, e.is_dir(), e.is_symlink()) for e in scandir(directory)]
+
+        entries = []
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            entries.append((name, path, os.path.isdir(path), os.path.islink(path)))
+        return entries
+    except OSError:
+        return []
+
+
+class IgnorePattern(object):
+    """
+        Represents a pattern of the files and directories to ignore.
+
+        A pattern is matched with `fnmatch` against:
+            * the name of the file or directory if the pattern contains no slash
+            * the path relative to the base directory of the pattern otherwise
+
+        A pattern ending with a slash only matches directories. Unlike in .gitignore files
+        the wildcards of `fnmatch` match slashes, too.
+    """
+
+    def __init__(self, pattern, base):
+        self.directory_only = pattern.endswith("/")
+        self.anchored = "/" in pattern.rstrip("/")
+        self.pattern = pattern.strip("/")
+        self.base = base
+
+    def __repr__(self):
+        return "<IgnorePattern: {0} in {1}>".format(self.pattern, self.base)
+
+    def matches(self, name, path, is_dir):
+        """
+            Returns if the given file or directory matches this pattern
+
+            :param str name: the name of the file or directory
+            :param str path: the path of the file or directory
+            :param bool is_dir: if it's a directory
+
+            :rtype: bool
+        """
+        if self.directory_only and not is_dir:
+            return False
+
+        if self.anchored:
+            name = os.path.relpath(path, self.base).replace(os.sep, "/")
+        return fnmatch.fnmatch(name, self.pattern)
+
+
+class FeatureFinder(object):
+    """
+        Finds the feature files in directories.
+
+        The ignored directories are pruned before they are searched. Files and directories are
+        ignored if they match an exclude pattern or a pattern of a `.radishignore` file in one
+        of the directories above them.
+        The directories of the same depth are searched in parallel threads if multiple jobs are
+        given - this speeds up the discovery on network file systems.
+    """
+
+    def __init__(self, excludes=None, jobs=1, pattern=FEATURE_FILE_PATTERN):
+        self.excludes = excludes or []
+        self.jobs = jobs
+        self.pattern = pattern
+        self._match_pattern = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+
+    def find(self, root):
+        """
+            Finds the feature files in the given directory and its sub directories
+
+            :param str root: the directory to search
+
+            :returns: the sorted paths of the feature files
+            :rtype: list
+        """
+        feature_files = []
+        directories = [(root, [IgnorePattern(p, root) for p in self.excludes])]
+        pool = ThreadPool(self.jobs) if self.jobs > 1 else None
+        try:
+            while directories:
+                if pool is not None:
+                    results = pool.map(self._search_directory, directories)
+                else:
+                    results = [self._search_directory(d) for d in directories]
+
+                directories = []
+                for files, sub_directories in results:
+                    feature_files.extend(files)
+                    directories.extend(sub_directories)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        return sorted(feature_files)
+
+    def _search_directory(self, directory):
+        """
+            Searches the feature files in the given directory
+
+            :param tuple directory: the path and the ignore patterns of the directory
+
+            :returns: the feature files and the sub directories to search with their ignore patterns
+            :rtype: tuple
+        """
+        path, ignore_patterns = directory
+        entries = list_directory(path)
+        for name, entry_path, is_dir, _ in entries:
+            if name == IGNORE_FILE and not is_dir:
+                ignore_patterns = ignore_patterns + [IgnorePattern(p, path) for p in read_ignore_file(entry_path)]
+                break
+
+        files, sub_directories = [], []
+        for name, entry_path, is_dir, is_symlink in entries:
+            if ignore_patterns and any(p.matches(name, entry_path, is_dir) for p in ignore_patterns):
+                continue
+
+            if is_dir:
+                # like os.walk symbolic links to directories are not followed
+                if not is_symlink:
+                    sub_directories.append((entry_path, ignore_patterns))
+            elif self._match_pattern(os.path.normcase(name)):
+                files.append(entry_path)
+        return files, sub_directories
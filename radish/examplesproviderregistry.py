@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+"""
+    This module provides a registry for all Examples providers
+"""
+
+from singleton import singleton
+
+from .exceptions import RadishError
+
+
+@singleton()
+class ExamplesProviderRegistry(object):
+    """
+        Registry for all Examples providers
+    """
+    def __init__(self):
+        self.providers = {}
+
+    def register(self, name, func):
+        """
+            Registers an Examples provider
+        """
+        if name in self.providers:
+            raise RadishError("Cannot register Examples provider with name {0} because it already exists".format(name))
+
+        self.providers[name] = func
+
+    def clear(self):
+        """
+            Clears all registered Examples providers
+        """
+        self.providers.clear()
+
+
+def examples_provider(name):
+    """
+        Decorator for Examples providers
+
+        An Examples provider is called every time its Examples are read.
+        It returns an iterable of rows - the first row is the header.
+
+        :param str name: the name which is used in the feature files
+    """
+    def _decorator(func):
+        """
+            Actual decorator
+        """
+        ExamplesProviderRegistry().register(name, func)
+        return func
+    return _decorator
@@ -103,7 +103,7 @@ class BDDXMLWriter(object):
 
             scenarios_element = etree.Element("scenarios")
 
-            for scenario in (s for s in feature.all_scenarios if not isinstance(s, (ScenarioOutline, ScenarioLoop))):
+            for scenario in (s for s in feature.iter_all_scenarios() if not isinstance(s, (ScenarioOutline, ScenarioLoop))):
                 if not scenario.has_to_run(world.config.scenarios):
                     continue
                 scenario_element = self._get_element_from_model("scenario", scenario)
@@ -64,7 +64,7 @@ class CucumberJSONWriter(object):
                 }
             for i,j in enumerate(feature.tags):
                 feature_json["tags"].append({"name": "@" + j.name, "line": feature.line - len(feature.tags) + i})
-            for scenario in (s for s in feature.all_scenarios if not isinstance(s, (ScenarioOutline, ScenarioLoop))):
+            for scenario in (s for s in feature.iter_all_scenarios() if not isinstance(s, (ScenarioOutline, ScenarioLoop))):
                 if not scenario.has_to_run(world.config.scenarios):
                     continue
                 scenario_json = {
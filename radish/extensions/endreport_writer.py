@@ -55,7 +55,7 @@ class EndreportWriter(object):
             if feature.state in [Step.State.PASSED, Step.State.FAILED]:
                 duration += feature.duration
 
-            for scenario in feature.all_scenarios:
+            for scenario in feature.iter_all_scenarios():
                 if not scenario.has_to_run(world.config.scenarios):
                     continue
 
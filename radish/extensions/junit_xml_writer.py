@@ -89,7 +89,7 @@ class JUnitXMLWriter(object):
                                 "skipped" : 0,
                                 "tests" : 0}
 
-            for scenario in (s for s in feature.all_scenarios if not isinstance(s, (ScenarioOutline, ScenarioLoop))):
+            for scenario in (s for s in feature.iter_all_scenarios() if not isinstance(s, (ScenarioOutline, ScenarioLoop))):
                 if not scenario.has_to_run(world.config.scenarios):
                     continue
 
@@ -109,7 +109,7 @@ class JUnitXMLWriter(object):
                 time=str(feature.duration.total_seconds())
             )
 
-            for scenario in (s for s in feature.all_scenarios if not isinstance(s, (ScenarioOutline, ScenarioLoop))):
+            for scenario in (s for s in feature.iter_all_scenarios() if not isinstance(s, (ScenarioOutline, ScenarioLoop))):
                 if not scenario.has_to_run(world.config.scenarios):
                     continue
 
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+
+"""
+    This module provides the Examples of Scenario Outlines which are
+    streamed from CSV files, JSON lines files or Examples providers
+"""
+
+import io
+import os
+import re
+import abc
+import csv
+import json
+from collections import OrderedDict
+
+from .compat import ABC, PY2, STRING_TYPES, u
+from .scenariooutline import ScenarioOutline
+from .examplesproviderregistry import ExamplesProviderRegistry
+from .exceptions import RadishError, FeatureFileSyntaxError
+
+
+#: Holds the pattern of the Examples sentence which refers to external Examples.
+#  The Examples are either read from a file or from a registered Examples provider:
+#      Examples: from "data/users.csv"
+#      Examples: from users
+EXAMPLES_SOURCE_PATTERN = re.compile(r'^from\s+(?:"(?P<path>[^"]+)"|(?P<provider>[A-Za-z_][\w.]*))$')
+
+#: Holds the pattern of the placeholders in the steps of a Scenario Outline
+PLACEHOLDER_PATTERN = re.compile(r"<([^<>]+)>")
+
+
+def get_placeholders(scenario_outline):
+    """
+        Returns the placeholders used in the steps of the given Scenario Outline
+
+        :param ScenarioOutline scenario_outline: the Scenario Outline
+
+        :rtype: list
+    """
+    placeholders = []
+    for step in scenario_outline.steps:
+        for placeholder in PLACEHOLDER_PATTERN.findall(step.sentence):
+            if placeholder not in placeholders:
+                placeholders.append(placeholder)
+    return placeholders
+
+
+def create_external_examples(sentence, featurefile, line):
+    """
+        Creates the external Examples referred to by the given Examples sentence
+
+        :param str sentence: the sentence of the Examples keyword
+        :param str featurefile: the feature file of the Examples
+        :param int line: the line of the Examples keyword
+
+        :returns: the external Examples or None if the Examples are not external
+        :rtype: ExternalExamples
+    """
+    match = EXAMPLES_SOURCE_PATTERN.match(sentence)
+    if not match:
+        return None
+
+    if match.group("provider"):
+        name = match.group("provider")
+        if name not in ExamplesProviderRegistry().providers:
+            raise FeatureFileSyntaxError(
+                "Examples provider '{0}' on line {1} is not registered".format(name, line))
+        return ProviderExamples(name, featurefile, line)
+
+    path = os.path.join(os.path.dirname(featurefile), match.group("path"))
+    if not os.path.isfile(path):
+        raise FeatureFileSyntaxError("Cannot find Examples file '{0}' on line {1}".format(path, line))
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXAMPLES_FILE_TYPES:
+        raise FeatureFileSyntaxError("Unsupported Examples file '{0}' on line {1}. Supported are: {2}".format(
+            path, line, ", ".join(sorted(EXAMPLES_FILE_TYPES))))
+    return EXAMPLES_FILE_TYPES[extension](path, featurefile, line)
+
+
+class ExternalExamples(ABC):
+    """
+        Abstract base class for the Examples of a Scenario Outline which are read from an external source.
+        Subclasses implement `_read_rows`.
+
+        The rows are streamed from the source whenever they are accessed - only the
+        header, the amount of rows and the most recently accessed row are kept.
+        The source - the file or the Examples provider - is read:
+          * once to get the header and to count the rows when either of them is needed the first time
+          * once for every iteration over the rows
+          * once for every access of a row which is not after the most recently accessed row
+        The header is checked against the first one every time the source is read.
+    """
+
+    def __init__(self, featurefile, line):
+        self.featurefile = featurefile
+        self.line = line
+        self._header = None
+        self._length = None
+        self._reset_cursor()
+
+    def __getstate__(self):
+        # the open source of the cursor is not pickled
+        state = self.__dict__.copy()
+        state["_cursor"] = None
+        state["_cursor_index"] = -1
+        state["_cursor_example"] = None
+        return state
+
+    def __len__(self):
+        if self._length is None:
+            self._scan()
+        return self._length
+
+    def __iter__(self):
+        header, rows = self._open()
+        try:
+            length = 0
+            for line, data in rows:
+                yield self._create_example(header, line, data)
+                length += 1
+            self._length = length
+        finally:
+            rows.close()
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if index < 0:
+            raise IndexError("Examples index out of range")
+
+        if self._cursor is None or index < self._cursor_index:
+            self.close()
+            self._cursor = self._open()
+
+        header, rows = self._cursor
+        while self._cursor_index < index:
+            try:
+                line, data = next(rows)
+            except StopIteration:
+                self.close()
+                raise IndexError("Examples index out of range")
+
+            self._cursor_index += 1
+            if self._cursor_index == index:
+                self._cursor_example = self._create_example(header, line, data)
+        return self._cursor_example
+
+    @property
+    def header(self):
+        """
+            Returns the header of the Examples
+        """
+        if self._header is None:
+            self._scan()
+        return self._header
+
+    def validate(self, placeholders):
+        """
+            Validates that every given placeholder is a column of the header
+
+            :param list placeholders: the placeholders of the Scenario Outline
+        """
+        missing = [p for p in placeholders if p not in self.header]
+        if missing:
+            raise FeatureFileSyntaxError("The Examples {0} on line {1} have no column for the placeholders: {2}".format(
+                self, self.line, ", ".join(missing)))
+
+    def close(self):
+        """
+            Closes the source of the cursor
+        """
+        if self._cursor is not None:
+            self._cursor[1].close()
+        self._reset_cursor()
+
+    def _reset_cursor(self):
+        self._cursor = None
+        self._cursor_index = -1
+        self._cursor_example = None
+
+    def _scan(self):
+        """
+            Reads the source once to get the header and to count the rows
+        """
+        _, rows = self._open()
+        try:
+            self._length = sum(1 for _ in rows)
+        finally:
+            rows.close()
+
+    def _open(self):
+        """
+            Opens the source
+
+            :returns: the header and an iterator over the line and the data of every row
+            :rtype: tuple
+        """
+        rows = self._read_rows()
+        try:
+            _, header = next(rows)
+        except StopIteration:
+            raise RadishError("The Examples {0} have no header".format(self))
+
+        header = [u(c).strip() for c in header]
+        if self._header is None:
+            self._header = header
+        elif header != self._header:
+            rows.close()
+            raise RadishError("The header of the Examples {0} has changed to: {1}".format(self, ", ".join(header)))
+        return header, rows
+
+    @abc.abstractmethod
+    def _read_rows(self):
+        """
+            Yields the line and the data of every row of the source - starting with the header
+        """
+
+    def _create_example(self, header, line, data):
+        """
+            Creates the Example of the given row
+        """
+        if len(data) != len(header):
+            raise RadishError("The Examples row {0}:{1} has {2} columns but the header has {3}".format(
+                self._get_path(), line, len(data), len(header)))
+        return ScenarioOutline.Example([u(x).strip() for x in data], self._get_path(), line)
+
+    def _get_path(self):
+        """
+            Returns the path of the Examples rows
+        """
+        return self.featurefile
+
+
+class ExamplesFile(ExternalExamples):
+    """
+        Represents the Examples of a Scenario Outline which are read from a file
+    """
+
+    def __init__(self, path, featurefile, line):
+        super(ExamplesFile, self).__init__(featurefile, line)
+        self.path = path
+
+    def __str__(self):
+        return "from '{0}'".format(self.path)
+
+    def _get_path(self):
+        return self.path
+
+
+class CSVExamples(ExamplesFile):
+    """
+        Represents the Examples of a Scenario Outline which are read from a CSV file.
+        The first row of the CSV file is the header.
+    """
+
+    def _read_rows(self):
+        if PY2:
+            with io.open(self.path, "rb") as f:
+                reader = csv.reader(f)
+                for row in reader:
+                    if row:
+                        yield reader.line_num, [c.decode("utf-8") for c in row]
+        else:
+            with io.open(self.path, "r", encoding="utf-8", newline="") as f:
+                reader = csv.reader(f)
+                for row in reader:
+                    if row:
+                        yield reader.line_num, row
+
+
+class JSONLinesExamples(ExamplesFile):
+    """
+        Represents the Examples of a Scenario Outline which are read from a JSON lines file.
+        Every line is a JSON object - the keys of the first object are the header.
+    """
+
+    def _read_rows(self):
+        header = None
+        with io.open(self.path, "r", encoding="utf-8") as f:
+            for line, text in enumerate(f, start=1):
+                if not text.strip():
+                    continue
+
+                try:
+                    row = json.loads(text, object_pairs_hook=OrderedDict)
+                except ValueError as e:
+                    raise RadishError("Invalid JSON in Examples row {0}:{1}: {2}".format(self.path, line, e))
+
+                if not isinstance(row, dict):
+                    raise RadishError("The Examples row {0}:{1} is not a JSON object".format(self.path, line))
+
+                if header is None:
+                    header = list(row.keys())
+                    yield line, header
+
+                try:
+                    yield line, [self._to_text(row[column]) for column in header]
+                except KeyError as e:
+                    raise RadishError("The Examples row {0}:{1} has no value for the column {2}".format(self.path, line, e))
+
+    @staticmethod
+    def _to_text(value):
+        """
+            Returns the text of the given JSON value
+        """
+        return value if isinstance(value, STRING_TYPES) else json.dumps(value)
+
+
+class ProviderExamples(ExternalExamples):
+    """
+        Represents the Examples of a Scenario Outline which are read from a registered Examples provider.
+        The provider returns an iterable of rows - the first row is the header.
+    """
+
+    def __init__(self, name, featurefile, line):
+        super(ProviderExamples, self).__init__(featurefile, line)
+        self.name = name
+
+    def __str__(self):
+        return "from provider '{0}'".format(self.name)
+
+    def _read_rows(self):
+        provider = ExamplesProviderRegistry().providers.get(self.name)
+        if provider is None:
+            raise RadishError("Examples provider '{0}' is not registered".format(self.name))
+
+        for row in provider():
+            yield self.line, row
+
+
+#: Holds the Examples file types by their file extension
+EXAMPLES_FILE_TYPES = {
+    ".csv": CSVExamples,
+    ".jsonl": JSONLinesExamples,
+    ".ndjson": JSONLinesExamples,
+}
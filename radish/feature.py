@@ -8,9 +8,102 @@ from .model import Model
 from .scenariooutline import ScenarioOutline
 from .scenarioloop import ScenarioLoop
 from .stepmodel import Step
+from .subscenarios import SubScenarios
 from .terrain import world
 
 
+class ScenarioList(list):
+    """
+        Holds the Scenarios of a Feature.
+        The Scenarios are indexed by their sentence to look them up in constant time.
+        The index is built with the first lookup and kept in sync with the list afterwards.
+    """
+
+    def __init__(self, scenarios=()):
+        super(ScenarioList, self).__init__(scenarios)
+        self._index = None
+
+    def _reindex(self):
+        """
+            Drops the index of the Scenarios - it's built again with the next lookup
+        """
+        self._index = None
+
+    def _get_index(self):
+        """
+            Returns the index of the Scenarios by their sentence.
+            If sentences are defined twice the first Scenario is indexed.
+        """
+        if self._index is None:
+            self._index = {}
+            for scenario in self:
+                self._index.setdefault(scenario.sentence, scenario)
+        return self._index
+
+    def get(self, sentence):
+        """
+            Returns the Scenario with the given sentence or None
+        """
+        return self._get_index().get(sentence)
+
+    def has_sentence(self, sentence):
+        """
+            Returns if a Scenario has the given sentence
+        """
+        return sentence in self._get_index()
+
+    def append(self, scenario):
+        super(ScenarioList, self).append(scenario)
+        if self._index is not None:
+            self._index.setdefault(scenario.sentence, scenario)
+
+    def extend(self, scenarios):
+        start = len(self)
+        super(ScenarioList, self).extend(scenarios)
+        if self._index is not None:
+            for scenario in self[start:]:
+                self._index.setdefault(scenario.sentence, scenario)
+
+    def __iadd__(self, scenarios):
+        self.extend(scenarios)
+        return self
+
+    def __reduce__(self):
+        return self.__class__, (list(self),)
+
+    def insert(self, index, scenario):
+        super(ScenarioList, self).insert(index, scenario)
+        self._reindex()
+
+    def remove(self, scenario):
+        super(ScenarioList, self).remove(scenario)
+        self._reindex()
+
+    def pop(self, *args):
+        scenario = super(ScenarioList, self).pop(*args)
+        self._reindex()
+        return scenario
+
+    def clear(self):
+        del self[:]
+
+    def __setitem__(self, index, value):
+        super(ScenarioList, self).__setitem__(index, value)
+        self._reindex()
+
+    def __delitem__(self, index):
+        super(ScenarioList, self).__delitem__(index)
+        self._reindex()
+
+    def __setslice__(self, start, stop, scenarios):  # Python 2 only
+        super(ScenarioList, self).__setslice__(start, stop, scenarios)
+        self._reindex()
+
+    def __delslice__(self, start, stop):  # Python 2 only
+        super(ScenarioList, self).__delslice__(start, stop)
+        self._reindex()
+
+
 class Feature(Model):
     """
         Represent a Feature
@@ -23,18 +116,36 @@ class Feature(Model):
         self.scenarios = []
         self.context = self.Context()
 
+    @property
+    def scenarios(self):
+        """
+            Returns the scenarios of the feature
+        """
+        return self._scenarios
+
+    @scenarios.setter
+    def scenarios(self, scenarios):
+        self._scenarios = ScenarioList(scenarios)
+
     @property
     def all_scenarios(self):
         """
             Returns all scenarios from the feature
             The ScenarioOutline scenarios will be extended to the normal scenarios
         """
-        scenarios = []
+        return list(self.iter_all_scenarios())
+
+    def iter_all_scenarios(self):
+        """
+            Yields all scenarios from the feature
+            The ScenarioOutline and ScenarioLoop scenarios are yielded one after another
+            without building all of them at once.
+        """
         for scenario in self.scenarios:
-            scenarios.append(scenario)
+            yield scenario
             if isinstance(scenario, (ScenarioOutline, ScenarioLoop)):
-                scenarios.extend(scenario.scenarios)
-        return scenarios
+                for sub_scenario in scenario.scenarios:
+                    yield sub_scenario
 
     @property
     def constants(self):
@@ -61,7 +172,7 @@ class Feature(Model):
 
             :param str sentence: the scenario sentence to search
         """
-        return any(s for s in self.scenarios if s.sentence == sentence)
+        return self.scenarios.has_sentence(sentence)
 
     def __getitem__(self, sentence):
         """
@@ -69,22 +180,30 @@ class Feature(Model):
 
             :param str sentence: the scenario sentence to search
         """
-        return next((s for s in self.scenarios if s.sentence == sentence), None)
+        return self.scenarios.get(sentence)
 
     @property
     def state(self):
         """
             Returns the state of the scenario
         """
-        for scenario in self.all_scenarios:
-            if isinstance(scenario, (ScenarioOutline, ScenarioLoop)):  # skip scenario outlines
-                continue
-
+        for scenario in self.scenarios:
             if not scenario.has_to_run(world.config.scenarios):
                 continue
 
-            if scenario.state is not Step.State.PASSED:
-                return scenario.state
+            if isinstance(scenario, (ScenarioOutline, ScenarioLoop)):  # skip scenario outlines
+                sub_scenarios = scenario.scenarios
+                if isinstance(sub_scenarios, SubScenarios):
+                    # the states of the released scenarios are known without building them again
+                    states = sub_scenarios.states()
+                else:
+                    states = (s.state for s in sub_scenarios)
+            else:
+                states = [scenario.state]
+
+            for state in states:
+                if state is not Step.State.PASSED:
+                    return state
         return Step.State.PASSED
 
     def has_to_run(self, scenario_choice):
@@ -14,14 +14,21 @@ from . import utils
 def load_modules(location):
     """
         Loads all modules in the `location` folder
+
+        :returns: the paths of the loaded modules
+        :rtype: list
     """
     location = os.path.expanduser(os.path.expandvars(location))
     if not os.path.exists(location):
         raise OSError("Location '{0}' to load modules does not exist".format(location))
 
+    loaded_modules = []
     for p, _, f in os.walk(location):
         for filename in fnmatch.filter(f, "*.py"):
-            load_module(os.path.join(p, filename))
+            path = os.path.join(p, filename)
+            load_module(path)
+            loaded_modules.append(path)
+    return loaded_modules
 
 
 def load_module(path):
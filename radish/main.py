@@ -2,6 +2,7 @@
 
 import os
 import sys
+import functools
 import warnings
 from time import time
 
@@ -14,6 +15,8 @@ from .core import Core
 from .core import Configuration
 from .loader import load_modules
 from .matcher import merge_steps
+from .cache import StepBindingCache, FeatureCache, get_step_modules_key
+from .discovery import FeatureFinder
 from .stepregistry import StepRegistry
 from .hookregistry import HookRegistry
 from .runner import Runner
@@ -49,25 +52,22 @@ def show_features(core):
     return 0
 
 
-def run_features(core):
+def run_features(core, loaded_modules):
     """
         Run the parsed features
 
         :param Core core: the radish core object
+        :param list loaded_modules: the paths of the loaded user's custom python files
     """
     # set needed configuration
     world.config.expand = True
 
-    # load user's custom python files
-    for basedir in utils.flattened_basedirs(world.config.basedir):
-        load_modules(basedir)
-
-    # match feature file steps with user's step definitions
-    merge_steps(core.features, StepRegistry().steps)
-
-    # run parsed features
-    if world.config.marker == "time.time()":
-        world.config.marker = int(time())
+    # the step bindings of previous runs are valid as long as the step modules,
+    # the files implementing the step functions and the custom types have not changed.
+    binding_cache = None
+    if world.config.cache:
+        binding_cache = StepBindingCache(world.config.cache_dir, get_step_modules_key(
+            loaded_modules, StepRegistry().steps.values())).load()
 
     # scenario choice
     amount_of_scenarios = sum(len(f.scenarios) for f in core.features_to_run)
@@ -77,6 +77,23 @@ def run_features(core):
             if not 0 < s <= amount_of_scenarios:
                 raise ScenarioNotFoundError(s, amount_of_scenarios)
 
+    StepRegistry().steps.use_fused_regex = world.config.fused_regex
+
+    # match feature file steps with user's step definitions.
+    # Only the steps which will run are matched unless the steps
+    # of all features should be checked for missing step definitions.
+    if world.config.check_all_steps:
+        merge_steps(core.features, StepRegistry().steps, binding_cache)
+    else:
+        merge_steps(core.features_to_run, StepRegistry().steps, binding_cache, world.config.scenarios)
+
+    if binding_cache is not None:
+        binding_cache.save()
+
+    # run parsed features
+    if world.config.marker == "time.time()":
+        world.config.marker = int(time())
+
     runner = Runner(HookRegistry(), early_exit=world.config.early_exit)
     return runner.start(core.features_to_run, marker=world.config.marker)
 
@@ -109,6 +126,14 @@ Usage:
            [-s=<scenarios> | --scenarios=<scenarios>]
            [--shuffle]
            [--tags=<tags>]
+           [--cache]
+           [--cache-dir=<cache_dir>]
+           [--clear-cache]
+           [--check-all-steps]
+           [--fused-regex]
+           [--parse-jobs=<parse_jobs>]
+           [--exclude=<pattern>...]
+           [--discovery-jobs=<discovery_jobs>]
            {0}
     radish (-h | --help)
     radish (-v | --version)
@@ -131,6 +156,15 @@ Options:
     --shuffle                                   shuttle run order of features and scenarios
     --tags=<feature_tags>                       only run Scenarios with the given tags
     --expand                                    expand the feature file (all preconditions)
+    --cache                                     cache the parsed feature files and to which step definitions the steps are bound between runs
+    --cache-dir=<cache_dir>                     set the directory for the radish caches [default: .radish_cache]
+    --clear-cache                               clear the radish caches before the run
+    --check-all-steps                           match the steps of all features - not only of the Scenarios to run - to detect missing step definitions
+    --fused-regex                               pick the regex step patterns which might match a step with a single search in all of them
+    --parse-jobs=<parse_jobs>                   parse the feature files in the given amount of worker processes [default: 1]
+    --exclude=<pattern>...                      ignore the files and directories matching the pattern when searching feature files in directories.
+                                                The patterns of .radishignore files in the searched directories are ignored, too.
+    --discovery-jobs=<discovery_jobs>           search the feature files in directories with the given amount of threads [default: 1]
     {1}
 
 (C) Copyright by Timo Furrer <tuxtimo@gmail.com>
@@ -162,30 +196,47 @@ Options:
     # load needed extensions
     extensions.load(world.config)
 
-    core = Core()
+    if world.config.clear_cache:
+        FeatureCache(world.config.cache_dir).clear()
+        StepBindingCache(world.config.cache_dir, None).clear()
+
+    feature_cache = None
+    if world.config.cache:
+        feature_cache = FeatureCache(world.config.cache_dir)
+    core = Core(feature_cache)
 
     if world.config.profile:
         msg = ('Command line argument -p/--profile will be removed in a future version.  Please '
                'use -u/--user-data instead.')
         warnings.warn(msg, DeprecationWarning, stacklevel=1)
 
+    feature_finder = FeatureFinder(world.config.exclude, int(world.config.discovery_jobs))
     feature_files = []
     for given_feature in world.config.features:
         if not os.path.exists(given_feature):
             raise FeatureFileNotFoundError(given_feature)
 
         if os.path.isdir(given_feature):
-            feature_files.extend(utils.recursive_glob(given_feature, "*.feature"))
+            feature_files.extend(feature_finder.find(given_feature))
             continue
 
         feature_files.append(given_feature)
 
+    # load user's custom python files before the feature files are parsed
+    # because they might register the Examples providers used by the feature files.
+    # radish show does not require a base dir - it only loads an existing one.
+    loaded_modules = []
+    for basedir in utils.flattened_basedirs(world.config.basedir):
+        if world.config.show and not os.path.isdir(utils.expandpath(basedir)):
+            continue
+        loaded_modules.extend(load_modules(basedir))
+
     # parse tag expressions
     tag_expression = None
     if world.config.tags:
         tag_expression = tagexpressions.parse(world.config.tags)
 
-    core.parse_features(feature_files, tag_expression)
+    core.parse_features(feature_files, tag_expression, jobs=int(world.config.parse_jobs))
 
     if not core.features or sum(len(f.scenarios) for f in core.features) == 0:
         print(colorful.bold_red('Error: ') + colorful.red('please specify at least one feature to run'))
@@ -195,7 +246,7 @@ Options:
 
     argument_dispatcher = [
         ((lambda: world.config.show), show_features),
-        ((lambda: True), run_features)
+        ((lambda: True), functools.partial(run_features, loaded_modules=loaded_modules))
     ]
 
     # radish command dispatching
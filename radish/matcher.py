@@ -4,15 +4,18 @@
     This module provides a class to match the feature file steps with the registered steps from the registry
 """
 
+import os
 import re
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 
 from parse_type.cfparse import Parser
 
+from .compat import RE_PATTERN_TYPE
 from .customtyperegistry import CustomTypeRegistry
 from .exceptions import StepDefinitionNotFoundError, StepPatternError
+from .utils import is_immutable
 
-StepMatch = namedtuple("StepMatch", ["argument_match", "func"])
+StepMatch = namedtuple("StepMatch", ["argument_match", "func", "step_pattern"])
 
 
 class RegexStepArguments(object):  # pylint: disable=too-few-public-methods
@@ -31,84 +34,1076 @@ class ParseStepArguments(object):  # pylint: disable=too-few-public-methods
 
     def __init__(self, match):
         self.match = match
+        self._evaluated = None
 
     def evaluate(self):
-        """Lazy and return evaluate the step group matches"""
+        """
+            Lazy and return evaluate the step group matches.
+            The converted arguments are only evaluated once if they are immutable.
+            Otherwise they are evaluated for every call so that no step can change them for another.
+        """
+        if self._evaluated is not None:
+            args, kwargs = self._evaluated
+            return args, dict(kwargs)
+
         result = self.match.evaluate_result()
+        if is_immutable(result.fixed) and is_immutable(tuple(result.named.values())):
+            self._evaluated = (result.fixed, dict(result.named))
         return result.fixed, result.named
 
 
-def merge_steps(features, steps):
+class RegexStepPattern(object):
+    """Class to represent a step pattern given as compiled regex"""
+
+    def __init__(self, pattern, func):
+        self.pattern = pattern
+        self.func = func
+        self._literal_prefix = None
+        self._literal_suffix = None
+
+    def search(self, sentence):
+        """
+            Searches the given sentence for this step pattern
+
+            :param string sentence: the step sentence to search
+
+            :returns: the argument match and the length of the matched text or None
+            :rtype: tuple
+        """
+        match = self.pattern.search(sentence)
+        if not match:
+            return None
+
+        return RegexStepArguments(match), get_longest_group(match)
+
+    @property
+    def literal_prefix(self):
+        """
+            Returns the literal text every match of this pattern starts with
+        """
+        if self._literal_prefix is None:
+            self._literal_prefix = get_regex_literal_prefix(self.pattern)
+        return self._literal_prefix
+
+    @property
+    def literal_suffix(self):
+        """
+            Returns the literal text every match of this pattern ends with
+        """
+        if self._literal_suffix is None:
+            self._literal_suffix = get_regex_literal_suffix(self.pattern)
+        return self._literal_suffix
+
+
+class ParseStepPattern(object):
+    """Class to represent a step pattern given as parse format string"""
+
+    def __init__(self, pattern, func):
+        self.pattern = pattern
+        self.func = func
+        self._literal_prefix = None
+        self._literal_suffix = None
+        self._parser = None
+        self._custom_types_generation = None
+
+    @property
+    def parser(self):
+        """
+            Returns the compiled Parser of this step pattern.
+            The Parser is only rebuilt if the custom types have changed since it was compiled.
+        """
+        custom_type_registry = CustomTypeRegistry()
+        if self._parser is None or self._custom_types_generation != custom_type_registry.generation:
+            try:
+                self._parser = Parser(self.pattern, custom_type_registry.custom_types)
+            except ValueError as e:
+                raise StepPatternError(self.pattern, self.func.__name__, e)
+            self._custom_types_generation = custom_type_registry.generation
+
+        return self._parser
+
+    def search(self, sentence):
+        """
+            Searches the given sentence for this step pattern
+
+            :param string sentence: the step sentence to search
+
+            :returns: the argument match and the length of the matched text or None
+            :rtype: tuple
+        """
+        match = self.parser.search(sentence, evaluate_result=False)
+        if not match:
+            return None
+
+        return ParseStepArguments(match), get_longest_group(match.match)
+
+    @property
+    def literal_prefix(self):
+        """
+            Returns the literal text every match of this pattern starts with
+        """
+        if self._literal_prefix is None:
+            self._literal_prefix = get_parse_literal_prefix(self.pattern)
+        return self._literal_prefix
+
+    @property
+    def literal_suffix(self):
+        """
+            Returns the literal text every match of this pattern ends with
+        """
+        if self._literal_suffix is None:
+            self._literal_suffix = get_parse_literal_suffix(self.pattern)
+        return self._literal_suffix
+
+
+def compile_step_pattern(pattern, func):
+    """
+        Compiles the given pattern to a step pattern object
+
+        :param pattern: the step pattern - either a compiled regex or a parse format string
+        :param function func: the step function
+
+        :returns: the compiled step pattern
+        :rtype: RegexStepPattern or ParseStepPattern
+    """
+    if isinstance(pattern, RE_PATTERN_TYPE):
+        return RegexStepPattern(pattern, func)
+    return ParseStepPattern(pattern, func)
+
+
+def get_regex_literal_prefix(regex):
+    """
+        Returns the literal text at the beginning of the given compiled regex.
+        An empty string is returned if the regex does not start with a literal
+        or it cannot be determined safely, e.g. because of a top-level alternation.
+
+        :param regex: the compiled regex
+    """
+    pattern = regex.pattern
+    if regex.flags & re.VERBOSE or re.search(r"\(\?[aiLmsux-]*x", pattern):
+        return ""  # whitespace is not literal in verbose patterns
+
+    if _has_toplevel_alternation(pattern):
+        return ""
+
+    if pattern.startswith("^"):
+        pattern = pattern[1:]
+    elif pattern.startswith("\\A"):
+        pattern = pattern[2:]
+
+    prefix = []
+    position = 0
+    while position < len(pattern):
+        char = pattern[position]
+        if char == "\\":
+            escaped = pattern[position + 1:position + 2]
+            if not escaped or escaped.isalnum():
+                break  # character class or special sequence
+            prefix.append(escaped)
+            position += 2
+            continue
+
+        if char in "*+?{":
+            # the last literal character is quantified
+            if prefix:
+                prefix.pop()
+            break
+
+        if char in ".^$[]|()":
+            break
+
+        prefix.append(char)
+        position += 1
+
+    return "".join(prefix)
+
+
+def get_regex_literal_suffix(regex):
+    """
+        Returns the literal text at the end of the given compiled regex.
+        An empty string is returned if the regex does not end with a literal
+        or it cannot be determined safely, e.g. because of a top-level alternation.
+
+        :param regex: the compiled regex
+    """
+    pattern = regex.pattern
+    if regex.flags & re.VERBOSE or re.search(r"\(\?[aiLmsux-]*x", pattern):
+        return ""  # whitespace is not literal in verbose patterns
+
+    if _has_toplevel_alternation(pattern):
+        return ""
+
+    suffix = []
+    position = 0
+    while position < len(pattern):
+        char = pattern[position]
+        if char == "\\":
+            escaped = pattern[position + 1:position + 2]
+            if escaped == "Z" and position + 2 == len(pattern):
+                break  # end of string anchor
+            if not escaped or escaped.isalnum():
+                del suffix[:]  # character class or special sequence
+            else:
+                suffix.append(escaped)
+            position += 2
+            continue
+
+        if char == "$" and position + 1 == len(pattern):
+            break  # end of string anchor
+
+        if char == "{":
+            quantifier = re.match(r"\{\d*,?\d*\}", pattern[position:])
+            if quantifier:
+                del suffix[:]  # the literal characters before are quantified
+                position += len(quantifier.group())
+                continue
+
+        if char == "[":
+            # skip the whole character class
+            position += 1
+            if pattern[position:position + 1] == "^":
+                position += 1
+            if pattern[position:position + 1] == "]":
+                position += 1
+            while position < len(pattern) and pattern[position] != "]":
+                position += 2 if pattern[position] == "\\" else 1
+            del suffix[:]
+            position += 1
+            continue
+
+        if char in "*+?.^$|()":
+            del suffix[:]
+        else:
+            suffix.append(char)
+        position += 1
+
+    return "".join(suffix)
+
+
+def _has_toplevel_alternation(pattern):
+    """
+        Checks if the given regex pattern contains an alternation which is not inside a group
+    """
+    depth = 0
+    position = 0
+    in_class = False
+    while position < len(pattern):
+        char = pattern[position]
+        if char == "\\":
+            position += 2
+            continue
+
+        if in_class:
+            if char == "]":
+                in_class = False
+        elif char == "[":
+            in_class = True
+            # a closing bracket right after the opening one is a literal
+            if pattern[position + 1:position + 2] == "^":
+                position += 1
+            if pattern[position + 1:position + 2] == "]":
+                position += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+        position += 1
+    return False
+
+
+def get_parse_literal_prefix(pattern):
+    """
+        Returns the literal text at the beginning of the given parse format string
+
+        :param string pattern: the parse format string
+    """
+    prefix = []
+    position = 0
+    while position < len(pattern):
+        char = pattern[position]
+        if char in "{}":
+            if pattern[position + 1:position + 2] != char:
+                break  # start of a field
+            position += 1  # escaped brace
+        prefix.append(char)
+        position += 1
+    return "".join(prefix)
+
+
+def get_parse_literal_suffix(pattern):
+    """
+        Returns the literal text at the end of the given parse format string
+
+        :param string pattern: the parse format string
+    """
+    suffix = []
+    position = 0
+    while position < len(pattern):
+        char = pattern[position]
+        if char == "{" and pattern[position + 1:position + 2] != "{":
+            # skip the whole field
+            position = pattern.find("}", position)
+            if position == -1:
+                return ""
+            del suffix[:]
+            position += 1
+            continue
+
+        if char in "{}":
+            position += 1  # escaped brace
+        suffix.append(char)
+        position += 1
+    return "".join(suffix)
+
+
+#: Non-ASCII characters which are matched by ASCII letters in case insensitive patterns
+_ASCII_CASE_EQUIVALENTS = {0x130: u"i", 0x131: u"i", 0x17f: u"s", 0x212a: u"k"}
+
+
+def _normalize_token(token):
+    """
+        Normalizes a sentence token for the case insensitive comparison in the trie
+    """
+    return token.translate(_ASCII_CASE_EQUIVALENTS).lower()
+
+
+def get_literal_tokens(literal_prefix):
+    """
+        Returns the whole words of the given literal prefix which have to appear
+        in a sentence for a step pattern with this prefix to match.
+
+        The last word is only whole if it's followed by whitespace - otherwise it
+        might continue in the non-literal part of the pattern.
+        Words are compared case insensitive and only ASCII words are used.
+    """
+    words = literal_prefix.split()
+    if words and not literal_prefix[-1].isspace():
+        words.pop()
+
+    tokens = []
+    for word in words:
+        try:
+            word.encode("ascii")
+        except UnicodeError:
+            break
+        tokens.append(word.lower())
+    return tokens
+
+
+class StepPatternTrie(object):
+    """
+        Trie over the leading literal words of step patterns.
+
+        It's used to find the candidate patterns for a sentence without running
+        every pattern. Patterns without leading literal words are kept in a residual
+        bucket and are always candidates.
+        Because patterns are searched and not anchored the first word of a pattern
+        may be the end of any word in the sentence.
+    """
+
+    class Node(object):  # pylint: disable=too-few-public-methods
+        """
+            Represents a node in the trie
+        """
+        __slots__ = ("children", "step_patterns")
+
+        def __init__(self):
+            self.children = {}
+            #: Holds the registration order of the step patterns ending in this node
+            self.step_patterns = []
+
+    def __init__(self):
+        self._root = StepPatternTrie.Node()
+        self._residual = []
+        self._step_patterns = []
+
+    def add(self, step_pattern):
+        """
+            Adds the given step pattern to the trie.
+            Step patterns have to be added in the order they were registered.
+
+            :param step_pattern: the compiled step pattern
+        """
+        order = len(self._step_patterns)
+        self._step_patterns.append(step_pattern)
+        tokens = get_literal_tokens(step_pattern.literal_prefix)
+        if not tokens:
+            self._residual.append(order)
+            return
+
+        node = self._root
+        for token in tokens:
+            node = node.children.setdefault(token, StepPatternTrie.Node())
+        node.step_patterns.append(order)
+
+    def candidates(self, sentence):
+        """
+            Returns the step patterns which might match the given sentence
+            in the order they were registered.
+
+            :param string sentence: the step sentence
+        """
+        candidates = list(self._residual)
+        tokens = [_normalize_token(t) for t in sentence.split()]
+        root_children = self._root.children
+        for start, first_token in enumerate(tokens):
+            for offset in range(len(first_token)):
+                node = root_children.get(first_token[offset:])
+                if node is None:
+                    continue
+
+                candidates.extend(node.step_patterns)
+                for token in tokens[start + 1:]:
+                    node = node.children.get(token)
+                    if node is None:
+                        break
+                    candidates.extend(node.step_patterns)
+
+        # a step pattern might be found from multiple start words
+        step_patterns = self._step_patterns
+        return [step_patterns[order] for order in sorted(set(candidates))]
+
+
+def get_fusable_pattern(regex):
+    """
+        Returns the pattern of the given compiled regex prepared to be fused
+        with other patterns into one regex.
+        All capturing groups are turned into non-capturing groups so that
+        group names and numbers cannot clash with the ones from other patterns.
+
+        :param regex: the compiled regex
+
+        :returns: the fusable pattern or None if the regex cannot be fused
+        :rtype: str
+    """
+    pattern = regex.pattern
+    # backreferences and conditionals depend on the group numbers and
+    # global inline flags are only allowed at the beginning of a regex
+    if re.search(r"\\[1-9]|\(\?P=|\(\?\(|\(\?[aiLmsux]+\)", pattern):
+        return None
+
+    fusable = []
+    position = 0
+    in_class = False
+    while position < len(pattern):
+        char = pattern[position]
+        if char == "\\":
+            fusable.append(pattern[position:position + 2])
+            position += 2
+            continue
+
+        if in_class:
+            if char == "]":
+                in_class = False
+        elif char == "[":
+            in_class = True
+            # a closing bracket right after the opening one is a literal
+            end = position + 1
+            if pattern[end:end + 1] == "^":
+                end += 1
+            if pattern[end:end + 1] == "]":
+                end += 1
+            fusable.append(pattern[position:end])
+            position = end
+            continue
+        elif char == "(":
+            if pattern[position + 1:position + 2] != "?":
+                fusable.append("(?:")
+                position += 1
+                continue
+
+            named_group = re.match(r"\(\?P<\w+>", pattern[position:])
+            if named_group:
+                fusable.append("(?:")
+                position += len(named_group.group())
+                continue
+
+        fusable.append(char)
+        position += 1
+
+    fusable = "".join(fusable)
+    try:
+        re.compile(fusable, regex.flags)
+    except re.error:
+        return None
+    return fusable
+
+
+class FusedRegex(object):
+    """
+        Fuses the compiled regex step patterns into one alternation.
+        An empty named group after every pattern tells which pattern matched. It's not put around
+        the pattern because the regex engine only skips alternatives quickly which start with a literal.
+
+        A single search with the alternation picks the candidates of the fused patterns for a sentence:
+            * none if no pattern matches the sentence
+            * the matching pattern if it matches the whole sentence. The patterns before it
+              don't match at the start of the sentence and the patterns after it cannot be a better match.
+            * all fused patterns otherwise
+
+        Patterns which cannot be fused or are compiled with other than the default flags are not fused.
+    """
+
+    def __init__(self, step_patterns):
+        self._step_patterns = []
+        self._regex = None
+
+        fusables = []
+        for step_pattern in step_patterns:
+            if not isinstance(step_pattern, RegexStepPattern):
+                continue
+
+            regex = step_pattern.pattern
+            if regex.flags != re.compile(regex.pattern[:0]).flags:
+                continue
+
+            fusable = get_fusable_pattern(regex)
+            if fusable is not None:
+                fusables.append(u"(?:{1})(?P<_{0}>)".format(len(fusables), fusable))
+                self._step_patterns.append(step_pattern)
+
+        if fusables:
+            try:
+                self._regex = re.compile(u"|".join(fusables))
+            except (re.error, OverflowError, RuntimeError):
+                self._step_patterns = []  # those patterns are just tried one by one
+
+        #: Holds the step patterns which are filtered by the fused regex
+        self.fused_step_patterns = frozenset(self._step_patterns)
+
+    def candidates(self, sentence):
+        """
+            Returns the fused step patterns which might match the given sentence
+
+            :param string sentence: the step sentence
+            :rtype: set
+        """
+        if self._regex is None:
+            return frozenset()
+
+        match = self._regex.search(sentence)
+        if match is None:
+            return frozenset()
+
+        if match.start() == 0 and match.end() == len(sentence):
+            return frozenset([self._step_patterns[int(match.lastgroup[1:])]])
+        return self.fused_step_patterns
+
+
+MatchCacheInfo = namedtuple("MatchCacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class MatchCache(object):
+    """
+        Bounded LRU cache for the results of matching a sentence with the registered steps
+    """
+    DEFAULT_MAXSIZE = 4096
+
+    #: Marker for keys which are not in the cache.
+    #  Needed because a failed match (None) is cached as well.
+    MISSING = object()
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+            Returns the cached match for the given key or MatchCache.MISSING
+
+            :param tuple key: the cache key
+        """
+        value = self._entries.pop(key, MatchCache.MISSING)
+        if value is MatchCache.MISSING:
+            self.misses += 1
+            return value
+
+        # re-insert the entry to mark it as the most recently used one
+        self._entries[key] = value
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+            Caches the given match with the given key.
+            If the cache is full the least recently used entry is discarded.
+
+            :param tuple key: the cache key
+            :param StepMatch value: the match to cache
+        """
+        if self.maxsize <= 0:
+            return
+
+        self._entries.pop(key, None)
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+            Clears all cached matches and resets the counters
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """
+            Returns the hit and miss statistics of this cache
+
+            :rtype: MatchCacheInfo
+        """
+        return MatchCacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+
+class StepIndex(dict):
+    """
+        Maps registered step patterns to their step functions
+        and keeps a compiled step pattern for every entry.
+    """
+
+    def __init__(self, steps=None):
+        super(StepIndex, self).__init__()
+        self.step_patterns = OrderedDict()
+        #: Holds the generation of this index.
+        #  It's incremented every time a step is added or removed.
+        self.generation = 0
+        self.match_cache = MatchCache()
+        #: Holds if the candidate regex step patterns are picked by a single search with a fused regex
+        self.use_fused_regex = False
+        self._trie = None
+        self._trie_generation = None
+        self._fused_regex = None
+        self._fused_regex_generation = None
+        if steps:
+            self.update(steps)
+
+    def __setitem__(self, pattern, func):
+        super(StepIndex, self).__setitem__(pattern, func)
+        self.step_patterns[pattern] = compile_step_pattern(pattern, func)
+        self.generation += 1
+
+    def __delitem__(self, pattern):
+        super(StepIndex, self).__delitem__(pattern)
+        del self.step_patterns[pattern]
+        self.generation += 1
+
+    def update(self, steps):
+        """
+            Adds all steps from the given mapping
+        """
+        for pattern, func in steps.items():
+            self[pattern] = func
+
+    def pop(self, pattern, *default):
+        if pattern not in self:
+            return super(StepIndex, self).pop(pattern, *default)
+
+        func = self[pattern]
+        del self[pattern]
+        return func
+
+    def clear(self):
+        super(StepIndex, self).clear()
+        self.step_patterns.clear()
+        self.generation += 1
+
+    @property
+    def trie(self):
+        """
+            Returns the trie over the leading literal words of the step patterns.
+            The trie is rebuilt lazily after the index has changed.
+        """
+        if self._trie is None or self._trie_generation != self.generation:
+            self._trie = StepPatternTrie()
+            for step_pattern in self.step_patterns.values():
+                self._trie.add(step_pattern)
+            self._trie_generation = self.generation
+        return self._trie
+
+    @property
+    def fused_regex(self):
+        """
+            Returns the fused regex of the compiled regex step patterns.
+            The fused regex is rebuilt lazily after the index has changed.
+        """
+        if self._fused_regex is None or self._fused_regex_generation != self.generation:
+            self._fused_regex = FusedRegex(self.step_patterns.values())
+            self._fused_regex_generation = self.generation
+        return self._fused_regex
+
+    def candidates(self, sentence):
+        """
+            Returns the step patterns which might match the given sentence
+            in the order they were registered.
+
+            :param string sentence: the step sentence
+        """
+        candidates = self.trie.candidates(sentence)
+        if not self.use_fused_regex:
+            return candidates
+
+        fused_regex = self.fused_regex
+        fused_candidates = fused_regex.candidates(sentence)
+        return [c for c in candidates if c in fused_candidates or c not in fused_regex.fused_step_patterns]
+
+
+def merge_steps(features, steps, binding_cache=None, scenario_choice=None):
     """
-        Merges steps from the given features with the given steps
+        Merges the steps which will run from the given features with the given steps.
+        These are the steps of the chosen scenarios including
+        their background and precondition steps.
 
         :param list features: the features
         :param dict steps: the steps
+        :param StepBindingCache binding_cache: the cache of the step bindings from previous runs
+        :param list scenario_choice: the ids of the scenarios to merge. If None all will be merged
     """
     # FIXME: fix cycle-import ... Matcher -> ScenarioOutline -> Step -> Matcher
     from .scenariooutline import ScenarioOutline
+    from .scenarioloop import ScenarioLoop
+
+    if not isinstance(steps, StepIndex):
+        steps = StepIndex(steps)
+
+    merged_steps = set()
     for feature in features:
-        for scenario in feature.all_scenarios:
-            if scenario.background:
-                for step in scenario.background.steps:
-                    merge_step(step, steps)
+        if not feature.has_to_run(scenario_choice):
+            continue
+
+        for scenario in feature.scenarios:
+            if not scenario.has_to_run(scenario_choice):
+                continue
+
+            for step in scenario.all_steps:
+                # only runable steps have to be merged - precondition steps
+                # might be shared between multiple scenarios.
+                if not step.runable or id(step) in merged_steps:
+                    continue
+
+                merged_steps.add(id(step))
+                merge_step(step, steps, binding_cache)
 
             if isinstance(scenario, ScenarioOutline):
-                continue  # ScenarioOutline steps do not have to be merged
+                merge_example_steps(scenario, steps, binding_cache)
+            elif isinstance(scenario, ScenarioLoop):
+                merge_iteration_steps(scenario, steps, binding_cache)
+
+
+def merge_example_steps(scenario_outline, steps, binding_cache=None):
+    """
+        Matches the steps of all example scenarios from the given Scenario Outline.
+
+        The sentences of the steps are matched without building the example scenarios - this
+        only ensures that all of them can be merged. The steps of the example scenarios
+        are bound by an ExampleStepBinder when they are built to run.
+
+        :param ScenarioOutline scenario_outline: the Scenario Outline
+        :param StepIndex steps: the steps
+        :param StepBindingCache binding_cache: the cache of the step bindings from previous runs
+    """
+    examples = scenario_outline.scenarios
+    if not len(examples):
+        return
+
+    # the steps of all examples are built from the same outlined steps. Thus, the step
+    # at the same position is likely bound to the same step pattern as in the first example.
+    fixed_affixes = {}
+    for sentences in scenario_outline.iter_example_sentences():
+        for position, sentence in enumerate(sentences):
+            fixed_affixes.setdefault(position, FixedAffixes()).add(sentence)
+
+    template_step_patterns = {}
+    for index, sentences in enumerate(scenario_outline.iter_example_sentences()):
+        for position, sentence in enumerate(sentences):
+            template_step_pattern = template_step_patterns.get(position)
+            match = match_sentence(sentence, steps, binding_cache, template_step_pattern)
+            if not match or not match.func:
+                raise StepDefinitionNotFoundError(examples.build(index).all_steps[position])
+
+            if template_step_pattern is None:
+                template_step_patterns[position] = TemplateStepPattern(
+                    match.step_pattern, steps, fixed_affixes=fixed_affixes[position])
 
-            for step in scenario.steps:
-                merge_step(step, steps)
+    examples.set_step_binder(ExampleStepBinder(steps, binding_cache, template_step_patterns))
 
 
-def merge_step(step, steps):
+class ExampleStepBinder(object):
+    """
+        Binds the steps of the example scenarios from a Scenario Outline which are built to run.
+        The step patterns of the outlined steps are tried first.
+    """
+
+    def __init__(self, steps, binding_cache, template_step_patterns):
+        self.steps = steps
+        self.binding_cache = binding_cache
+        self.template_step_patterns = template_step_patterns
+
+    def bind(self, scenario):
+        """
+            Binds the steps of the given example scenario to their step definitions
+
+            :param ExampleScenario scenario: the example scenario
+        """
+        for position, step in enumerate(scenario.all_steps):
+            if step.runable:
+                merge_step(step, self.steps, self.binding_cache, self.template_step_patterns.get(position))
+
+
+def merge_iteration_steps(scenario_loop, steps, binding_cache=None):
+    """
+        Merges the steps of the iteration scenarios from the given Scenario Loop.
+
+        All iterations have the same steps. Thus, only the steps of a single iteration
+        are merged. The steps of the iteration scenarios which are built to run are bound
+        to the same step definitions and arguments by an IterationStepBinder.
+
+        :param ScenarioLoop scenario_loop: the Scenario Loop
+        :param StepIndex steps: the steps
+        :param StepBindingCache binding_cache: the cache of the step bindings from previous runs
+    """
+    iterations = scenario_loop.scenarios
+    if not len(iterations):
+        return
+
+    template_steps = {}
+    for position, step in enumerate(iterations.build(0).all_steps):
+        if step.runable:
+            merge_step(step, steps, binding_cache)
+            template_steps[position] = step
+
+    iterations.set_step_binder(IterationStepBinder(template_steps))
+
+
+class IterationStepBinder(object):
+    """
+        Binds the steps of the iteration scenarios from a Scenario Loop which are built to run
+        to the step definitions and arguments of the merged template steps.
+    """
+
+    def __init__(self, template_steps):
+        self.template_steps = template_steps
+
+    def bind(self, scenario):
+        """
+            Binds the steps of the given iteration scenario to their step definitions
+
+            :param IterationScenario scenario: the iteration scenario
+        """
+        for position, step in enumerate(scenario.all_steps):
+            template_step = self.template_steps.get(position)
+            if step.runable and template_step is not None:
+                step.definition_func = template_step.definition_func
+                step.argument_match = template_step.argument_match
+                step.bind()
+
+
+def merge_step(step, steps, binding_cache=None, template_step_pattern=None):
     """
         Merges a single step with the registered steps
 
         :param Step step: the step from a feature file to merge
         :param list steps: the registered steps
+        :param StepBindingCache binding_cache: the cache of the step bindings from previous runs
+        :param TemplateStepPattern template_step_pattern: the step pattern of the outlined step this step is built from
+
+        :returns: the step pattern the step is bound to
     """
-    match = match_step(step.context_sensitive_sentence, steps)
+    match = match_sentence(step.context_sensitive_sentence, steps, binding_cache, template_step_pattern)
     if not match or not match.func:
         raise StepDefinitionNotFoundError(step)
 
     step.definition_func = match.func
     step.argument_match = match.argument_match
+    step.bind()
+    return match.step_pattern
+
+
+def match_sentence(sentence, steps, binding_cache=None, template_step_pattern=None):
+    """
+        Tries to find a match for the given step sentence in the step binding cache,
+        with the step pattern of the outlined step and with the registered steps - in this order.
+
+        :param string sentence: the step sentence to match
+        :param list steps: the registered steps
+        :param StepBindingCache binding_cache: the cache of the step bindings from previous runs
+        :param TemplateStepPattern template_step_pattern: the step pattern of the outlined step the sentence is built from
+
+        :returns: the match or None if no step pattern matches
+        :rtype: StepMatch
+    """
+    match = None
+    if binding_cache is not None and isinstance(steps, StepIndex):
+        match = binding_cache.match(sentence, steps)
+
+    if match is None and template_step_pattern is not None:
+        match = template_step_pattern.match(sentence)
+
+    if match is None:
+        match = match_step(sentence, steps)
+        if match and match.func and binding_cache is not None:
+            binding_cache.bind(sentence, match)
+    return match
+
+
+class FixedAffixes(object):
+    """
+        Folds the literal prefix and suffix which all added sentences have in common
+    """
+
+    def __init__(self):
+        self.prefix = None
+        self.suffix = None
+
+    def add(self, sentence):
+        """
+            Adds the given sentence
+
+            :param string sentence: the step sentence
+        """
+        prefix = _fold_literal_prefix(sentence)
+        suffix = _fold_literal_suffix(sentence)
+        if self.prefix is None:
+            self.prefix, self.suffix = prefix, suffix
+            return
+
+        self.prefix = os.path.commonprefix([self.prefix, prefix])
+        self.suffix = os.path.commonprefix([self.suffix[::-1], suffix[::-1]])[::-1]
+
+
+class TemplateStepPattern(object):
+    """
+        Matches the steps which were built from the same outlined step of a Scenario Outline.
+
+        The step pattern which matched the first of these steps is tried for all other steps.
+        The result is the same as if a step was matched with all step patterns
+        as long as this step pattern matches the whole sentence. Only the step patterns
+        registered before it which could match the whole sentence are searched as well.
+        A step pattern can only match the whole sentence if the sentence starts with its
+        literal prefix and ends with its literal suffix.
+    """
+
+    def __init__(self, step_pattern, steps, sentences=(), fixed_affixes=None):
+        self.step_pattern = step_pattern
+
+        # the text all sentences start and end with
+        if fixed_affixes is None:
+            fixed_affixes = FixedAffixes()
+            for sentence in sentences:
+                fixed_affixes.add(sentence)
+        fixed_prefix = fixed_affixes.prefix or ""
+        fixed_suffix = fixed_affixes.suffix or ""
+
+        self._rivals = []
+        for other in steps.step_patterns.values():
+            if other is step_pattern:
+                break
+
+            prefix = _fold_literal_prefix(other.literal_prefix)
+            suffix = _fold_literal_suffix(other.literal_suffix)
+            if not prefix.startswith(fixed_prefix) and not fixed_prefix.startswith(prefix):
+                continue  # cannot match any of the sentences from the beginning
+
+            if not suffix.endswith(fixed_suffix) and not fixed_suffix.endswith(suffix):
+                continue  # cannot match any of the sentences until the end
+
+            self._rivals.append((prefix, suffix, other))
+        else:  # the step pattern is not registered
+            self.step_pattern = None
+
+    def match(self, sentence):
+        """
+            Tries to match the given sentence with the step pattern of the outlined step
+
+            :param string sentence: the step sentence to match
+
+            :returns: the match or None if the sentence has to be matched with all step patterns
+            :rtype: StepMatch
+        """
+        if self.step_pattern is None:
+            return None
+
+        folded_prefix = _fold_literal_prefix(sentence)
+        folded_suffix = _fold_literal_suffix(sentence)
+        step_patterns = [p for prefix, suffix, p in self._rivals
+                         if folded_prefix.startswith(prefix) and folded_suffix.endswith(suffix)]
+        step_patterns.append(self.step_pattern)
+        for step_pattern in step_patterns:
+            result = step_pattern.search(sentence)
+            if result and result[1] == len(sentence):
+                return StepMatch(argument_match=result[0], func=step_pattern.func, step_pattern=step_pattern)
+        return None
+
+
+def _fold_literal_prefix(text):
+    """
+        Returns the leading ASCII part of the given text for a case insensitive comparison.
+        Non-ASCII characters might be case insensitive equal to other non-ASCII characters.
+    """
+    folded = text.translate(_ASCII_CASE_EQUIVALENTS)
+    try:
+        folded.encode("ascii")
+    except UnicodeError:
+        folded = folded[:next(i for i, c in enumerate(folded) if ord(c) > 127)]
+    return folded.lower()
+
+
+def _fold_literal_suffix(text):
+    """
+        Returns the trailing ASCII part of the given text for a case insensitive comparison.
+    """
+    return _fold_literal_prefix(text[::-1])[::-1]
 
 
 def match_step(sentence, steps):
     """
-        Tries to find a match from the given sentence with the given steps
+        Tries to find a match from the given sentence with the given steps.
+        The matches are cached in the StepIndex so that recurring sentences are only matched once.
 
         :param string sentence: the step sentence to match
-        :param dict steps: the available registered steps
+        :param dict steps: the available registered steps.
+                           If it's not a StepIndex the patterns are compiled for this call only.
 
         :returns: the arguments and the func which were matched
         :rtype: tuple
     """
-    potentional_matches = []
-    for pattern, func in steps.items():
-        if isinstance(pattern, re._pattern_type):  # pylint: disable=protected-access
-            match = pattern.search(sentence)
-            argument_match = RegexStepArguments(match)
-            if match:
-                longest_group = get_longest_group(match)
-            else:
-                longest_group = 0
-        else:
-            try:
-                parser = Parser(pattern, CustomTypeRegistry().custom_types)
-            except ValueError as e:
-                raise StepPatternError(pattern, func.__name__, e)
+    if not isinstance(steps, StepIndex):
+        steps = StepIndex(steps)
 
-            match = parser.search(sentence, evaluate_result=False)
-            argument_match = ParseStepArguments(match)
-            if match:
-                longest_group = get_longest_group(match.match)
-            else:
-                longest_group = 0
+    # the cache key contains the generations of the registered steps and
+    # custom types so that every change to them invalidates the cached matches.
+    cache_key = (sentence, steps.generation, CustomTypeRegistry().generation)
+    step_match = steps.match_cache.get(cache_key)
+    if step_match is MatchCache.MISSING:
+        step_match = match_step_patterns(sentence, steps.candidates(sentence))
+        steps.match_cache.put(cache_key, step_match)
+    return step_match
 
-        if match:
-            step_match = StepMatch(argument_match=argument_match, func=func)
+
+def match_step_patterns(sentence, step_patterns):
+    """
+        Tries to find the best match for the given sentence within the given step patterns.
+        Unlike `match_step` all given step patterns are tried and no match is cached.
+
+        :param string sentence: the step sentence to match
+        :param list step_patterns: the compiled step patterns to try in registration order
+
+        :returns: the arguments and the func which were matched
+        :rtype: tuple
+    """
+    potentional_matches = []
+    for step_pattern in step_patterns:
+        result = step_pattern.search(sentence)
+        if result:
+            argument_match, longest_group = result
+            step_match = StepMatch(argument_match=argument_match, func=step_pattern.func, step_pattern=step_pattern)
             if len(sentence) == longest_group:
                 # if perfect match can be made we return it no
                 # matter of the other potentional matches
@@ -11,23 +11,85 @@ import os
 import io
 import re
 import json
-import filecmp
-import copy
+from collections import namedtuple
 
-from .compat import RecursionError
 from .exceptions import RadishError, FeatureFileSyntaxError, LanguageNotSupportedError
 from .feature import Feature
 from .scenario import Scenario
 from .scenariooutline import ScenarioOutline
 from .scenarioloop import ScenarioLoop
+from .externalexamples import EXAMPLES_SOURCE_PATTERN, ExternalExamples, create_external_examples, get_placeholders
 from .stepmodel import Step
 from .background import Background
 from .model import Tag
 
 
+#: Holds the delimiter between a keyword and its sentence
+KEYWORDS_DELIMITER = ":"
+
+#: Holds the loaded language packs by their name.
+#  Language packs are loaded once per process and shared by all FeatureParser instances.
+LANGUAGES = {}
+
+LANGUAGE_PATTERN = re.compile(r"^# language: (.*)")
+
+#: Holds the languages of the keywords which start a line in a feature file.
+#  The index is built once per process from all language packs - see `get_keyword_languages`.
+KEYWORD_LANGUAGES = {}
+
+#: Holds the keywords which are used to detect the language of a feature file
+LANGUAGE_DETECTION_KEYWORDS = ("feature", "background", "scenario", "scenario_outline", "scenario_loop")
+
+#: Holds the pattern of the keyword at the beginning of a line.
+#  The iterations of a Scenario Loop are not part of the keyword.
+KEYWORD_PATTERN = re.compile(r"^(?P<keyword>[^{0}]*?)(?:\s+\d+)?\s*{0}".format(KEYWORDS_DELIMITER))
+
+#: Holds the maximum amount of tags which are combined to check if a tag expression can match a Feature
+MAX_TAG_COMBINATION_TAGS = 10
+
+
+class TokenType(object):
+    """
+        Represents the types of the lines in a feature file
+    """
+    COMMENT = "comment"
+    FEATURE = "feature"
+    BACKGROUND = "background"
+    SCENARIO = "scenario"
+    SCENARIO_OUTLINE = "scenario_outline"
+    SCENARIO_LOOP = "scenario_loop"
+    EXAMPLES = "examples"
+    TAG = "tag"
+    STEP_TEXT = "step_text"
+    TABLE = "table"
+    STEP = "step"
+
+
+#: Holds a classified stripped line of a feature file.
+#  The value depends on the type of the token:
+#      * the stripped sentence for Features, Backgrounds, Scenarios, Scenario Outlines and Examples
+#      * the sentence and the iterations for Scenario Loops
+#      * the name and the arguments for Tags
+#      * None for all other types
+Token = namedtuple("Token", ["type", "line", "value"])
+
+#: Holds the token types which are only detected if their sentence is not empty.
+#  Otherwise the line is a Step.
+SENTENCE_TOKEN_TYPES = frozenset([
+    TokenType.FEATURE, TokenType.BACKGROUND, TokenType.SCENARIO, TokenType.SCENARIO_OUTLINE
+])
+
+#: Holds the token types which start a new Scenario
+SCENARIO_TOKEN_TYPES = frozenset([
+    TokenType.SCENARIO, TokenType.SCENARIO_OUTLINE, TokenType.SCENARIO_LOOP, TokenType.TAG
+])
+
+
 class Keywords(object):
     """
         Represent config object for gherkin keywords.
+
+        The pattern to classify the lines of a feature file is compiled once when the keywords are created.
     """
 
     def __init__(self, feature, background, scenario, scenario_outline, examples, scenario_loop, iterations):
@@ -39,6 +101,213 @@ class Keywords(object):
         self.scenario_loop = scenario_loop
         self.iterations = iterations
 
+        self.token_pattern = self._compile_token_pattern()
+        #: Holds the prefixes of the lines which have to be tokenized in a skipped Scenario.
+        #  All other lines of a skipped Scenario are skipped without tokenizing them.
+        self.skip_prefixes = ("#", "@", '"""', feature, background, scenario, scenario_outline, scenario_loop)
+
+    def _compile_token_pattern(self):
+        """
+            Compiles the pattern which classifies a stripped and not empty line.
+            Every token type is an alternative with a named group.
+            Lines which are not matched by the pattern are Steps.
+
+            :rtype: re.Pattern
+        """
+        keyword_pattern = r"(?P<{0}>{1}\s*{2}(?P<{0}_sentence>.*))"
+        alternatives = [
+            r"(?P<comment>#)",
+            keyword_pattern.format(TokenType.FEATURE, self.feature, KEYWORDS_DELIMITER),
+            keyword_pattern.format(TokenType.BACKGROUND, self.background, KEYWORDS_DELIMITER),
+            keyword_pattern.format(TokenType.SCENARIO, self.scenario, KEYWORDS_DELIMITER),
+            keyword_pattern.format(TokenType.SCENARIO_OUTLINE, self.scenario_outline, KEYWORDS_DELIMITER),
+            r"(?P<scenario_loop>{0} (?P<iterations>\d+):(?P<scenario_loop_sentence>.*))".format(self.scenario_loop),
+            keyword_pattern.format(TokenType.EXAMPLES, self.examples, KEYWORDS_DELIMITER),
+            r"(?P<tag>@(?P<tag_name>[^\s(]+)(?:\((?P<tag_arguments>.*?)\))?)",
+            r'(?P<step_text>""")',
+            r"(?P<table>\|)",
+        ]
+        return re.compile("^(?:{0})".format("|".join(alternatives)))
+
+    def tokenize(self, line):
+        """
+            Classifies the given stripped and not empty line
+
+            :param str line: the line to classify
+
+            :rtype: Token
+        """
+        match = self.token_pattern.match(line)
+        if not match:
+            return Token(TokenType.STEP, line, None)
+
+        token_type = match.lastgroup
+        if token_type in SENTENCE_TOKEN_TYPES or token_type == TokenType.EXAMPLES:
+            value = match.group(token_type + "_sentence").strip()
+            if not value and token_type in SENTENCE_TOKEN_TYPES:
+                return Token(TokenType.STEP, line, None)
+        elif token_type == TokenType.SCENARIO_LOOP:
+            value = match.group("scenario_loop_sentence").strip(), int(match.group("iterations"))
+        elif token_type == TokenType.TAG:
+            value = match.group("tag_name"), match.group("tag_arguments")
+        else:
+            value = None
+        return Token(token_type, line, value)
+
+
+def get_tag_names(tag_expr):
+    """
+        Returns the names of all tags used in the given tag expression
+
+        :param tag_expr: the parsed tag expression
+
+        :rtype: set
+    """
+    names = set()
+    expressions = [tag_expr]
+    while expressions:
+        expression = expressions.pop()
+        if hasattr(expression, "value"):  # literal
+            names.add(expression.value)
+        for operand in ("left", "right", "expression"):
+            if hasattr(expression, operand):
+                expressions.append(getattr(expression, operand))
+    return names
+
+
+def can_match_tags(tag_expr, tags):
+    """
+        Checks if the given tag expression matches the given tags together with any other tags.
+        Scenarios inherit the tags of their Feature - thus, if this is not the case for
+        the Feature tags no Scenario of the Feature can match the tag expression.
+
+        Every combination of the tags used in the tag expression is evaluated. If the tag
+        expression uses too many other tags it's assumed that it can match.
+
+        :param tag_expr: the parsed tag expression
+        :param list tags: the names of the tags which are given
+
+        :rtype: bool
+    """
+    tag_names = get_tag_names(tag_expr)
+    if not tag_names:  # unknown tag expression
+        return True
+
+    tags = set(tags)
+    other_tags = sorted(tag_names - tags)
+    if len(other_tags) > MAX_TAG_COMBINATION_TAGS:
+        return True
+
+    for combination in range(2 ** len(other_tags)):
+        combined_tags = list(tags) + [t for i, t in enumerate(other_tags) if combination & (1 << i)]
+        if tag_expr.evaluate(combined_tags):
+            return True
+    return False
+
+
+def load_language(language):
+    """
+        Loads the keywords of the given language.
+        Every language pack is only loaded once.
+
+        :param string language: the language to load
+
+        :returns: the keywords of the language
+        :rtype: Keywords
+
+        :raises LanguageNotSupportedError: if the given language is not supported by radish
+    """
+    keywords = LANGUAGES.get(language)
+    if keywords is not None:
+        return keywords
+
+    language_path = os.path.join(FeatureParser.LANGUAGE_LOCATION, language + ".json")
+    try:
+        with io.open(language_path, "r", encoding="utf-8") as f:
+            language_pkg = json.load(f)
+    except IOError:
+        raise LanguageNotSupportedError(language)
+
+    keywords = LANGUAGES[language] = Keywords(**language_pkg["keywords"])
+    return keywords
+
+
+def get_keyword_languages():
+    """
+        Returns the index from the keywords of all language packs to their language.
+        The index is built when it's used the first time.
+
+        A keyword which is used by multiple languages belongs to the default language
+        if it's one of them - otherwise to the first language in alphabetical order.
+
+        :rtype: dict
+    """
+    if KEYWORD_LANGUAGES:
+        return KEYWORD_LANGUAGES
+
+    languages = sorted(os.path.splitext(f)[0] for f in os.listdir(FeatureParser.LANGUAGE_LOCATION)
+                       if f.endswith(".json"))
+    if FeatureParser.DEFAULT_LANGUAGE in languages:
+        languages.remove(FeatureParser.DEFAULT_LANGUAGE)
+        languages.insert(0, FeatureParser.DEFAULT_LANGUAGE)
+
+    index = {}
+    for language in languages:
+        keywords = load_language(language)
+        for name in LANGUAGE_DETECTION_KEYWORDS:
+            index.setdefault(getattr(keywords, name), language)
+    KEYWORD_LANGUAGES.update(index)
+    return KEYWORD_LANGUAGES
+
+
+def detect_language(line):
+    """
+        Detects the language of a feature file from the given keyword line
+
+        :param str line: the stripped line which starts with a keyword
+
+        :returns: the language or None if the line does not start with a known keyword
+        :rtype: str
+    """
+    match = KEYWORD_PATTERN.match(line)
+    if not match:
+        return None
+    return get_keyword_languages().get(match.group("keyword"))
+
+
+class PreconditionReference(object):
+    """
+        Represents a Scenario precondition from another feature file.
+
+        The FeatureParser does not parse the feature files of preconditions itself.
+        It puts a reference into the preconditions of the Scenario instead which
+        is replaced by the precondition Scenario once the Core resolved it.
+    """
+    def __init__(self, featurefile, scenario_sentence, inherited_tags, path, line):
+        self.featurefile = featurefile
+        self.scenario_sentence = scenario_sentence
+        self.inherited_tags = inherited_tags
+        self.path = path
+        self.line = line
+
+    @property
+    def all_steps(self):
+        """
+            Returns no steps until the precondition is resolved
+        """
+        return []
+
+    def create_instance(self):
+        """
+            Returns this reference for the copy of a Scenario which uses it.
+            The Core replaces the reference in every Scenario on its own.
+        """
+        return self
+
+    def __str__(self):
+        return "{0}:{1} ({2}: {3})".format(
+            self.path, self.line, os.path.basename(self.featurefile), self.scenario_sentence)
+
 
 class FeatureParser(object):
     """
@@ -63,6 +332,7 @@ class FeatureParser(object):
         EXAMPLES_ROW = "examples_row"
         STEP_TEXT = "step_text"
         SKIP_SCENARIO = "skip_scenario"
+        SKIP_FEATURE = "skip_feature"
 
     def __init__(self, core, featurefile, featureid, tag_expr=None, inherited_tags=None, language="en"):
         if not os.path.exists(featurefile):
@@ -73,7 +343,6 @@ class FeatureParser(object):
         self._featurefile = featurefile
         self._tag_expr = tag_expr
         self.keywords = {}
-        self._keywords_delimiter = ":"
         self._inherited_tags = inherited_tags or []
 
         self._current_state = FeatureParser.State.FEATURE
@@ -90,6 +359,19 @@ class FeatureParser(object):
         self._current_context_class = None
         self._in_step_text = False
         self.feature = None
+        #: Holds the preconditions from other feature files which are not resolved yet
+        self.precondition_references = []
+        #: Holds the parse function of every state
+        self._state_handlers = {
+            FeatureParser.State.FEATURE: self._parse_feature,
+            FeatureParser.State.BACKGROUND: self._parse_background,
+            FeatureParser.State.SCENARIO: self._parse_scenario,
+            FeatureParser.State.STEP: self._parse_step,
+            FeatureParser.State.EXAMPLES: self._parse_examples,
+            FeatureParser.State.EXAMPLES_ROW: self._parse_examples_row,
+            FeatureParser.State.STEP_TEXT: self._parse_step_text,
+            FeatureParser.State.SKIP_SCENARIO: self._parse_skip_scenario,
+        }
 
         self._load_language(language)
 
@@ -105,33 +387,38 @@ class FeatureParser(object):
 
             :raises LanguageNotSupportedError: if the given language is not supported by radish
         """
-        if not language:  # try to detect language
-            raise NotImplementedError("Auto detect language is not implemented yet")
-
-        language_path = os.path.join(self.LANGUAGE_LOCATION, language + ".json")
-        try:
-            with io.open(language_path, "r", encoding="utf-8") as f:
-                language_pkg = json.load(f)
-        except IOError:
-            raise LanguageNotSupportedError(language)
+        if not language:  # the language is detected from the first keyword line
+            self.keywords = None
+            return
 
-        self.keywords = Keywords(**language_pkg["keywords"])
+        self.keywords = load_language(language)
 
-    def parse(self):
+    def parse(self, resolve_preconditions=True):
         """
             Parses the feature file of this `FeatureParser` instance
 
+            :param bool resolve_preconditions: if the preconditions from other feature files
+                                               are resolved by the Core after parsing
+
             :returns: if the parsing was successful or not
             :rtype: bool
         """
         with io.open(self._featurefile, "r", encoding="utf-8") as f:
-            for line in f.readlines():
+            for line in f:
                 self._current_line += 1
                 line = line.strip()
                 if not line:  # line is empty
                     continue
 
-                if line.startswith("#"):
+                if self.keywords is None and not line.startswith(("#", "@")):
+                    # the first line which is neither a comment nor a tag starts with a keyword
+                    self._load_language(detect_language(line) or FeatureParser.DEFAULT_LANGUAGE)
+
+                if self._current_state == FeatureParser.State.SKIP_SCENARIO and self._fast_skip(line):
+                    continue
+
+                token = (self.keywords or load_language(FeatureParser.DEFAULT_LANGUAGE)).tokenize(line)
+                if token.type == TokenType.COMMENT:
                     # try to detect feature file language
                     language = self._detect_language(line)
                     if language:
@@ -140,10 +427,10 @@ class FeatureParser(object):
                     continue
 
                 if self.feature:
-                    if self._detect_feature(line):
+                    if token.type == TokenType.FEATURE:
                         raise FeatureFileSyntaxError("radish supports only one Feature per feature file")
 
-                    if self._detect_background(line):
+                    if token.type == TokenType.BACKGROUND:
                         if self.feature.background:
                             raise FeatureFileSyntaxError("The Background block may only appear once in a Feature")
 
@@ -151,46 +438,50 @@ class FeatureParser(object):
                             raise FeatureFileSyntaxError(
                                 "The Background block must be placed before any Scenario block")
 
-                result = self._parse_context(line)
+                result = self._parse_context(token)
                 if result is False:
                     raise FeatureFileSyntaxError(
                         "Syntax error in feature file {0} on line {1}".format(self._featurefile, self._current_line))
 
+                if self._current_state == FeatureParser.State.SKIP_FEATURE:
+                    break
+
         if not self.feature:
             raise FeatureFileSyntaxError("No Feature found in file {0}".format(self._featurefile))
 
-        if not self.feature.scenarios:
-            return None
+        feature = self.feature if self.feature.scenarios else None
+        if feature and self._current_scenario and not self._current_scenario.complete:
+            self._current_scenario.after_parse()  # for the last scenario
 
-        if self._current_scenario and not self._current_scenario.complete:  # for the last scenario
-            self._current_scenario.after_parse()
+        if resolve_preconditions and self.precondition_references:
+            self._core.resolve_preconditions(self._featurefile, feature, self.precondition_references,
+                                             self._tag_expr)
 
-        return self.feature
+        return feature
 
-    def _parse_context(self, line):
+    def _parse_context(self, token):
         """
-            Parses arbitrary context from a line
+            Parses arbitrary context from a token
 
-            :param string line: the line to parse from
+            :param Token token: the token to parse from
         """
-        parse_context_func = getattr(self, "_parse_" + self._current_state, None)
+        parse_context_func = self._state_handlers.get(self._current_state)
         if not parse_context_func:
             raise RadishError("FeatureParser state {0} is not supported".format(self._current_state))
 
-        return parse_context_func(line)
+        return parse_context_func(token)
 
-    def _parse_feature(self, line):
+    def _parse_feature(self, token):
         """
             Parses a Feature Sentence
 
             The `INIT` state is used as initiale state.
 
-            :param string line: the line to parse from
+            :param Token token: the token to parse from
         """
-        detected_feature = self._detect_feature(line)
-        if not detected_feature:
-            tag = self._detect_tag(line)
-            if tag:
+        if token.type != TokenType.FEATURE:
+            if token.type == TokenType.TAG:
+                tag = token.value
                 self._current_tags.append(Tag(tag[0], tag[1]))
                 if tag[0] == "constant":
                     name, value = self._parse_constant(tag[1])
@@ -199,70 +490,71 @@ class FeatureParser(object):
 
             return False
 
-        self.feature = Feature(self._featureid, self.keywords.feature, detected_feature, self._featurefile,
+        self.feature = Feature(self._featureid, self.keywords.feature, token.value, self._featurefile,
                                self._current_line, self._current_tags)
         self.feature.context.constants = self._current_constants
         self._current_state = FeatureParser.State.BACKGROUND
         self._current_tags = []
         self._current_constants = []
+
+        # no scenario has to be parsed if the tags of the feature exclude all of them
+        if self._tag_expr and not can_match_tags(self._tag_expr,
+                                                 [t.name for t in self.feature.tags + self._inherited_tags]):
+            self._current_state = FeatureParser.State.SKIP_FEATURE
         return True
 
-    def _parse_background(self, line):
+    def _parse_background(self, token):
         """
         Parses a background context
 
-        :param str line: the line to parse the background
+        :param Token token: the token to parse the background
         """
-        detected_background = self._detect_background(line)
-        if not detected_background:
+        if token.type != TokenType.BACKGROUND:
             # try to find a scenario
-            if self._detect_scenario_type(line):
-                return self._parse_scenario(line)
+            if self._detect_scenario_type(token):
+                return self._parse_scenario(token)
 
             # this line is interpreted as a feature description line
-            self.feature.description.append(line)
+            self.feature.description.append(token.line)
             return True
 
-        self.feature.background = Background(self.keywords.background, detected_background, self._featurefile,
+        self.feature.background = Background(self.keywords.background, token.value, self._featurefile,
                                              self._current_line, self.feature)
         self._current_scenario = self.feature.background
         self._current_state = FeatureParser.State.STEP
         return True
 
-    def _parse_scenario(self, line):
+    def _parse_scenario(self, token):
         """
             Parses a Feature context
 
-            :param string line: the line to parse from
+            :param Token token: the token to parse from
         """
-        detected_scenario = self._detect_scenario(line)
-        scenario_type = Scenario
-        keywords = (self.keywords.scenario,)
-        if not detected_scenario:
-            detected_scenario = self._detect_scenario_outline(line)
+        if token.type == TokenType.SCENARIO:
+            detected_scenario = token.value
+            scenario_type = Scenario
+            keywords = (self.keywords.scenario,)
+        elif token.type == TokenType.SCENARIO_OUTLINE:
+            detected_scenario = token.value
             scenario_type = ScenarioOutline
             keywords = (self.keywords.scenario_outline, self.keywords.examples)
-
-            if not detected_scenario:
-                detected_scenario = self._detect_scenario_loop(line)
-                if not detected_scenario:
-                    tag = self._detect_tag(line)
-                    if tag:
-                        self._current_tags.append(Tag(tag[0], tag[1]))
-                        if tag[0] == "precondition":
-                            scenario = self._parse_precondition(tag[1])
-                            self._current_preconditions.append(scenario)
-                        elif tag[0] == "constant":
-                            name, value = self._parse_constant(tag[1])
-                            self._current_constants.append((name, value))
-                        return True
-
-                    raise FeatureFileSyntaxError(
-                        "The parser expected a scenario or a tag on this line. Given: '{0}'".format(line))
-
-                detected_scenario, iterations = detected_scenario  # pylint: disable=unpacking-non-sequence
-                scenario_type = ScenarioLoop
-                keywords = (self.keywords.scenario_loop, self.keywords.iterations)
+        elif token.type == TokenType.SCENARIO_LOOP:
+            detected_scenario, iterations = token.value
+            scenario_type = ScenarioLoop
+            keywords = (self.keywords.scenario_loop, self.keywords.iterations)
+        elif token.type == TokenType.TAG:
+            tag = token.value
+            self._current_tags.append(Tag(tag[0], tag[1]))
+            if tag[0] == "precondition":
+                scenario = self._parse_precondition(tag[1])
+                self._current_preconditions.append(scenario)
+            elif tag[0] == "constant":
+                name, value = self._parse_constant(tag[1])
+                self._current_constants.append((name, value))
+            return True
+        else:
+            raise FeatureFileSyntaxError(
+                "The parser expected a scenario or a tag on this line. Given: '{0}'".format(token.line))
 
         if detected_scenario in self.feature:
             raise FeatureFileSyntaxError(
@@ -270,11 +562,9 @@ class FeatureParser(object):
 
         scenario_id = 1
         if self.feature.scenarios:
+            # the sub scenarios of Scenario Outlines and Loops are numbered after their parent
             previous_scenario = self._current_scenario
-            if hasattr(previous_scenario, "scenarios") and previous_scenario.scenarios:
-                scenario_id = previous_scenario.scenarios[-1].id + 1
-            else:
-                scenario_id = previous_scenario.id + 1
+            scenario_id = previous_scenario.id + len(getattr(previous_scenario, "scenarios", [])) + 1
 
         # all tags of this scenario have been consumed so we can
         # check if this scenario has to be evaluated or not
@@ -306,60 +596,84 @@ class FeatureParser(object):
         self._current_state = FeatureParser.State.STEP
         return True
 
-    def _parse_examples(self, line):
+    def _parse_examples(self, token):
         """
             Parses the Examples header line
 
-            :param string line: the line to parse from
+            :param Token token: the token to parse from
+        """
+        if not isinstance(self._current_scenario, ScenarioOutline):
+            raise FeatureFileSyntaxError("Scenario does not support Examples. Use 'Scenario Outline'")
+
+        self._current_scenario.examples_header = [x.strip() for x in token.line.split("|")[1:-1]]
+        self._current_state = FeatureParser.State.EXAMPLES_ROW
+        return True
+
+    def _parse_external_examples(self, token):
+        """
+            Parses the Examples line which refers to Examples from a file or an Examples provider.
+            The header of the Examples is validated against the placeholders of the Scenario Outline.
+
+            :param Token token: the token to parse from
         """
         if not isinstance(self._current_scenario, ScenarioOutline):
             raise FeatureFileSyntaxError("Scenario does not support Examples. Use 'Scenario Outline'")
 
-        self._current_scenario.examples_header = [x.strip() for x in line.split("|")[1:-1]]
+        examples = create_external_examples(token.value, self._featurefile, self._current_line)
+        examples.validate(get_placeholders(self._current_scenario))
+        self._current_scenario.examples = examples
         self._current_state = FeatureParser.State.EXAMPLES_ROW
         return True
 
-    def _parse_examples_row(self, line):
+    def _parse_examples_row(self, token):
         """
             Parses an Examples row
 
-            :param string line: the line to parse from
+            :param Token token: the token to parse from
         """
         # detect next keyword
-        if self._detect_scenario_type(line):
+        if self._detect_scenario_type(token):
             self._current_scenario.after_parse()
-            return self._parse_scenario(line)
+            return self._parse_scenario(token)
+
+        if isinstance(self._current_scenario.examples, ExternalExamples):
+            raise FeatureFileSyntaxError("The Examples {0} cannot have additional rows in the feature file".format(
+                self._current_scenario.examples))
 
-        example = ScenarioOutline.Example([x.strip() for x in line.split("|")[1:-1]], self._featurefile,
+        example = ScenarioOutline.Example([x.strip() for x in token.line.split("|")[1:-1]], self._featurefile,
                                           self._current_line)
         self._current_scenario.examples.append(example)
         return True
 
-    def _parse_step(self, line):
+    def _parse_step(self, token):
         """
             Parses a single step
 
-            :param string line: the line to parse from
+            :param Token token: the token to parse from
         """
         # detect next keyword
-        if self._detect_scenario_type(line):
+        if self._detect_scenario_type(token):
             self._current_scenario.after_parse()
-            return self._parse_scenario(line)
+            return self._parse_scenario(token)
 
-        if self._detect_step_text(line):
+        if token.type == TokenType.STEP_TEXT:
             self._current_state = self.State.STEP_TEXT
-            return self._parse_step_text(line)
+            return self._parse_step_text(token)
 
-        if self._detect_table(line):
-            self._parse_table(line)
+        if token.type == TokenType.TABLE:
+            self._parse_table(token)
             return True
 
-        if self._detect_examples(line):
+        if token.type == TokenType.EXAMPLES:
+            if EXAMPLES_SOURCE_PATTERN.match(token.value):
+                return self._parse_external_examples(token)
+
             self._current_state = FeatureParser.State.EXAMPLES
             return True
 
+        line = token.line
         # get context class
-        step_context_class = line.split()[0].lower()
+        step_context_class = line.split(None, 1)[0].lower()
         if step_context_class in FeatureParser.CONTEXT_CLASSES:
             self._current_context_class = step_context_class
 
@@ -370,11 +684,11 @@ class FeatureParser(object):
         self._current_scenario.steps.append(step)
         return True
 
-    def _parse_table(self, line):
+    def _parse_table(self, token):
         """
             Parses a step table row
 
-            :param string line: the line to parse from
+            :param Token token: the token to parse from
         """
         if not self._current_scenario.steps:
             raise FeatureFileSyntaxError(
@@ -382,7 +696,7 @@ class FeatureParser(object):
                     self._current_line))
 
         current_step = self._current_scenario.steps[-1]
-        table_columns = [x.strip() for x in line.split("|")[1:-1]]
+        table_columns = [x.strip() for x in token.line.split("|")[1:-1]]
         if not current_step.table_header:  # it's the table heading
             current_step.table_header = table_columns
         else:  # it's a table data row
@@ -391,12 +705,13 @@ class FeatureParser(object):
             current_step.table.append(table_data)
         return True
 
-    def _parse_step_text(self, line):
+    def _parse_step_text(self, token):
         """
             Parses additional step text
 
-            :param str line: the line to parse
+            :param Token token: the token to parse
         """
+        line = token.line
         if line.startswith('"""') and not self._in_step_text:
             self._in_step_text = True
             line = line[3:]
@@ -428,32 +743,22 @@ class FeatureParser(object):
         feature_file = os.path.join(os.path.dirname(self._featurefile), feature_file_name)
 
         # check if the precondition Scenario is in the same feature file.
-        # If this happens to be the case the current feature is just copied as is.
-        if filecmp.cmp(self._featurefile, feature_file):
+        # If this happens to be the case the already parsed Scenario is used as template.
+        if os.path.realpath(self._featurefile) == os.path.realpath(feature_file):
             if scenario_sentence not in self.feature:
                 raise FeatureFileSyntaxError(
                     "Cannot import precondition scenario '{0}' from feature '{1}': No such scenario".format(
                         scenario_sentence, feature_file))
 
-            feature = copy.deepcopy(self.feature)
-            self._core.features.append(feature)
-        else:
-            try:
-                current_tags = self._current_tags + self.feature.tags + self._inherited_tags
-                feature = self._core.parse_feature(feature_file, self._tag_expr, inherited_tags=current_tags)
-            except (RuntimeError, RecursionError) as e:
-                if str(e).startswith('maximum recursion depth exceeded'):  # precondition cycling
-                    raise FeatureFileSyntaxError(
-                        "Your feature '{0}' has cycling preconditions with '{1}: {2}' starting at line {3}".format(
-                            self._featurefile, feature_file_name, scenario_sentence, self._current_line))
-                raise
+            return self.feature[scenario_sentence].create_instance()
 
-        if scenario_sentence not in feature:
-            raise FeatureFileSyntaxError(
-                "Cannot import precondition scenario '{0}' from feature '{1}': No such scenario".format(
-                    scenario_sentence, feature_file))
-
-        return feature[scenario_sentence]
+        # preconditions from other feature files are resolved by the Core
+        # after this feature file is parsed.
+        current_tags = self._current_tags + self.feature.tags + self._inherited_tags
+        reference = PreconditionReference(feature_file, scenario_sentence, current_tags,
+                                          self._featurefile, self._current_line)
+        self.precondition_references.append(reference)
+        return reference
 
     def _parse_constant(self, arguments):
         """
@@ -468,144 +773,54 @@ class FeatureParser(object):
         name, value = arguments.split(":", 1)
         return name.strip(), value.strip()
 
-    def _parse_skip_scenario(self, line):
-        """
-        Parses the next lines until the next scenario is reached
-        """
-        if self._detect_scenario_type(line):
-            return self._parse_scenario(line)
-
-        return True
-
-    def _detect_keyword(self, keyword, line):
-        """
-        Detects a keyword on a given line
-        :param keyword: the keyword to detect
-        :param line: the line in which we want to detect the keyword
-        :return: the line without the detected keyword
-        :rtype: string or None
+    def _fast_skip(self, line):
         """
+            Skips the given line of a skipped scenario without tokenizing it.
+            Only the lines which might start a new scenario, a step text or a comment are tokenized.
 
-        pattern = "^{keyword}\s*{delimiter}(.*)$".format(
-            keyword=keyword, delimiter=self._keywords_delimiter)
-        match = re.match(pattern, line)
+            :param str line: the stripped line
 
-        if match:
-            return match.group(1).strip()
-
-        return None
-
-    def _detect_feature(self, line):
+            :returns: if the line was skipped
+            :rtype: bool
         """
-            Detects a feature on the given line
+        if line.startswith(self.keywords.skip_prefixes):
+            return False
 
-            :param string line: the line to detect a feature
+        if self._in_step_text and line.endswith('"""'):
+            self._in_step_text = False
+        return True
 
-            :returns: the detected feature on the given line
-            :rtype: string or None
+    def _parse_skip_scenario(self, token):
         """
-
-        return self._detect_keyword(self.keywords.feature, line)
-
-    def _detect_background(self, line):
+        Parses the next lines until the next scenario is reached.
+        The step texts of the skipped scenario are skipped as a whole.
         """
-            Detects a background on the given line
+        if self._in_step_text:
+            if token.line.endswith('"""'):
+                self._in_step_text = False
+            return True
 
-            :param string line: the line to detect a background
+        if self._detect_scenario_type(token):
+            return self._parse_scenario(token)
 
-            :returns: the detected background on the given line
-            :rtype: string or None
-        """
+        if token.type == TokenType.STEP_TEXT:
+            self._in_step_text = not token.line[3:].endswith('"""')
 
-        return self._detect_keyword(self.keywords.background, line)
+        return True
 
-    def _detect_scenario_type(self, line):
+    def _detect_scenario_type(self, token):
         """
-        Detect a Scenario/ScenarioOutline/ScenarioLoop/Tag on the given line.
+        Detect a Scenario/ScenarioOutline/ScenarioLoop/Tag token.
 
-        :returns: if a scenario of any type is present on the given line
+        :returns: if the token starts a scenario of any type
         :rtype: bool
         """
-        if self._detect_scenario(line) or self._detect_scenario_outline(line) or self._detect_scenario_loop(
-                line) or self._detect_tag(line):
+        if token.type in SCENARIO_TOKEN_TYPES:
             self._current_state = FeatureParser.State.SCENARIO
             return True
 
         return False
 
-    def _detect_scenario(self, line):
-        """
-            Detects a scenario on the given line
-
-            :param string line: the line to detect a scenario
-
-            :returns: the scenario detected on the given line
-            :rtype: string or None
-        """
-
-        return self._detect_keyword(self.keywords.scenario, line)
-
-    def _detect_scenario_outline(self, line):
-        """
-            Detects a scenario outline on the given line
-
-            :param string line: the line to detect a scenario outline
-
-            :returns: the scenario outline detected on the given line
-            :rtype: string or None
-        """
-
-        return self._detect_keyword(self.keywords.scenario_outline, line)
-
-    def _detect_examples(self, line):
-        """
-            Detects an Examples block on the given line
-
-            :param string line: the line to detect the Examples
-
-            :returns: if an Examples block was found on the given line
-            :rtype: bool
-        """
-
-        return self._detect_keyword(self.keywords.examples, line) is not None
-
-    def _detect_scenario_loop(self, line):
-        """
-            Detects a scenario loop on the given line
-
-            :param string line: the line to detect a scenario loop
-
-            :returns: if a scenario loop was found on the given line
-            :rtype: string
-        """
-        match = re.search(r"^{0} (\d+):(.*)".format(self.keywords.scenario_loop), line)
-        if match:
-            return match.group(2).strip(), int(match.group(1))
-
-        return None
-
-    def _detect_table(self, line):
-        """
-            Detects a step table row on the given line
-
-            :param string line: the line to detect the table row
-
-            :returns: if an step table row was found or not
-            :rtype: bool
-        """
-        return line.startswith("|")
-
-    def _detect_step_text(self, line):
-        """
-            Detects the beginning of an additional step text block
-
-            :param str line: the line to detect the step text block
-
-            :returns: if a step text block was found or not
-            :rtype: bool
-        """
-        return line.startswith('"""')
-
     def _detect_language(self, line):
         """
             Detects a language on the given line
@@ -615,27 +830,12 @@ class FeatureParser(object):
             :returns: the language or None
             :rtype: str or None
         """
-        match = re.search("^# language: (.*)", line)
+        match = LANGUAGE_PATTERN.match(line)
         if match:
             return match.group(1)
 
         return None
 
-    def _detect_tag(self, line):
-        """
-            Detects a tag on the given line
-
-            :param string line: the line to detect the tag
-
-            :returns: the tag or None
-            :rtype: str or None
-        """
-        match = re.search(r"^@([^\s(]+)(?:\((.*?)\))?", line)
-        if match:
-            return match.group(1), match.group(2)
-
-        return None
-
     def _create_scenario_background(self, steps_runable):
         """
         Creates a new instance of the features current
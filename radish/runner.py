@@ -100,6 +100,8 @@ class Runner(object):
 
             for sub_scenario in scenario.scenarios:
                 returncode |= self.run_scenario(sub_scenario)
+                # the sub scenario is reported - only its results are kept
+                scenario.scenarios.release(sub_scenario)
         return returncode
 
     @handle_exit
@@ -4,6 +4,8 @@
     This module provides a class to represent a Scenario
 """
 
+import copy
+
 from .model import Model
 from .stepmodel import Step
 
@@ -49,6 +51,28 @@ class Scenario(Model):
         constants.extend(self.parent.constants)
         return constants
 
+    def create_instance(self):
+        """
+            Returns a copy of this Scenario to use it as precondition.
+            The copy shares the parsed data - like the tags and the step tables
+            and texts - with this Scenario but has its own steps.
+        """
+        scenario = copy.copy(self)
+        scenario.absolute_id = None
+        scenario.starttime = None
+        scenario.endtime = None
+        scenario.context = self.Context()
+        scenario.context.constants = self.context.constants
+        if self.background:
+            scenario.background = copy.copy(self.background)
+            scenario.background.parent = scenario
+            # the background steps are moved to the copy when it's completed below
+            scenario.background.steps = [s.create_instance(scenario.background) for s in self.background.steps]
+        scenario.preconditions = [p.create_instance() for p in self.preconditions]
+        scenario.steps = [s.create_instance(scenario) for s in self.steps]
+        Scenario.after_parse(scenario)
+        return scenario
+
     @property
     def all_steps(self):
         """
@@ -7,6 +7,7 @@
 from .scenario import Scenario
 from .iterationscenario import IterationScenario
 from .stepmodel import Step
+from .subscenarios import SubScenarios
 
 
 class ScenarioLoop(Scenario):
@@ -17,31 +18,45 @@ class ScenarioLoop(Scenario):
         super(ScenarioLoop, self).__init__(id, keyword, sentence, path, line, parent, tags, preconditions, background=background)
         self.iterations_keyword = iterations_keyword
         self.iterations = 0
-        self.scenarios = []
+        self.scenarios = SubScenarios(self)
+
+    @property
+    def amount_of_scenarios(self):
+        """
+            Returns the amount of iteration scenarios
+        """
+        return self.iterations
 
     def build_scenarios(self):
         """
             Builds the scenarios for every iteration
 
-            Note: This must be done before mering the steps from the feature file with the step definitions
+            The scenarios are built lazily when they are accessed - this builds all of them at once.
+        """
+        return list(self.scenarios)
+
+    def build_scenario(self, iteration):
+        """
+            Builds the scenario of the given iteration
+
+            :param int iteration: the index of the iteration
+
+            :rtype: IterationScenario
         """
-        for i in range(self.iterations):
-            scenario_id = self.id + i + 1
-            background = None
-            scenario = IterationScenario(scenario_id, self.keyword, "{0} - iteration {1}".format(self.sentence, i), self.path, self.line, self, i)
-            if self.background:
-                background = self.background.create_instance(parent=scenario, steps_runable=True)
-                scenario.background = background
+        scenario_id = self.id + iteration + 1
+        scenario = IterationScenario(scenario_id, self.keyword, "{0} - iteration {1}".format(self.sentence, iteration), self.path, self.line, self, iteration)
+        if self.background:
+            scenario.background = self.background.create_instance(parent=scenario, steps_runable=True)
 
-            for step_id, iteration_step in enumerate(self.steps):
-                step = Step(step_id + 1, iteration_step.sentence, iteration_step.path, iteration_step.line, scenario, True, context_class=iteration_step.context_class)
-                scenario.steps.append(step)
-            self.scenarios.append(scenario)
+        for step_id, iteration_step in enumerate(self.steps):
+            step = Step(step_id + 1, iteration_step.sentence, iteration_step.path, iteration_step.line, scenario, True, context_class=iteration_step.context_class)
+            scenario.steps.append(step)
+        return scenario
 
     def after_parse(self):
         """
-            Build looped scenarios
+            Completes the Scenario Loop.
+            The looped scenarios are built lazily when they are accessed.
         """
         Scenario.after_parse(self)
-        self.build_scenarios()
         self.complete = True
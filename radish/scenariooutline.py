@@ -6,7 +6,8 @@
 
 from .scenario import Scenario
 from .examplescenario import ExampleScenario
-from .stepmodel import Step
+from .stepmodel import Step, expand_sentence, get_context_sensitive_sentence
+from .subscenarios import SubScenarios
 from .exceptions import RadishError
 
 
@@ -28,30 +29,86 @@ class ScenarioOutline(Scenario):
     def __init__(self, id, keyword, example_keyword, sentence, path, line, parent, tags=None, preconditions=None, background=None):
         super(ScenarioOutline, self).__init__(id, keyword, sentence, path, line, parent, tags, preconditions, background)
         self.example_keyword = example_keyword
-        self.scenarios = []
+        self.scenarios = SubScenarios(self)
         self.examples_header = []
+        #: Holds the Examples rows - either parsed from the feature file or streamed from an external source
         self.examples = []
+        self._column_widths = {}
+
+    @property
+    def examples_header(self):
+        """
+            Returns the header of the Examples
+        """
+        if hasattr(self.examples, "header"):  # streamed from an external source
+            return self.examples.header
+        return self._examples_header
+
+    @examples_header.setter
+    def examples_header(self, examples_header):
+        self._examples_header = examples_header
+
+    @property
+    def amount_of_scenarios(self):
+        """
+            Returns the amount of example scenarios
+        """
+        return len(self.examples)
 
     def build_scenarios(self):
         """
             Builds the scenarios with the parsed Examples
 
-            Note: This must be done before mering the steps from the feature file with the step definitions
+            The scenarios are built lazily when they are accessed - this builds all of them at once.
+        """
+        return list(self.scenarios)
+
+    def build_scenario(self, row_id):
+        """
+            Builds the scenario of the given Examples row
+
+            :param int row_id: the index of the Examples row
+
+            :rtype: ExampleScenario
         """
-        for row_id, example in enumerate(self.examples):
+        example = self.examples[row_id]
+        examples = dict(zip(self.examples_header, example.data))
+        scenario_id = self.id + row_id + 1
+        scenario = ExampleScenario(scenario_id, self.keyword, "{0} - row {1}".format(self.sentence, row_id), self.path, self.line, self, example)
+        if self.background:
+            scenario.background = self.background.create_instance(parent=scenario, steps_runable=True)
+
+        for step_id, outlined_step in enumerate(self.steps):
+            sentence = self._replace_examples_in_sentence(outlined_step.sentence, examples)
+            # the steps of Examples rows from another file keep the line of their outlined step
+            line = example.line if example.path == self.path else outlined_step.line
+            step = Step(step_id + 1, sentence, outlined_step.path, line, scenario, True, context_class=outlined_step.context_class)
+            scenario.steps.append(step)
+        return scenario
+
+    def iter_example_sentences(self):
+        """
+            Yields the context sensitive sentences of the steps of every example scenario
+            without building the example scenarios.
+            The sentences are in the order of the steps in `all_steps` of the example scenario.
+
+            :rtype: list
+        """
+        # the example scenarios have no constants of their own
+        constants = self.constants
+        background_sentences = []
+        if self.background:
+            background_sentences = [
+                get_context_sensitive_sentence(expand_sentence(s.sentence, constants), s.context_class)
+                for s in self.background.all_steps]
+
+        for example in self.examples:
             examples = dict(zip(self.examples_header, example.data))
-            scenario_id = self.id + row_id + 1
-            background = None
-            scenario = ExampleScenario(scenario_id, self.keyword, "{0} - row {1}".format(self.sentence, row_id), self.path, self.line, self, example)
-            if self.background:
-                background = self.background.create_instance(parent=scenario, steps_runable=True)
-                scenario.background = background
-
-            for step_id, outlined_step in enumerate(self.steps):
-                sentence = self._replace_examples_in_sentence(outlined_step.sentence, examples)
-                step = Step(step_id + 1, sentence, outlined_step.path, example.line, scenario, True, context_class=outlined_step.context_class)
-                scenario.steps.append(step)
-            self.scenarios.append(scenario)
+            sentences = list(background_sentences)
+            for outlined_step in self.steps:
+                sentence = expand_sentence(self._replace_examples_in_sentence(outlined_step.sentence, examples), constants)
+                sentences.append(get_context_sensitive_sentence(sentence, outlined_step.context_class))
+            yield sentences
 
     @staticmethod
     def _replace_examples_in_sentence(sentence, examples):
@@ -74,15 +131,23 @@ class ScenarioOutline(Scenario):
 
             :param int column_index: the column index to get the width from
         """
+        # the widths of all columns are calculated at once for all rows instead of once per written row
+        amount = len(self.examples)
+        if amount not in self._column_widths:
+            widths = [len(x) for x in self.examples_header]
+            for example in self.examples:
+                widths = [max(width, len(x)) for width, x in zip(widths, example.data)]
+            self._column_widths = {amount: widths}
+
         try:
-            return max(max([len(x.data[column_index]) for x in self.examples]), len(self.examples_header[column_index]))
+            return self._column_widths[amount][column_index]
         except IndexError:
             raise RadishError("Invalid colum_index to get column width for ScenarioOutline '{0}'".format(self.sentence))
 
     def after_parse(self):
         """
-            Build outlined scenarios
+            Completes the Scenario Outline.
+            The outlined scenarios are built lazily when they are accessed.
         """
         Scenario.after_parse(self)
-        self.build_scenarios()
         self.complete = True
@@ -5,6 +5,7 @@
 """
 
 import re
+import functools
 
 from .model import Model
 from .exceptions import RadishError
@@ -39,12 +40,41 @@ class Step(Model):
         self.raw_text = []
         self.definition_func = None
         self.argument_match = None
+        self._call = None
         self.state = Step.State.UNTESTED
         self.failure = None
         self.runable = runable
         self.as_precondition = None
         self.as_background = None
 
+    def create_instance(self, parent):
+        """
+            Returns a copy of this Step for the given parent.
+            The copy shares the parsed table and text with this Step
+            but has its own state.
+
+            :param Model parent: the parent of the copy
+        """
+        step = Step(self.id, self.sentence, self.path, self.line, parent, self.runable, context_class=self.context_class)
+        step.table_header = self.table_header
+        step.table_data = self.table_data
+        step.table = self.table
+        step.raw_text = self.raw_text
+        return step
+
+    def bind(self):
+        """
+            Binds the step definition function of this step to this step and the arguments matched from its sentence.
+
+            The arguments are evaluated and the calling convention is decided once
+            so that running this step is a single call of the step definition function.
+            Steps are bound when they are merged. A step has to be bound again
+            after its step definition function or its argument match was changed.
+        """
+        self._call = None
+        if callable(self.definition_func):
+            self._call = bind_step_call(self, self.definition_func, self.argument_match)
+
     @property
     def context(self):
         """
@@ -59,10 +89,7 @@ class Step(Model):
 
                 * Expand constants
         """
-        sentence = self.sentence
-        for name, value in self.parent.constants:
-            sentence = sentence.replace("${{{0}}}".format(name), value)
-        return sentence
+        return expand_sentence(self.sentence, self.parent.constants)
 
     @property
     def context_sensitive_sentence(self):
@@ -70,11 +97,7 @@ class Step(Model):
         Return the context class sensitive
         step sentence.
         """
-        sentence = self.expanded_sentence
-        if self.context_class:
-            return utils.str_lreplace('and ', self.context_class.capitalize() + ' ', sentence, flags=re.IGNORECASE)
-
-        return sentence
+        return get_context_sensitive_sentence(self.expanded_sentence, self.context_class)
 
     @property
     def text(self):
@@ -85,12 +108,16 @@ class Step(Model):
 
     def _validate(self):
         """
-            Checks if the step is valid to run or not
+            Checks if the step is valid to run or not.
+            Steps which were not merged are bound to their step definition function here.
         """
 
         if not self.definition_func or not callable(self.definition_func):
             raise RadishError("The step '{0}' does not have a step definition".format(self.sentence))
 
+        if self._call is None:
+            self.bind()
+
     def run(self):
         """
             Runs the step.
@@ -100,13 +127,9 @@ class Step(Model):
             return self.state
 
         self._validate()
-        args, kwargs = self.argument_match.evaluate()
 
         try:
-            if kwargs:
-                self.definition_func(self, **kwargs)  # pylint: disable=not-callable
-            else:
-                self.definition_func(self, *args)  # pylint: disable=not-callable
+            self._call()  # pylint: disable=not-callable
         except Exception as e:  # pylint: disable=broad-except
             self.state = Step.State.FAILED
             self.failure = utils.Failure(e)
@@ -177,3 +200,67 @@ class Step(Model):
         if new_step.state is Step.State.FAILED:
             new_step.failure.exception.args = ("Step '{0}' failed: '{1}'".format(sentence, new_step.failure.exception.message),)
             raise new_step.failure.exception
+
+
+def expand_sentence(sentence, constants):
+    """
+        Returns the given step sentence with the given constants expanded
+
+        :param str sentence: the step sentence
+        :param list constants: the names and values of the constants
+
+        :rtype: str
+    """
+    for name, value in constants:
+        sentence = sentence.replace("${{{0}}}".format(name), value)
+    return sentence
+
+
+def get_context_sensitive_sentence(sentence, context_class):
+    """
+        Returns the given step sentence with a leading "and" replaced by the given context class
+
+        :param str sentence: the expanded step sentence
+        :param str context_class: the context class of the step - e.g. given
+
+        :rtype: str
+    """
+    if context_class:
+        return utils.str_lreplace('and ', context_class.capitalize() + ' ', sentence, flags=re.IGNORECASE)
+
+    return sentence
+
+
+def bind_step_call(step, func, argument_match):
+    """
+        Returns a call of the given step definition function with the given step and the evaluated arguments.
+
+        The call is a `functools.partial` because it adds no frame to the traceback of a failed step.
+        If the arguments cannot be evaluated they are evaluated again when the step is called
+        so that the error fails the step.
+
+        :param Step step: the step to call the step definition function with
+        :param function func: the step definition function
+        :param argument_match: the arguments matched from the step sentence
+
+        :returns: a function without arguments which calls the step definition function
+        :rtype: functools.partial
+    """
+    try:
+        args, kwargs = argument_match.evaluate()
+    except Exception:  # pylint: disable=broad-except
+        return functools.partial(_evaluate_and_call, func, step, argument_match)
+
+    if kwargs:
+        return functools.partial(func, step, **kwargs)
+    return functools.partial(func, step, *args)
+
+
+def _evaluate_and_call(func, step, argument_match):
+    """
+        Calls the given step definition function with the given step and the evaluated arguments
+    """
+    args, kwargs = argument_match.evaluate()
+    if kwargs:
+        return func(step, **kwargs)
+    return func(step, *args)
@@ -8,7 +8,9 @@ import re
 import inspect
 from singleton import singleton
 
+from .compat import RE_PATTERN_TYPE
 from .exceptions import RadishError, SameStepError, StepRegexError
+from .matcher import StepIndex
 
 
 @singleton()
@@ -17,11 +19,12 @@ class StepRegistry(object):
         Represents the step registry
     """
     def __init__(self):
-        self._steps = {}
+        self._steps = StepIndex()
 
     def register(self, pattern, func):
         """
             Registers a given regex with the given step function.
+            The pattern is compiled once into the step index.
         """
         if pattern in self._steps:
             raise SameStepError(pattern, self._steps[pattern], func)
@@ -75,12 +78,14 @@ class StepRegistry(object):
         """
             Clears all registered steps
         """
-        self._steps = {}
+        self._steps = StepIndex()
 
     @property
     def steps(self):
         """
             Returns all registered steps
+
+            :rtype: StepIndex
         """
         return self._steps
 
@@ -135,7 +140,7 @@ def given(pattern):
     """
         Step decorator prefixed with the Given-keyword.
     """
-    if isinstance(pattern, re._pattern_type):  # pylint: disable=protected-access
+    if isinstance(pattern, RE_PATTERN_TYPE):
         return step(re.compile(r"Given {0}".format(pattern.pattern)))
     return step("Given {0}".format(pattern))
 
@@ -144,7 +149,7 @@ def when(pattern):
     """
         Step decorator prefixed with the When-keyword.
     """
-    if isinstance(pattern, re._pattern_type):  # pylint: disable=protected-access
+    if isinstance(pattern, RE_PATTERN_TYPE):
         return step(re.compile(r"When {0}".format(pattern.pattern)))
     return step("When {0}".format(pattern))
 
@@ -153,6 +158,6 @@ def then(pattern):
     """
         Step decorator prefixed with the Then-keyword.
     """
-    if isinstance(pattern, re._pattern_type):  # pylint: disable=protected-access
+    if isinstance(pattern, RE_PATTERN_TYPE):
         return step(re.compile(r"Then {0}".format(pattern.pattern)))
     return step("Then {0}".format(pattern))
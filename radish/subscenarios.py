@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+"""
+    This module provides a lazy sequence of the Scenarios built from a Scenario Outline or Loop
+"""
+
+
+class SubScenarios(object):
+    """
+        Holds the Scenarios which are built from a Scenario Outline or Loop.
+
+        The Scenarios are built when they are accessed the first time - not when
+        the Scenario Outline or Loop is parsed. A Scenario which has run and has been reported
+        can be released: only the states, failures and times of its steps are kept.
+        If a released Scenario is accessed again it's built again with these results.
+
+        The parent must provide the amount of its Scenarios with `amount_of_scenarios`
+        and build its Scenarios with `build_scenario(index)`.
+    """
+
+    def __init__(self, parent):
+        self.parent = parent
+        #: Holds the object which binds the steps of the built scenarios to their step definitions
+        self.step_binder = None
+        self._scenarios = {}
+        self._results = {}
+
+    def __len__(self):
+        return self.parent.amount_of_scenarios
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        amount = len(self)
+        if index < 0:
+            index += amount
+        if not 0 <= index < amount:
+            raise IndexError("{0} index out of range".format(self.__class__.__name__))
+
+        scenario = self._scenarios.get(index)
+        if scenario is not None:
+            return scenario
+
+        scenario = self.build(index)
+        if index in self._results:
+            # the scenario was released - it's only built to report its results
+            self._restore_results(scenario, self._results[index])
+            return scenario
+
+        if self.step_binder is not None:
+            self.step_binder.bind(scenario)
+        self._scenarios[index] = scenario
+        return scenario
+
+    def __getstate__(self):
+        # built scenarios and step bindings are not pickled
+        return {"parent": self.parent}
+
+    def __setstate__(self, state):
+        self.__init__(state["parent"])
+
+    def states(self):
+        """
+            Yields the state of every scenario.
+            The released scenarios are not built again.
+        """
+        for index in range(len(self)):
+            results = self._results.get(index)
+            yield results[0] if results is not None else self[index].state
+
+    def build(self, index):
+        """
+            Builds the scenario with the given index without holding it
+
+            :param int index: the index of the scenario
+
+            :rtype: Scenario
+        """
+        return self.parent.build_scenario(index)
+
+    def set_step_binder(self, step_binder):
+        """
+            Sets the object which binds the steps of the built scenarios.
+            The steps of the scenarios which are already built are bound immediately.
+
+            :param step_binder: the object with a `bind(scenario)` method
+        """
+        self.step_binder = step_binder
+        for scenario in self._scenarios.values():
+            step_binder.bind(scenario)
+
+    def release(self, scenario):
+        """
+            Releases the given built scenario and only keeps its results
+
+            :param Scenario scenario: the scenario to release
+        """
+        for index, built_scenario in self._scenarios.items():
+            if built_scenario is scenario:
+                del self._scenarios[index]
+                self._results[index] = (
+                    scenario.state, scenario.starttime, scenario.endtime,
+                    tuple((s.state, self._compact_failure(s.failure), s.starttime, s.endtime) for s in scenario.all_steps)
+                )
+                return
+
+    @staticmethod
+    def _compact_failure(failure):
+        """
+            Drops the traceback frames of the failed step's exception.
+            The formatted traceback is kept in the failure.
+        """
+        exception = getattr(failure, "exception", None)
+        if exception is not None and hasattr(exception, "__traceback__"):
+            exception.__traceback__ = None
+        return failure
+
+    @staticmethod
+    def _restore_results(scenario, results):
+        """
+            Restores the results of a released scenario
+        """
+        _, scenario.starttime, scenario.endtime, step_results = results
+        for step, (state, failure, starttime, endtime) in zip(scenario.all_steps, step_results):
+            step.state = state
+            step.failure = failure
+            step.starttime = starttime
+            step.endtime = endtime
@@ -0,0 +1,570 @@
+# -*- coding: utf-8 -*-
+
+"""
+This module provides benchmarks for the radish step matcher and feature parser.
+
+The benchmarks run against synthetic step registries and feature corpora
+and report throughput and latency as JSON, so that results can be compared
+between commits::
+
+    radish-bench --patterns 1000 --features 50 --output before.json
+"""
+
+from __future__ import print_function
+
+import os
+import io
+import re
+import sys
+import json
+import shutil
+import timeit
+import platform
+import tempfile
+
+try:
+    import tracemalloc
+except ImportError:  # tracemalloc is not available on Python 2
+    tracemalloc = None
+
+from docopt import docopt
+
+from radish import __VERSION__
+from radish.core import Core
+from radish.matcher import StepIndex, match_step, merge_steps, match_step_patterns
+
+
+#: Holds the amounts of step patterns the regex engines are compared with
+REGEX_ENGINE_SIZES = (100, 1000, 10000)
+
+#: Holds the regex step pattern shapes and a sentence matching each shape
+REGEX_SHAPES = [
+    (r"Given the item{0} costs (\d+) dollars$", "Given the item{0} costs 5 dollars"),
+    (r"When I add (\d+) items of kind {0}$", "When I add 5 items of kind {0}"),
+    (r"(\w+) has (\d+) items of kind {0}$", "Bob has 5 items of kind {0}"),
+]
+
+#: Holds the results which are compared with a baseline by ``compare_results``.
+#  Every result is given by its path in the results and if higher values are better.
+GATED_RESULTS = [
+    (("parse_features", "lines_throughput"), True),
+    (("parse_features", "files_throughput"), True),
+    (("parse_features", "peak_memory"), False),
+    (("parse_features", "retained_memory"), False),
+    (("merge_steps", "steps_throughput"), True),
+]
+
+#: Holds the file name and the Scenario sentence of the precondition used by the synthetic feature corpus
+PRECONDITION_FEATURE = ("synthetic-precondition.feature", "Synthetic precondition")
+
+#: Holds the step pattern shapes of the synthetic step registries.
+#  Every shape has a pattern, a sentence with an Examples placeholder
+#  for Scenario Outlines and the value for this placeholder.
+STEP_SHAPES = [
+    (re.compile, r"Given the item{0} costs (\d+) dollars$", "Given the item{0} costs <value> dollars", "5"),
+    (str, "When I add {{:d}} items of kind {0}", "When I add <value> items of kind {0}", "5"),
+    (str, "Then the total of order {0} is {{:MathExpression}}", "Then the total of order {0} is <value>", "2 * 21"),
+    (str, "Given the user {0} is named {{name:QuotedString}}", "Given the user {0} is named <value>", '"Bob"'),
+    (re.compile, r"When (\w+) has (\d+) items of kind {0}$", "When <value> has 5 items of kind {0}", "Bob"),
+    (str, "Then the feature flag {0} is {{:Boolean}}", "Then the feature flag {0} is <value>", "yes"),
+]
+
+
+def generate_regex_steps(amount):
+    """
+    Generate the given amount of compiled regex step patterns.
+
+    The patterns come in three shapes: with distinct leading words,
+    with leading words shared by all patterns of this shape and
+    starting with a group.
+    """
+    steps = {}
+    for i in range(amount):
+        steps[re.compile(REGEX_SHAPES[i % len(REGEX_SHAPES)][0].format(i))] = i
+    return steps
+
+
+def generate_regex_sentences(amount, sentences):
+    """
+    Generate sentences which are matched by the patterns
+    created with ``generate_regex_steps``.
+    """
+    step = max(amount // sentences, 1)
+    return [REGEX_SHAPES[i % len(REGEX_SHAPES)][1].format(i) for i in range(0, amount, step)]
+
+
+def _step_definition(step, *args, **kwargs):  # pylint: disable=unused-argument
+    """
+    Step definition function of all synthetic step patterns
+    """
+    pass
+
+
+def generate_steps(amount):
+    """
+    Generate the given amount of regex and parse step patterns.
+    The parse step patterns use builtin and custom types.
+
+    :returns: the step patterns mapped to the step definition function
+    :rtype: dict
+    """
+    steps = {}
+    for i in range(amount):
+        compile_pattern, pattern = STEP_SHAPES[i % len(STEP_SHAPES)][:2]
+        steps[compile_pattern(pattern.format(i))] = _step_definition
+    return steps
+
+
+def generate_sentence(i, value=None):
+    """
+    Generate a sentence which is matched by the i-th step pattern created with ``generate_steps``.
+
+    :param int i: the index of the step pattern
+    :param str value: the value for the Examples placeholder. If None the default value is used.
+    """
+    _, _, sentence, default_value = STEP_SHAPES[i % len(STEP_SHAPES)]
+    return sentence.format(i).replace("<value>", default_value if value is None else value)
+
+
+def generate_sentences(amount, sentences):
+    """
+    Generate the given amount of sentences which are matched by
+    the step patterns created with ``generate_steps``.
+    """
+    return [generate_sentence(i % amount) for i in range(0, sentences * 7, 7)]
+
+
+def _write_feature_file(path, lines):
+    """
+    Write the given lines to a feature file
+    """
+    with io.open(path, "w", encoding="utf-8") as f:
+        f.write(u"\n".join(lines))
+
+
+def generate_feature_corpus(directory, amount, patterns, scenarios=10, steps=5, examples=10,
+                            table_rows=0, step_text_lines=0, tags=0, preconditions=0):
+    """
+    Generate a corpus of feature files which steps match the step patterns created with ``generate_steps``.
+
+    Every feature has a Background, the given amount of Scenarios
+    and one Scenario Outline with the given amount of examples.
+    The Scenarios with preconditions use a Scenario of a feature file
+    which is written to the same directory, but not part of the corpus.
+
+    :param str directory: the directory to write the feature files to
+    :param int amount: the amount of feature files
+    :param int patterns: the amount of step patterns
+    :param int scenarios: the amount of Scenarios per feature
+    :param int steps: the amount of Steps per Scenario
+    :param int examples: the amount of examples of the Scenario Outline
+    :param int table_rows: the amount of rows of the table of the first Step of every Scenario
+    :param int step_text_lines: the amount of lines of the text of the last Step of every Scenario
+    :param int tags: the amount of tags of every Scenario
+    :param int preconditions: the amount of Scenarios with a precondition per feature
+
+    :returns: the paths of the feature files
+    :rtype: list
+    """
+    if preconditions:
+        precondition_file, precondition_sentence = PRECONDITION_FEATURE
+        lines = ["Feature: Synthetic precondition feature", "",
+                 "    Scenario: {0}".format(precondition_sentence)]
+        lines.extend("        {0}".format(generate_sentence(i % patterns)) for i in range(steps))
+        _write_feature_file(os.path.join(directory, precondition_file), lines)
+
+    feature_files = []
+    i = 0
+    for feature_id in range(amount):
+        lines = ["Feature: Synthetic feature {0}".format(feature_id), "", "    Background:"]
+        lines.append("        {0}".format(generate_sentence(i % patterns)))
+        lines.append("")
+
+        for scenario_id in range(scenarios):
+            lines.extend("    @synthetic{0}".format(t) for t in range(tags))
+            if scenario_id < preconditions:
+                lines.append("    @precondition({0}: {1})".format(*PRECONDITION_FEATURE))
+            lines.append("    Scenario: Synthetic scenario {0}".format(scenario_id))
+            for step_id in range(steps):
+                i += 1
+                lines.append("        {0}".format(generate_sentence(i % patterns)))
+                if step_id == 0 and table_rows:
+                    lines.append("            | key | value |")
+                    lines.extend("            | key{0} | value {0} |".format(r) for r in range(table_rows))
+                if step_id == steps - 1 and step_text_lines:
+                    lines.append('            """')
+                    lines.extend("            Synthetic step text line {0}".format(t)
+                                 for t in range(step_text_lines))
+                    lines.append('            """')
+            lines.append("")
+
+        lines.append("    Scenario Outline: Synthetic scenario outline")
+        values = []
+        for column in range(steps):
+            i += 1
+            _, _, sentence, value = STEP_SHAPES[i % patterns % len(STEP_SHAPES)]
+            lines.append("        {0}".format(
+                sentence.format(i % patterns).replace("<value>", "<value{0}>".format(column))))
+            values.append(value)
+        lines.append("")
+        lines.append("    Examples:")
+        lines.append("        | {0} |".format(" | ".join("value{0}".format(c) for c in range(steps))))
+        for _ in range(examples):
+            lines.append("        | {0} |".format(" | ".join(values)))
+        lines.append("")
+
+        feature_file = os.path.join(directory, "synthetic{0}.feature".format(feature_id))
+        _write_feature_file(feature_file, lines)
+        feature_files.append(feature_file)
+    return feature_files
+
+
+def get_latency_stats(latencies):
+    """
+    Returns the latency statistics of the given latencies in seconds
+
+    :rtype: dict
+    """
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    return {
+        "calls": len(latencies),
+        "throughput": len(latencies) / total if total else None,
+        "mean": total / len(latencies),
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)],
+        "max": latencies[-1],
+    }
+
+
+def benchmark_match_step(steps, sentences, repeat=3):
+    """
+    Benchmark matching the given sentences with ``match_step``.
+
+    The cold latencies are measured with an empty match cache,
+    the warm latencies with a match cache containing all sentences.
+
+    :param StepIndex steps: the registered steps
+    :param list sentences: the sentences to match
+    :param int repeat: how often all sentences are matched
+
+    :rtype: dict
+    """
+    timer = timeit.default_timer
+    cold, warm = [], []
+    for _ in range(repeat):
+        for latencies in (cold, warm):
+            if latencies is cold:
+                steps.match_cache.clear()
+
+            for sentence in sentences:
+                start = timer()
+                match_step(sentence, steps)
+                latencies.append(timer() - start)
+
+    return {"cold": get_latency_stats(cold), "warm": get_latency_stats(warm)}
+
+
+def benchmark_merge_steps(features, steps, repeat=3):
+    """
+    Benchmark merging the steps of the given features with ``merge_steps``.
+    The match cache is cleared before every run.
+
+    :param list features: the parsed features
+    :param StepIndex steps: the registered steps
+    :param int repeat: how often the features are merged
+
+    :rtype: dict
+    """
+    amount_of_steps = sum(len(s.all_steps) for f in features for s in f.iter_all_scenarios())
+
+    def merge():
+        steps.match_cache.clear()
+        merge_steps(features, steps)
+
+    latencies = timeit.repeat(merge, number=1, repeat=repeat)
+    result = get_latency_stats(latencies)
+    result["steps"] = amount_of_steps
+    result["steps_throughput"] = amount_of_steps / min(latencies)
+    return result
+
+
+def count_lines(feature_files):
+    """
+    Returns the amount of lines of the given feature files
+    """
+    lines = 0
+    for feature_file in feature_files:
+        with io.open(feature_file, "r", encoding="utf-8") as f:
+            lines += sum(1 for _ in f)
+    return lines
+
+
+def benchmark_parse_features(feature_files, repeat=3):
+    """
+    Benchmark parsing the given feature files with ``Core.parse_features``.
+
+    The throughput is measured without tracing memory allocations.
+    The memory is measured in an additional run with ``tracemalloc``:
+
+        * peak_memory: the most memory allocated while parsing in bytes
+        * retained_memory: the memory still allocated by the parsed features in bytes
+
+    The memory results are None if ``tracemalloc`` is not available.
+
+    :param list feature_files: the feature files to parse
+    :param int repeat: how often the feature files are parsed
+
+    :returns: the results and the features of the last run
+    :rtype: tuple
+    """
+    timer = timeit.default_timer
+    latencies = []
+    core = None
+    for _ in range(repeat):
+        core = Core()
+        start = timer()
+        core.parse_features(feature_files, None)
+        latencies.append(timer() - start)
+
+    lines = count_lines(feature_files)
+
+    result = get_latency_stats(latencies)
+    result["features"] = len(feature_files)
+    result["lines"] = lines
+    result["files_throughput"] = len(feature_files) / min(latencies)
+    result["lines_throughput"] = lines / min(latencies)
+    result["peak_memory"], result["retained_memory"] = measure_parse_memory(feature_files)
+    return result, core.features
+
+
+def measure_parse_memory(feature_files):
+    """
+    Measure the memory allocated while parsing the given feature files with ``Core.parse_features``
+
+    :returns: the peak memory and the memory retained by the parsed features in bytes
+    :rtype: tuple
+    """
+    if tracemalloc is None:
+        return None, None
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        core = Core()
+        tracemalloc.clear_traces()
+        before, _ = tracemalloc.get_traced_memory()
+        core.parse_features(feature_files, None)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return peak - before, current - before
+
+
+def get_result(results, path):
+    """
+    Returns the result at the given path in the results or None if there is no such result
+    """
+    for key in path:
+        if not isinstance(results, dict) or key not in results:
+            return None
+        results = results[key]
+    return results
+
+
+def compare_results(baseline, report, tolerance=0.1):
+    """
+    Compare the gated results of the given report with the baseline report.
+
+    :param dict baseline: the baseline report of ``run_benchmarks``
+    :param dict report: the report of ``run_benchmarks`` to compare
+    :param float tolerance: the relative change which is tolerated - e.g. 0.1 for 10%
+
+    :returns: a description of every result which regressed more than tolerated
+    :rtype: list
+    """
+    if baseline.get("parameters") != report.get("parameters"):
+        return ["parameters: the baseline was measured with other parameters"]
+
+    regressions = []
+    for path, higher_is_better in GATED_RESULTS:
+        expected = get_result(baseline.get("results"), path)
+        actual = get_result(report.get("results"), path)
+        if not expected or actual is None:
+            continue
+
+        change = (actual - expected) / float(expected)
+        if (-change if higher_is_better else change) > tolerance:
+            regressions.append("{0}: {1:.6g} -> {2:.6g} ({3:+.1%})".format(
+                ".".join(path), expected, actual, change))
+    return regressions
+
+
+def benchmark_regex_engines(sizes=REGEX_ENGINE_SIZES, sentences=100, repeat=3):
+    """
+    Compare the time it takes to match sentences against the given
+    amounts of compiled regex step patterns with:
+
+        * loop: every pattern is searched one by one
+        * trie: only patterns which pass the literal prefix trie are searched
+        * fused: like trie, but the candidate patterns are picked by a single search with the fused regex
+
+    The match cache is bypassed.
+
+    :returns: one result dict per size with the best time per sentence in seconds
+    :rtype: list
+    """
+    results = []
+    for size in sizes:
+        index = StepIndex(generate_regex_steps(size))
+        step_patterns = list(index.step_patterns.values())
+        generated_sentences = generate_regex_sentences(size, sentences)
+
+        def match_loop():
+            for sentence in generated_sentences:
+                match_step_patterns(sentence, step_patterns)
+
+        def match_candidates():
+            for sentence in generated_sentences:
+                match_step_patterns(sentence, index.candidates(sentence))
+
+        # build the trie and the fused regex before the measurements
+        result = {"patterns": size, "sentences": len(generated_sentences)}
+        result["trie_build"] = timeit.timeit(lambda: index.trie, number=1)
+        result["fused_build"] = timeit.timeit(lambda: index.fused_regex, number=1)
+        result["loop"] = min(timeit.repeat(match_loop, number=1, repeat=repeat)) / len(generated_sentences)
+
+        index.use_fused_regex = False
+        result["trie"] = min(timeit.repeat(match_candidates, number=1, repeat=repeat)) / len(generated_sentences)
+
+        index.use_fused_regex = True
+        result["fused"] = min(timeit.repeat(match_candidates, number=1, repeat=repeat)) / len(generated_sentences)
+        results.append(result)
+    return results
+
+
+def print_regex_engine_results(results):
+    """
+    Print the results of ``benchmark_regex_engines`` as table.
+    """
+    print("{0:>9} {1:>14} {2:>14} {3:>14} {4:>14} {5:>15}".format(
+        "patterns", "loop [us]", "trie [us]", "fused [us]", "trie build [s]", "fused build [s]"))
+    for result in results:
+        print("{0:>9} {1:>14.1f} {2:>14.1f} {3:>14.1f} {4:>14.3f} {5:>15.3f}".format(
+            result["patterns"], result["loop"] * 1e6, result["trie"] * 1e6, result["fused"] * 1e6,
+            result["trie_build"], result["fused_build"]))
+
+
+def run_benchmarks(patterns=1000, sentences=1000, features=20, scenarios=10, steps=5, examples=10,
+                   repeat=3, regex_engines=False, table_rows=0, step_text_lines=0, tags=0, preconditions=0):
+    """
+    Run all benchmarks against a synthetic step registry and feature corpus
+
+    :returns: the JSON serializable results
+    :rtype: dict
+    """
+    parameters = {
+        "patterns": patterns, "sentences": sentences, "features": features, "scenarios": scenarios,
+        "steps": steps, "examples": examples, "repeat": repeat, "table_rows": table_rows,
+        "step_text_lines": step_text_lines, "tags": tags, "preconditions": preconditions
+    }
+    results = {}
+
+    index = StepIndex(generate_steps(patterns))
+    results["match_step"] = benchmark_match_step(index, generate_sentences(patterns, sentences), repeat)
+
+    directory = tempfile.mkdtemp(prefix="radish-bench-")
+    try:
+        feature_files = generate_feature_corpus(directory, features, patterns, scenarios, steps, examples,
+                                                table_rows, step_text_lines, tags, preconditions)
+        results["parse_features"], parsed_features = benchmark_parse_features(feature_files, repeat)
+        results["merge_steps"] = benchmark_merge_steps(parsed_features, index, repeat)
+    finally:
+        shutil.rmtree(directory)
+
+    if regex_engines:
+        results["regex_engines"] = benchmark_regex_engines(repeat=repeat)
+
+    return {
+        "radish": __VERSION__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "parameters": parameters,
+        "results": results,
+    }
+
+
+def main(args=None):
+    """
+Usage:
+    radish-bench [--patterns=<patterns>]
+                 [--sentences=<sentences>]
+                 [--features=<features>]
+                 [--scenarios=<scenarios>]
+                 [--steps=<steps>]
+                 [--examples=<examples>]
+                 [--table-rows=<table_rows>]
+                 [--step-text-lines=<step_text_lines>]
+                 [--tags=<tags>]
+                 [--preconditions=<preconditions>]
+                 [--repeat=<repeat>]
+                 [--regex-engines]
+                 [-o=<output> | --output=<output>]
+                 [--baseline=<baseline> [--tolerance=<tolerance>]]
+    radish-bench (-h | --help)
+    radish-bench (-v | --version)
+
+Options:
+    -h --help                       show this screen
+    -v --version                    show version
+    --patterns=<patterns>           amount of synthetic step patterns [default: 1000]
+    --sentences=<sentences>         amount of sentences to match with match_step [default: 1000]
+    --features=<features>           amount of synthetic feature files [default: 20]
+    --scenarios=<scenarios>         amount of Scenarios per feature file [default: 10]
+    --steps=<steps>                 amount of Steps per Scenario [default: 5]
+    --examples=<examples>           amount of examples of the Scenario Outline in every feature file [default: 10]
+    --table-rows=<table_rows>       amount of table rows of the first Step of every Scenario [default: 0]
+    --step-text-lines=<step_text_lines>  amount of text lines of the last Step of every Scenario [default: 0]
+    --tags=<tags>                   amount of tags of every Scenario [default: 0]
+    --preconditions=<preconditions>  amount of Scenarios with a precondition in every feature file [default: 0]
+    --repeat=<repeat>               how often every benchmark is repeated [default: 3]
+    --regex-engines                 compare the regex engines of the step matcher
+    -o=<output> --output=<output>   write the JSON results to this file instead of stdout
+    --baseline=<baseline>           fail if the results regressed compared to this JSON results file
+    --tolerance=<tolerance>         the tolerated regression compared to the baseline in percent [default: 10]
+
+(C) Copyright by Timo Furrer <tuxtimo@gmail.com>
+    """
+    arguments = docopt("radish-bench {0}\n{1}".format(__VERSION__, main.__doc__), argv=args, version=__VERSION__)
+
+    results = run_benchmarks(
+        patterns=int(arguments["--patterns"]), sentences=int(arguments["--sentences"]),
+        features=int(arguments["--features"]), scenarios=int(arguments["--scenarios"]),
+        steps=int(arguments["--steps"]), examples=int(arguments["--examples"]),
+        repeat=int(arguments["--repeat"]), regex_engines=arguments["--regex-engines"],
+        table_rows=int(arguments["--table-rows"]), step_text_lines=int(arguments["--step-text-lines"]),
+        tags=int(arguments["--tags"]), preconditions=int(arguments["--preconditions"]))
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if arguments["--output"]:
+        with io.open(arguments["--output"], "w", encoding="utf-8") as f:
+            f.write(u"{0}\n".format(output))
+    else:
+        print(output)
+
+    if arguments["--baseline"]:
+        with io.open(arguments["--baseline"], "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+        regressions = compare_results(baseline, results, float(arguments["--tolerance"]) / 100)
+        for regression in regressions:
+            print("Regression: {0}".format(regression), file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,6 +14,9 @@ import fnmatch
 import traceback
 import warnings
 import pydoc
+import datetime
+import decimal
+import fractions
 import itertools
 
 from .compat import PY2, u
@@ -184,3 +187,24 @@ def flattened_basedirs(basedirs):
     single element split by a colon.
     """
     return list(x for x in itertools.chain(*(x.split(':') for x in basedirs)) if x)
+
+
+#: Holds the types which values cannot be changed
+IMMUTABLE_TYPES = frozenset([
+    type(None), bool, int, float, complex, str, bytes, decimal.Decimal, fractions.Fraction,
+    datetime.date, datetime.datetime, datetime.time, datetime.timedelta
+] + ([long, unicode] if PY2 else []))  # noqa: F821 pylint: disable=undefined-variable
+
+
+def is_immutable(value):
+    """
+    Checks if the given value and all values it contains cannot be changed.
+    Instances of subclasses are not considered immutable because they might have attributes.
+
+    :param value: the value to check
+
+    :rtype: bool
+    """
+    if type(value) in (tuple, frozenset):
+        return all(is_immutable(x) for x in value)
+    return type(value) in IMMUTABLE_TYPES
@@ -79,6 +79,7 @@ setup(
         'console_scripts': [
             'radish = radish.main:main',
             'radish-test = radish.testing.__main__:main [testing]',
+            'radish-bench = radish.testing.benchmark:main [testing]',
         ]},
     classifiers=[
         'Development Status :: 4 - Beta',
@@ -19,6 +19,7 @@ from radish.parser import FeatureParser
 from radish.stepregistry import StepRegistry
 from radish.hookregistry import HookRegistry
 from radish.extensionregistry import ExtensionRegistry
+from radish.examplesproviderregistry import ExamplesProviderRegistry
 
 #: Holds the path to the Feature file resources
 __TEST_BASE_DIR__ = os.path.dirname(__file__)
@@ -37,6 +38,10 @@ def mock_world_config():
     arguments = {
         '--basedir': ['$PWD/radish'],
         '--bdd-xml': None,
+        '--cache': False,
+        '--cache-dir': '.radish_cache',
+        '--check-all-steps': False,
+        '--clear-cache': False,
         '--cover-append': False,
         '--cover-branches': False,
         '--cover-config-file': '.coveragerc',
@@ -48,15 +53,19 @@ def mock_world_config():
         '--cucumber-json': None,
         '--debug-after-failure': False,
         '--debug-steps': False,
+        '--discovery-jobs': '1',
         '--dry-run': False,
         '--early-exit': False,
+        '--exclude': [],
         '--expand': False,
+        '--fused-regex': False,
         '--help': False,
         '--inspect-after-failure': False,
         '--junit-xml' : None,
         '--marker': 'time.time()',
         '--no-ansi': False,
         '--no-line-jump': False,
+        '--parse-jobs': '1',
         '--profile': None,
         '--scenarios': None,
         '--shuffle': False,
@@ -84,6 +93,7 @@ def reset_registries():
     StepRegistry().clear()
     HookRegistry().reset()
     ExtensionRegistry().reset()
+    ExamplesProviderRegistry().clear()
 
 
 @pytest.fixture
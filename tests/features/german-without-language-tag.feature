@@ -0,0 +1,8 @@
+Funktionalität: Das ist eine radish Funktionalität
+    Als radish Nutzer moechte ich meine Testcases
+    auch in Deutsch schreiben koennen.
+
+    Szenario: Dies ist ein Szenario
+        Gegeben sei etwas
+        Wenn ich etwas mache
+        Dann erwarte ich etwas
@@ -0,0 +1,14 @@
+Feature: Support Scenario Outlines with Examples from a CSV file
+    Radish shall support reading the Examples
+    of Scenario Outlines from CSV files
+
+    Scenario Outline: A Scenario Outline
+        Given I have the number <x>
+        And I have the number <y>
+        When I add them up
+        Then I expect the sum to be <z>
+
+    Examples: from "scenario-outline-examples.csv"
+
+    Scenario: A Scenario after the Scenario Outline
+        Given I have the number 1
@@ -0,0 +1,7 @@
+@good
+Característica: Esta es una característica de radish
+
+    Escenario: Este es un escenario
+        Dado algo
+        Cuando hago algo
+        Entonces espero algo
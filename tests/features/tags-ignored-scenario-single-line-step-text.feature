@@ -0,0 +1,14 @@
+Feature: Ignore Scenario with a single line step text via Tag
+    Radish shall not mistake a single line step text
+    of an ignored Scenario for the start of a step text
+
+    @foo
+    Scenario: Ignored Scenario
+        Given I have the text
+            """Some single line text"""
+        When I do something
+
+    Scenario: Parsed Scenario
+        Given I have a Step
+        When I do something
+        Then I expect something
@@ -0,0 +1,18 @@
+Feature: Ignore Scenario with a step text via Tag
+    Radish shall skip the step texts
+    of ignored Scenarios as a whole
+
+    @foo
+    Scenario: Ignored Scenario
+        Given I have the feature file
+            """
+            @bar
+            Scenario: Scenario in step text
+            """
+        When I do something
+        Then I expect something
+
+    Scenario: Parsed Scenario
+        Given I have a Step
+        When I do something
+        Then I expect something
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+
+"""
+    radish
+    ~~~~~~
+
+    Behavior Driven Development tool for Python - the root from red to green
+
+    Copyright: MIT, Timo Furrer <tuxtimo@gmail.com>
+"""
+
+import os
+
+import pytest
+import tagexpressions
+
+from radish.core import Core
+from radish.cache import FeatureCache
+import radish.exceptions as errors
+
+
+def test_parse_features_in_parallel(featurefiledir):
+    """
+    Test that parsing feature files in worker processes yields the same features and ids
+    """
+    # given
+    feature_files = [os.path.join(featurefiledir, f + '.feature') for f in (
+        'feature-scenarios', 'empty-feature', 'precondition-level-2', 'scenario-outline', 'scenario-loop')]
+    sequential_core = Core()
+    parallel_core = Core()
+
+    # when
+    sequential_core.parse_features(feature_files, None)
+    parallel_core.parse_features(feature_files, None, jobs=2)
+
+    # then
+    assert [(f.id, f.path) for f in parallel_core.features] == [(f.id, f.path) for f in sequential_core.features]
+    assert [(f.id, f.path) for f in parallel_core.features_to_run] == \
+        [(f.id, f.path) for f in sequential_core.features_to_run]
+    assert [(s.sentence, s.absolute_id) for f in parallel_core.features_to_run for s in f.scenarios] == \
+        [(s.sentence, s.absolute_id) for f in sequential_core.features_to_run for s in f.scenarios]
+    precondition = parallel_core.features_to_run[1].scenarios[0].preconditions[0]
+    assert precondition.sentence == 'Grant access to personal site'
+    assert len(precondition.preconditions) == 1
+
+
+def test_parse_features_in_parallel_with_shared_precondition(tmpdir):
+    """
+    Test that a precondition feature shared by feature files parsed in worker processes is parsed once
+    """
+    # given
+    tmpdir.join('shared.feature').write(
+        'Feature: Shared precondition\n    Scenario: Login\n        Given I log in\n')
+    feature_files = []
+    for name in ('first', 'second', 'third'):
+        featurefile = tmpdir.join(name + '.feature')
+        featurefile.write('Feature: {0}\n    @precondition(shared.feature: Login)\n'
+                          '    Scenario: Use {0}\n        When I use it\n'.format(name))
+        feature_files.append(str(featurefile))
+    core = Core()
+
+    # when
+    core.parse_features(feature_files, None, jobs=2)
+
+    # then
+    assert [f.sentence for f in core.features] == ['Shared precondition', 'first', 'second', 'third']
+    templates = [f.scenarios[0].preconditions[0].parent for f in core.features_to_run]
+    assert all(t is core.features[0] for t in templates)
+
+
+def test_parse_features_in_parallel_with_syntax_error(featurefiledir):
+    """
+    Test that parsing feature files in worker processes raises the syntax error of the feature file
+    """
+    # given
+    feature_files = [os.path.join(featurefiledir, f + '.feature') for f in ('feature-scenarios', 'background-misplaced')]
+    core = Core()
+
+    # when
+    with pytest.raises(errors.FeatureFileSyntaxError) as exc:
+        core.parse_features(feature_files, None, jobs=2)
+
+    # then
+    assert str(exc.value).startswith('The Background block must be placed before any Scenario block\n')
+
+
+def test_parse_features_in_parallel_with_feature_cache(featurefiledir, tmpdir, monkeypatch):
+    """
+    Test that the worker processes use the configured feature cache directory
+    """
+    # given
+    monkeypatch.setattr(FeatureCache, 'DIRECTORY', os.path.join('nested', 'features'))
+    feature_files = [os.path.join(featurefiledir, f + '.feature') for f in ('feature-scenarios', 'scenario-outline')]
+    cache_dir = str(tmpdir.join('cache'))
+    Core(FeatureCache(cache_dir)).parse_features(feature_files, None, jobs=2)
+    core = Core(FeatureCache(cache_dir))
+
+    # when
+    core.parse_features(feature_files, None, jobs=2)
+
+    # then
+    assert len(os.listdir(os.path.join(cache_dir, 'nested', 'features'))) == 2
+    assert core.feature_cache.hits == 2
+    assert core.feature_cache.misses == 0
+
+
+@pytest.mark.parametrize('tags, expected_scenarios', [
+    (None, [(1, 'Some scenario'), (2, 'Some other scenario')]),
+    ('bar', [(1, 'Some other scenario')]),
+    ('foo and bar', []),
+], ids=[
+    'no tag expression',
+    'tag expression matching one scenario',
+    'tag expression matching no scenario',
+])
+def test_parse_cached_feature(tmpdir, tags, expected_scenarios):
+    """
+    Test that the cached features are filtered by the tag expression when they are loaded
+    """
+    # given
+    featurefile = tmpdir.join('cached.feature')
+    featurefile.write('\n'.join([
+        'Feature: Some feature',
+        '    @foo',
+        '    Scenario: Some scenario',
+        '        Given I have the number 5',
+        '',
+        '    @bar',
+        '    Scenario: Some other scenario',
+        '        Given I have the number 6',
+    ]))
+    tag_expr = tagexpressions.parse(tags) if tags else None
+    feature_cache = FeatureCache(str(tmpdir.join('cache')))
+
+    # when
+    first_feature = Core(feature_cache).parse_feature(str(featurefile), None, featureid=1)
+    second_feature = Core(feature_cache).parse_feature(str(featurefile), tag_expr, featureid=2)
+
+    # then
+    assert len(first_feature.scenarios) == 2
+    assert (feature_cache.hits, feature_cache.misses) == (1, 1)
+    if expected_scenarios:
+        assert second_feature.id == 2
+        assert [(s.id, s.sentence) for s in second_feature.scenarios] == expected_scenarios
+    else:
+        assert second_feature is None
+
+
+@pytest.mark.parametrize('precondition, expected_cache_results', [
+    ('    Scenario: Some scenario\n        Given I log "@precondition(other.feature: Login)"\n',
+     ((1, 1), [])),
+    ('    @precondition(other.feature: Login)\n    Scenario: Some scenario\n        Given I log in\n',
+     ((0, 2), ['Login'])),
+], ids=[
+    'precondition in step sentence',
+    'precondition from other feature file',
+])
+def test_parse_cached_feature_with_precondition(tmpdir, precondition, expected_cache_results):
+    """
+    Test that only features with preconditions from other feature files are not cached
+    """
+    # given
+    tmpdir.join('other.feature').write('Feature: Other feature\n    Scenario: Login\n        Given I log in\n')
+    featurefile = tmpdir.join('cached.feature')
+    featurefile.write('Feature: Some feature\n' + precondition)
+    feature_cache = FeatureCache(str(tmpdir.join('cache')))
+    Core(feature_cache).parse_feature(str(featurefile), None, featureid=1)
+
+    # when
+    feature = Core(feature_cache).parse_feature(str(featurefile), None, featureid=1)
+
+    # then
+    expected_hits_and_misses, expected_preconditions = expected_cache_results
+    assert (feature_cache.hits, feature_cache.misses) == expected_hits_and_misses
+    assert [p.sentence for p in feature.scenarios[0].preconditions] == expected_preconditions
+
+
+def test_parse_features_with_changed_cached_feature(tmpdir):
+    """
+    Test that a changed feature file is parsed again
+    """
+    # given
+    featurefile = tmpdir.join('cached.feature')
+    featurefile.write('Feature: Some feature\n    Scenario: Some scenario\n        Given I have the number 5\n')
+    feature_cache = FeatureCache(str(tmpdir.join('cache')))
+    Core(feature_cache).parse_features([str(featurefile)], None)
+    featurefile.write('Feature: Some feature\n    Scenario: Some changed scenario\n        Given I have the number 5\n')
+
+    # when
+    core = Core(feature_cache)
+    core.parse_features([str(featurefile)], None)
+
+    # then
+    assert (feature_cache.hits, feature_cache.misses) == (0, 2)
+    assert core.features_to_run[0].scenarios[0].sentence == 'Some changed scenario'
+
+
+def test_parse_shared_precondition_feature_once(featurefiledir):
+    """
+    Test that the feature of a precondition is parsed once for all scenarios which use it
+    """
+    # given
+    feature_files = [os.path.join(featurefiledir, f + '.feature') for f in (
+        'precondition-level-1', 'precondition-level-2')]
+    core = Core()
+
+    # when
+    core.parse_features(feature_files, None)
+
+    # then - the precondition feature level 0 is parsed once for level 1 and level 2
+    assert [os.path.basename(f.path) for f in core.features] == [
+        'precondition-level-0.feature', 'precondition-level-1.feature',
+        'precondition-level-1.feature', 'precondition-level-2.feature']
+    first_precondition = core.features_to_run[0].scenarios[0].preconditions[0]
+    second_precondition = core.features_to_run[1].scenarios[0].preconditions[0].preconditions[0]
+    assert first_precondition.sentence == second_precondition.sentence == 'Have a multi user setup'
+    assert first_precondition is not second_precondition
+    assert not set(id(s) for s in first_precondition.steps) & set(id(s) for s in second_precondition.steps)
+
+
+def test_parse_deep_precondition_chain(tmpdir):
+    """
+    Test that a deep chain of preconditions is not mistaken for cycling preconditions
+    """
+    # given
+    for level in range(150):
+        precondition = '    @precondition(level-{0}.feature: Level {0})\n'.format(level - 1) if level else ''
+        tmpdir.join('level-{0}.feature'.format(level)).write(
+            'Feature: Level {0}\n{1}    Scenario: Level {0}\n        Given I have the number {0}\n'.format(
+                level, precondition))
+    core = Core()
+
+    # when
+    core.parse_features([str(tmpdir.join('level-149.feature'))], None)
+
+    # then
+    steps = core.features_to_run[0].scenarios[0].all_steps
+    assert [s.sentence for s in steps] == ['Given I have the number {0}'.format(i) for i in range(150)]
+    assert [s.id for s in steps] == list(range(1, 151))
+    assert len(core.features) == 150
+
+
+def test_parse_cycling_preconditions(tmpdir):
+    """
+    Test that cycling preconditions are reported with the whole cycle
+    """
+    # given
+    for name, precondition in (('a', 'b'), ('b', 'c'), ('c', 'a')):
+        tmpdir.join(name + '.feature').write(
+            'Feature: {0}\n    @precondition({1}.feature: {1})\n    Scenario: {0}\n        Given I do some stuff\n'.format(
+                name, precondition))
+    core = Core()
+
+    # when
+    with pytest.raises(errors.FeatureFileSyntaxError) as exc:
+        core.parse_features([str(tmpdir.join('a.feature'))], None)
+
+    # then
+    assert str(exc.value).startswith(
+        "Your feature '{0}' has cycling preconditions: "
+        "{0}:2 (b.feature: b) -> {1}:2 (c.feature: c) -> {2}:2 (a.feature: a)".format(
+            tmpdir.join('a.feature'), tmpdir.join('b.feature'), tmpdir.join('c.feature')))
+
+
+def test_parse_feature_with_external_examples_not_cached(tmpdir):
+    """
+    Test that a feature with external Examples is not cached because its Examples file might change
+    """
+    # given
+    tmpdir.join('examples.csv').write('x\n1\n')
+    featurefile = tmpdir.join('external.feature')
+    featurefile.write('\n'.join([
+        'Feature: Some feature',
+        '    Scenario Outline: Some outline',
+        '        Given I have the number <x>',
+        '    Examples: from "examples.csv"',
+    ]))
+    feature_cache = FeatureCache(str(tmpdir.join('cache')))
+    Core(feature_cache).parse_features([str(featurefile)], None)
+    tmpdir.join('examples.csv').write('x\n1\n2\n')
+
+    # when
+    core = Core(feature_cache)
+    core.parse_features([str(featurefile)], None)
+
+    # then
+    assert (feature_cache.hits, feature_cache.misses) == (0, 2)
+    assert len(core.features_to_run[0].scenarios[0].scenarios) == 2
@@ -11,14 +11,18 @@
 
 from __future__ import unicode_literals
 
+import os
+
 import pytest
 
 import tagexpressions
 
 from radish.core import Core
-from radish.parser import FeatureParser
+from radish.parser import FeatureParser, Token, TokenType, load_language, can_match_tags, detect_language
 from radish.model import Tag
 from radish.scenariooutline import ScenarioOutline
+from radish.externalexamples import ExternalExamples
+from radish.examplesproviderregistry import examples_provider
 from radish.scenarioloop import ScenarioLoop
 from radish.background import Background
 import radish.exceptions as errors
@@ -58,6 +62,62 @@ def test_creating_language_agnostic_parser(language, feature_keyword, scenario_k
     assert parser.keywords.scenario == scenario_keyword
 
 
+def test_parsers_share_language(core):
+    """
+    Test that the language packs are loaded once and shared by all parsers
+    """
+    # given & when
+    first_parser = FeatureParser(core, '/', 1, language='de')
+    second_parser = FeatureParser(core, '/', 2, language='de')
+
+    # then
+    assert first_parser.keywords is second_parser.keywords
+
+
+@pytest.mark.parametrize('line, expected_token', [
+    ('# some comment', Token(TokenType.COMMENT, '# some comment', None)),
+    ('Feature: Some feature', Token(TokenType.FEATURE, 'Feature: Some feature', 'Some feature')),
+    ('Background:  Some background ', Token(TokenType.BACKGROUND, 'Background:  Some background ', 'Some background')),
+    ('Scenario: Some scenario', Token(TokenType.SCENARIO, 'Scenario: Some scenario', 'Some scenario')),
+    ('Scenario:', Token(TokenType.STEP, 'Scenario:', None)),
+    ('Scenario Outline: Some outline', Token(TokenType.SCENARIO_OUTLINE, 'Scenario Outline: Some outline',
+                                             'Some outline')),
+    ('Scenario Loop 3: Some loop', Token(TokenType.SCENARIO_LOOP, 'Scenario Loop 3: Some loop', ('Some loop', 3))),
+    ('Examples:', Token(TokenType.EXAMPLES, 'Examples:', '')),
+    ('@foo', Token(TokenType.TAG, '@foo', ('foo', None))),
+    ('@constant(foo: bar)', Token(TokenType.TAG, '@constant(foo: bar)', ('constant', 'foo: bar'))),
+    ('"""', Token(TokenType.STEP_TEXT, '"""', None)),
+    ('| foo | bar |', Token(TokenType.TABLE, '| foo | bar |', None)),
+    ('Given I have the number 5', Token(TokenType.STEP, 'Given I have the number 5', None)),
+], ids=[
+    'comment',
+    'feature',
+    'background with whitespace',
+    'scenario',
+    'scenario without sentence',
+    'scenario outline',
+    'scenario loop',
+    'examples',
+    'tag',
+    'tag with arguments',
+    'step text',
+    'table',
+    'step',
+])
+def test_tokenize_line(line, expected_token):
+    """
+    Test classifying feature file lines
+    """
+    # given
+    keywords = load_language('en')
+
+    # when
+    token = keywords.tokenize(line)
+
+    # then
+    assert token == expected_token
+
+
 def test_creating_parser_for_not_supported_lang(core):
     """
     Test creating a Parser for a not supported language
@@ -70,16 +130,89 @@ def test_creating_parser_for_not_supported_lang(core):
     assert str(exc.value) == 'Language chruesimuesi could not be found'
 
 
-def test_creating_parser_with_unsupported_lang_detection(core):
+@pytest.mark.parametrize('parser, expected_feature_keyword, expected_scenario_sentence', [
+    (('german-without-language-tag', [], {'language': None}), 'Funktionalität', 'Dies ist ein Szenario'),
+    (('spanish-without-language-tag', [], {'language': None}), 'Característica', 'Este es un escenario'),
+    (('german',), 'Funktionalität', 'Dies ist ein Szenario'),
+    (('comments',), 'Feature', None),
+], ids=[
+    'german without language tag',
+    'spanish after a tag',
+    'language tag',
+    'english after comments',
+], indirect=['parser'])
+def test_parse_featurefile_with_detected_language(parser, expected_feature_keyword, expected_scenario_sentence):
     """
-    Test creating a Parser with yet unsupported language auto detection
+    Test parsing a Feature File with a language detected from its first keyword
     """
-    # given & when
-    with pytest.raises(NotImplementedError) as exc:
-        FeatureParser(core, '/', 1, language=None)
+    # when
+    feature = parser.parse()
+
+    # then
+    assert feature.keyword == expected_feature_keyword
+    if expected_scenario_sentence:
+        assert feature.scenarios[0].sentence == expected_scenario_sentence
+
+
+@pytest.mark.parametrize('line, expected_language', [
+    (u'Funktionalität: foo', 'de'),
+    (u'Feature: foo', 'en'),
+    (u'Scenario Outline: foo', 'en'),
+    (u'Scenario Loop 10: foo', 'en'),
+    (u'Szenario Schleife 3 : foo', 'de'),
+    (u'Background :', 'en'),
+    (u'Fonctionnalité: foo', 'fr'),
+    (u'Contexto:', 'es'),
+    (u'Given I have a step', None),
+    (u'Unknown: foo', None),
+], ids=[
+    'german feature',
+    'english feature',
+    'english scenario outline',
+    'english scenario loop with iterations',
+    'german scenario loop with space before delimiter',
+    'english background with space before delimiter',
+    'french feature',
+    'keyword of multiple languages',
+    'step',
+    'unknown keyword',
+])
+def test_detecting_language_from_keyword(line, expected_language):
+    """
+    Test detecting the language of a Feature File from a keyword line
+    """
+    # when
+    language = detect_language(line)
+
+    # then
+    assert language == expected_language
+
+
+@pytest.mark.parametrize('parser', [
+    ('german-without-language-tag',)
+], indirect=['parser'])
+def test_parser_uses_english_by_default(parser):
+    """
+    Test that a Parser created without language does not detect the language
+    """
+    # when
+    with pytest.raises(errors.FeatureFileSyntaxError):
+        parser.parse()
 
     # then
-    assert str(exc.value) == 'Auto detect language is not implemented yet'
+    assert parser.keywords.feature == 'Feature'
+
+
+def test_core_parses_feature_with_detected_language(core, featurefiledir):
+    """
+    Test that the Core detects the language of Feature Files without language tag
+    """
+    # when
+    feature = core.parse_feature(os.path.join(featurefiledir, 'german-without-language-tag.feature'), None)
+
+    # then
+    assert feature.keyword == 'Funktionalität'
+    assert feature.scenarios[0].sentence == 'Dies ist ein Szenario'
 
 
 @pytest.mark.parametrize('parser', [
@@ -295,6 +428,104 @@ def test_parse_feature_with_scenario_and_examples(parser):
     assert str(exc.value).startswith("Scenario does not support Examples. Use 'Scenario Outline'")
 
 
+@pytest.mark.parametrize('parser', [
+    ('scenario-outline-csv-examples',),
+    ('scenario-outline-jsonl-examples',),
+], ids=[
+    'CSV file',
+    'JSON lines file',
+], indirect=['parser'])
+def test_parse_feature_with_scenario_outline_external_examples(parser):
+    """
+    Test parsing a Feature with a Scenario Outline with Examples from a file
+    """
+    # when
+    feature = parser.parse()
+
+    # then
+    scenario_outline = feature.scenarios[0]
+    assert isinstance(scenario_outline.examples, ExternalExamples)
+    assert scenario_outline.examples_header == ['x', 'y', 'z']
+    assert len(scenario_outline.scenarios) == 2
+    assert [s.sentence for s in scenario_outline.scenarios[1].steps] == [
+        'Given I have the number 4', 'And I have the number 5', 'When I add them up', 'Then I expect the sum to be 9']
+    assert scenario_outline.scenarios[1].example.line == 3
+    assert scenario_outline.scenarios[1].steps[0].line == 6
+    assert feature.scenarios[1].id == 4
+
+
+def test_parse_feature_with_scenario_outline_examples_provider(tmpdir):
+    """
+    Test parsing a Feature with a Scenario Outline with Examples from an Examples provider
+    """
+    # given
+    @examples_provider('numbers')
+    def numbers():
+        yield ['x', 'y']
+        for x in range(1000):
+            yield [x, x + 1]
+
+    featurefile = tmpdir.join('provider.feature')
+    featurefile.write('\n'.join([
+        'Feature: Some feature',
+        '    Scenario Outline: Some outline',
+        '        Given I have the number <x>',
+        '        And I have the number <y>',
+        '    Examples: from numbers',
+    ]))
+    parser = FeatureParser(Core(), str(featurefile), 1)
+
+    # when
+    feature = parser.parse()
+
+    # then
+    scenario_outline = feature.scenarios[0]
+    assert len(scenario_outline.scenarios) == 1000
+    assert [s.sentence for s in scenario_outline.scenarios[-1].steps] == [
+        'Given I have the number 999', 'And I have the number 1000']
+    assert scenario_outline.scenarios[-1].steps[0].line == 5
+
+
+@pytest.mark.parametrize('examples, expected_error', [
+    ('Examples: from "other-examples.csv"', "The Examples from '{0}' on line 5 have no column for the placeholders: y"),
+    ('Examples: from "missing.csv"', "Cannot find Examples file '{0}' on line 5"),
+    ('Examples: from "examples.txt"', "Unsupported Examples file '{0}' on line 5. Supported are: .csv, .jsonl, .ndjson"),
+    ('Examples: from unknown', "Examples provider 'unknown' on line 5 is not registered"),
+    ('Examples: from "examples.csv"\n        | 1 | 2 |', "The Examples from '{0}' cannot have additional rows in the feature file"),
+], ids=[
+    'missing placeholder column',
+    'missing file',
+    'unsupported file',
+    'unregistered provider',
+    'additional rows',
+])
+def test_parse_feature_with_invalid_external_examples(tmpdir, examples, expected_error):
+    """
+    Test parsing a Feature with a Scenario Outline with invalid external Examples
+    """
+    # given
+    tmpdir.join('examples.csv').write('x,y\n1,2\n')
+    tmpdir.join('other-examples.csv').write('x,z\n1,2\n')
+    tmpdir.join('examples.txt').write('x,y\n1,2\n')
+    featurefile = tmpdir.join('invalid.feature')
+    featurefile.write('\n'.join([
+        'Feature: Some feature',
+        '    Scenario Outline: Some outline',
+        '        Given I have the number <x>',
+        '        And I have the number <y>',
+        '    ' + examples,
+    ]))
+    parser = FeatureParser(Core(), str(featurefile), 1)
+    path = str(tmpdir.join(examples.split('"')[1])) if '"' in examples else None
+
+    # when
+    with pytest.raises(errors.FeatureFileSyntaxError) as exc:
+        parser.parse()
+
+    # then
+    assert str(exc.value).startswith(expected_error.format(path))
+
+
 @pytest.mark.parametrize('parser', [
     ('scenario-loop',)
 ], indirect=['parser'])
@@ -406,6 +637,51 @@ def test_parse_ignored_feature_via_tag(parser):
     assert feature is None
 
 
+@pytest.mark.parametrize('parser', [
+    ('tags-ignored-feature', [], {'tag_expr': tagexpressions.parse('not foo')})
+], indirect=['parser'])
+def test_parse_ignored_feature_stops_after_feature(parser):
+    """
+    Test that the lines after a Feature which is ignored because of a Tag are not parsed
+    """
+    # when
+    feature = parser.parse()
+
+    # then
+    assert feature is None
+    assert parser._current_line == 3
+
+
+@pytest.mark.parametrize('tag_expr, tags, expected_match', [
+    ('foo', [], True),
+    ('not foo', [], True),
+    ('not foo', ['foo'], False),
+    ('foo and bar', ['foo'], True),
+    ('foo and not bar', ['bar'], False),
+    ('foo or not bar', ['bar'], True),
+    ('(foo or bar) and not baz', ['baz', 'foo'], False),
+    ('foo and not foo', [], False),
+], ids=[
+    'Scenario Tag',
+    'Negated Scenario Tag',
+    'Negated Feature Tag',
+    'Feature and Scenario Tag',
+    'Negated Feature Tag and Scenario Tag',
+    'Negated Feature Tag or Scenario Tag',
+    'Nested expression with Feature Tags',
+    'Contradiction'
+])
+def test_can_match_tags(tag_expr, tags, expected_match):
+    """
+    Test checking if a tag expression can match any Scenario of a Feature with the given tags
+    """
+    # when
+    actual_match = can_match_tags(tagexpressions.parse(tag_expr), tags)
+
+    # then
+    assert actual_match is expected_match
+
+
 @pytest.mark.parametrize('parser', [
     ('tags-ignored-scenario', [], {'tag_expr': tagexpressions.parse('not foo')})
 ], indirect=['parser'])
@@ -422,6 +698,26 @@ def test_parse_ignored_scenario_via_tag(parser):
     assert feature.scenarios[1].sentence == 'Another parsed Scenario'
 
 
+@pytest.mark.parametrize('parser', [
+    ('tags-ignored-scenario-step-text', [], {'tag_expr': tagexpressions.parse('not foo')}),
+    ('tags-ignored-scenario-single-line-step-text', [], {'tag_expr': tagexpressions.parse('not foo')}),
+], ids=[
+    'step text containing a Scenario',
+    'single line step text',
+], indirect=['parser'])
+def test_parse_ignored_scenario_with_step_text_via_tag(parser):
+    """
+    Test parsing a Feature with an ignored Scenario which has a step text
+    """
+    # when
+    feature = parser.parse()
+
+    # then
+    assert len(feature.scenarios) == 1
+    assert feature.scenarios[0].sentence == 'Parsed Scenario'
+    assert feature.scenarios[0].id == 1
+
+
 @pytest.mark.parametrize('parser', [
     ('tags-no-feature', [], {'tag_expr': tagexpressions.parse('not foo')})
 ], indirect=['parser'])
@@ -620,6 +916,27 @@ def test_parse_scenario_precondition_same_feature(parser):
     assert len(feature.scenarios[1].preconditions) == 1
 
 
+@pytest.mark.parametrize('parser', [
+    ('precondition-same-feature',)
+], indirect=['parser'])
+def test_parse_scenario_precondition_same_feature_shares_scenario(parser, core):
+    """
+    Test that a Scenario precondition within the same Feature shares the parsed Scenario
+    """
+    # when
+    feature = parser.parse()
+
+    # then
+    template, scenario = feature.scenarios
+    precondition = scenario.preconditions[0]
+    assert precondition is not template
+    assert precondition.tags is template.tags
+    assert [s.sentence for s in precondition.steps] == [s.sentence for s in template.steps]
+    assert all(s.parent is template for s in template.steps)
+    assert [s.id for s in scenario.all_steps] == list(range(1, 8))
+    assert core.features == []
+
+
 @pytest.mark.parametrize('parser, expected_error_msg', [
     (
         ('precondition-unknown-scenario',), "Cannot import precondition scenario 'Unknown Scenario' from feature"
@@ -355,3 +355,39 @@ def test_main_cli_calls(given_featurefiles, given_cli_args, expected_exitcode, e
     # then
     assert actual_output == expected_output_string
     assert actual_exitcode == expected_exitcode
+
+
+def test_main_show_with_examples_provider(tmpdir, monkeypatch):
+    """
+    Test that radish show loads the base dir to parse Examples from an Examples provider
+    """
+    # given
+    tmpdir.join('radish', 'providers.py').write(
+        'from radish import examples_provider\n\n\n'
+        '@examples_provider("nums")\n'
+        'def nums():\n'
+        '    return [["x"], ["1"], ["2"]]\n', ensure=True)
+    featurefile = tmpdir.join('provider.feature')
+    featurefile.write(
+        'Feature: Examples provider\n'
+        '    Scenario Outline: Numbers\n'
+        '        Given I have the number <x>\n\n'
+        '    Examples: from nums\n')
+    monkeypatch.chdir(str(tmpdir))
+    monkeypatch.setenv('PWD', str(tmpdir))
+
+    original_stdout = sys.stdout
+    with tempfile.TemporaryFile(mode='w+') as tmp_stdout:
+        sys.stdout = tmp_stdout
+        try:
+            # when
+            exitcode = main(args=['show', str(featurefile), '--no-ansi'])
+        finally:
+            tmp_stdout.seek(0)
+            output = tmp_stdout.read()
+            sys.stdout = original_stdout
+
+    # then
+    assert exitcode == 0
+    assert '| 1 |' in output
+    assert '| 2 |' in output
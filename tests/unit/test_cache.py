@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+"""
+    radish
+    ~~~~~~
+
+    Behavior Driven Development tool for Python - the root from red to green
+
+    Copyright: MIT, Timo Furrer <tuxtimo@gmail.com>
+"""
+
+import re
+
+import pytest
+
+import radish.cache as cache
+import radish.matcher as matcher
+from radish.feature import Feature
+
+
+def step_a():
+    pass
+
+
+def step_b():
+    pass
+
+
+@pytest.fixture()
+def steps():
+    """
+    Fixture for registered steps
+    """
+    return matcher.StepIndex({
+        'Given I have the number {:d}': step_a,
+        re.compile(r'Given I have (\d+) numbers'): step_b
+    })
+
+
+def test_step_binding_cache_round_trip(tmpdir, steps, mocker):
+    """
+    Test that step bindings are loaded from the cache file of a previous run
+    """
+    # given
+    binding_cache = cache.StepBindingCache(str(tmpdir), 'key').load()
+    for sentence in ('Given I have the number 5', 'Given I have 4 numbers'):
+        step = mocker.MagicMock(context_sensitive_sentence=sentence)
+        matcher.merge_step(step, steps, binding_cache)
+    binding_cache.save()
+    match_step = mocker.patch('radish.matcher.match_step')
+
+    # when
+    binding_cache = cache.StepBindingCache(str(tmpdir), 'key').load()
+    step = mocker.MagicMock(context_sensitive_sentence='Given I have 4 numbers')
+    matcher.merge_step(step, steps, binding_cache)
+
+    # then
+    assert binding_cache.hits == 1
+    assert binding_cache.misses == 0
+    assert not match_step.called
+    assert step.definition_func is step_b
+    assert step.argument_match.evaluate() == (('4',), {})
+
+
+@pytest.mark.parametrize('content', [
+    None,
+    'not json at all',
+    '{"version": 1, "key": "other key", "bindings": {"Given I have 4 numbers": ["parse", "x", 0]}}',
+    '{"version": 1, "key": "key", "bindings": {"Given I have 4 numbers": [["parse"], "x", 0]}}',
+    '{"version": 1, "key": "key", "bindings": {"Given I have 4 numbers": ["parse", "Given I have a number", 0]}}',
+], ids=[
+    'missing cache file',
+    'corrupted cache file',
+    'stale cache key',
+    'invalid binding',
+    'binding to unknown step pattern',
+])
+def test_step_binding_cache_falls_back_to_matching(tmpdir, steps, mocker, content):
+    """
+    Test that steps are matched if the step binding cache cannot be used
+    """
+    # given
+    if content is not None:
+        tmpdir.join(cache.StepBindingCache.FILENAME).write(content)
+    binding_cache = cache.StepBindingCache(str(tmpdir), 'key').load()
+    step = mocker.MagicMock(context_sensitive_sentence='Given I have 4 numbers')
+
+    # when
+    matcher.merge_step(step, steps, binding_cache)
+
+    # then
+    assert binding_cache.hits == 0
+    assert step.definition_func is step_b
+    assert binding_cache.bindings['Given I have 4 numbers'] == cache.get_step_pattern_identity(re.compile(r'Given I have (\d+) numbers'))
+
+
+def test_step_modules_key_changes_with_source(tmpdir):
+    """
+    Test that the key of the step bindings changes if a step module changes
+    """
+    # given
+    module = tmpdir.join('steps.py')
+    module.write('# step a')
+    key = cache.get_step_modules_key([str(module)])
+
+    # when
+    module.write('# step b')
+
+    # then
+    assert cache.get_step_modules_key([str(module)]) != key
+
+
+def test_step_modules_key_changes_with_step_library(tmpdir):
+    """
+    Test that the key of the step bindings changes if a file implementing a step function changes
+    """
+    # given
+    module = tmpdir.join('steps.py')
+    module.write('from steplib import step_a')
+    library = tmpdir.join('steplib.py')
+    library.write('def step_a(step):\n    pass\n')
+    namespace = {}
+    exec(compile(library.read(), str(library), 'exec'), namespace)
+    key = cache.get_step_modules_key([str(module)], [namespace['step_a']])
+
+    # when
+    library.write('def step_a(step):\n    assert False\n')
+
+    # then
+    assert cache.get_step_modules_key([str(module)], [namespace['step_a']]) != key
+
+
+def test_feature_cache_round_trip(tmpdir):
+    """
+    Test writing a Feature to the cache and loading it with the same and another key
+    """
+    # given
+    feature_cache = cache.FeatureCache(str(tmpdir))
+    featurefile = str(tmpdir.join('some.feature'))
+    feature = Feature(1, 'Feature', 'Some feature', featurefile, 1)
+
+    # when
+    feature_cache.save(featurefile, 'some-key', feature)
+    loaded_feature = feature_cache.load(featurefile, 'some-key')
+    stale_feature = feature_cache.load(featurefile, 'other-key')
+
+    # then
+    assert loaded_feature.sentence == 'Some feature'
+    assert stale_feature is None
+    assert (feature_cache.hits, feature_cache.misses) == (1, 1)
+
+
+def test_feature_cache_clear(tmpdir):
+    """
+    Test clearing the Feature cache
+    """
+    # given
+    feature_cache = cache.FeatureCache(str(tmpdir))
+    featurefile = str(tmpdir.join('some.feature'))
+    feature_cache.save(featurefile, 'some-key', Feature(1, 'Feature', 'Some feature', featurefile, 1))
+
+    # when
+    feature_cache.clear()
+    feature_cache.clear()
+
+    # then
+    assert feature_cache.load(featurefile, 'some-key') is None
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+"""
+    radish
+    ~~~~~~
+
+    Behavior Driven Development tool for Python - the root from red to green
+
+    Copyright: MIT, Timo Furrer <tuxtimo@gmail.com>
+"""
+
+import ast
+
+import pytest
+
+import radish.customtyperegistry as customtyperegistry
+
+
+def test_cached_custom_type(mocker):
+    """
+    Test that conversions of recurring texts are cached
+    """
+    # given
+    func = mocker.MagicMock(side_effect=int, pattern=r'\d+', __name__='number_type')
+    converter = customtyperegistry.cached_custom_type(func, maxsize=2)
+
+    # when
+    values = [converter(text) for text in ['1', '2', '1', '3', '2']]
+
+    # then
+    assert values == [1, 2, 1, 3, 2]
+    assert [c[0][0] for c in func.call_args_list] == ['1', '2', '3', '2']
+    assert converter.pattern == r'\d+'
+    assert list(converter.cache) == ['3', '2']
+
+
+@pytest.mark.parametrize('text, expected_value', [
+    ('5', 5.0),
+    (' 1 + 2 ', 3.0),
+    ('5 / 2', 2.5),
+    ('7 // 2', 3.0),
+    ('2 * -3', -6.0),
+    ('7 % 3', 1.0),
+    ('2**10', 1024.0),
+    ('1e3 - 0.5', 999.5),
+], ids=[
+    'number',
+    'addition with whitespace',
+    'division',
+    'floor division',
+    'multiplication with negative number',
+    'modulo',
+    'power',
+    'scientific notation',
+])
+def test_math_expression_type(text, expected_value):
+    """
+    Test converting math expressions
+    """
+    # when
+    value = customtyperegistry.CustomTypeRegistry().custom_types['MathExpression'](text)
+
+    # then
+    assert value == expected_value
+
+
+#: Holds a math expression for every supported operator
+MATH_OPERATOR_EXPRESSIONS = {
+    ast.Add: '1.5 + 2',
+    ast.Sub: '1 - 2.5',
+    ast.Mult: '3 * 2.5',
+    ast.Div: '7.0 / 2',
+    ast.FloorDiv: '-7 // 2',
+    ast.Mod: '-7 % 3',
+    ast.Pow: '2 ** -2',
+    ast.UAdd: '+3',
+    ast.USub: '-3e2',
+}
+
+
+def test_math_expression_type_evaluates_like_eval():
+    """
+    Test that math expressions are evaluated like eval evaluated them before for every supported operator
+    """
+    # given
+    math_expression_type = customtyperegistry.CustomTypeRegistry().custom_types['MathExpression']
+
+    # when
+    values = dict((op, math_expression_type(text)) for op, text in MATH_OPERATOR_EXPRESSIONS.items())
+
+    # then
+    assert set(MATH_OPERATOR_EXPRESSIONS) == set(customtyperegistry.MATH_OPERATORS)
+    assert values == dict((op, float(eval(text))) for op, text in MATH_OPERATOR_EXPRESSIONS.items())
+
+
+@pytest.mark.parametrize('text', [
+    '1 +',
+    'e',
+    '()',
+    '9**9**9',
+], ids=[
+    'invalid syntax',
+    'name',
+    'tuple',
+    'too large exponent',
+])
+def test_invalid_math_expression(text):
+    """
+    Test that invalid math expressions are not evaluated
+    """
+    # when
+    with pytest.raises(ValueError) as exc:
+        customtyperegistry.evaluate_math_expression(text)
+
+    # then
+    assert text in str(exc.value)
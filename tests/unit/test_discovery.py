@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+"""
+    radish
+    ~~~~~~
+
+    Behavior Driven Development tool for Python - the root from red to green
+
+    Copyright: MIT, Timo Furrer <tuxtimo@gmail.com>
+"""
+
+import os
+
+import pytest
+
+from radish.discovery import FeatureFinder, IgnorePattern
+
+
+@pytest.fixture
+def feature_tree(tmpdir):
+    """
+    Fixture to create a directory tree with feature files
+    """
+    for path in ['b.feature', 'a.feature', 'notes.txt', 'sub/c.feature', 'sub/build/d.feature',
+                 'node_modules/pkg/e.feature', 'other/build/f.feature', 'other/g.feature']:
+        tmpdir.join(path).ensure()
+    return tmpdir
+
+
+def get_relative_paths(root, paths):
+    """
+    Returns the given paths relative to the given root
+    """
+    return [os.path.relpath(p, str(root)).replace(os.sep, '/') for p in paths]
+
+
+@pytest.mark.parametrize('jobs', [1, 3], ids=['sequential', 'threaded'])
+def test_finding_feature_files_sorted(feature_tree, jobs):
+    """
+    Test finding all feature files in a directory tree in sorted order
+    """
+    # given
+    finder = FeatureFinder(jobs=jobs)
+
+    # when
+    feature_files = finder.find(str(feature_tree))
+
+    # then
+    assert get_relative_paths(feature_tree, feature_files) == [
+        'a.feature', 'b.feature', 'node_modules/pkg/e.feature', 'other/build/f.feature', 'other/g.feature',
+        'sub/build/d.feature', 'sub/c.feature']
+
+
+@pytest.mark.parametrize('excludes, ignore_file, expected_feature_files', [
+    (['node_modules'], None,
+     ['a.feature', 'b.feature', 'other/build/f.feature', 'other/g.feature', 'sub/build/d.feature', 'sub/c.feature']),
+    (['build/', 'a.*'], None,
+     ['b.feature', 'node_modules/pkg/e.feature', 'other/g.feature', 'sub/c.feature']),
+    (['sub/build', 'other/g.*'], None,
+     ['a.feature', 'b.feature', 'node_modules/pkg/e.feature', 'other/build/f.feature', 'sub/c.feature']),
+    ([], ('sub', '# generated\n\nbuild/\n'),
+     ['a.feature', 'b.feature', 'node_modules/pkg/e.feature', 'other/build/f.feature', 'other/g.feature',
+      'sub/c.feature']),
+    (['node_modules/'], ('', '/other\n*/c.feature\n'),
+     ['a.feature', 'b.feature', 'sub/build/d.feature']),
+], ids=[
+    'exclude directory name',
+    'exclude directories only and file names',
+    'exclude relative paths',
+    'ignore file in sub directory',
+    'exclude and ignore file in root directory',
+])
+def test_finding_feature_files_with_ignore_patterns(feature_tree, excludes, ignore_file, expected_feature_files):
+    """
+    Test finding the feature files in a directory tree without the ignored files and directories
+    """
+    # given
+    if ignore_file:
+        directory, patterns = ignore_file
+        feature_tree.join(directory, '.radishignore').write(patterns)
+    finder = FeatureFinder(excludes)
+
+    # when
+    feature_files = finder.find(str(feature_tree))
+
+    # then
+    assert get_relative_paths(feature_tree, feature_files) == expected_feature_files
+
+
+def test_ignored_directories_are_not_searched(feature_tree, mocker):
+    """
+    Test that ignored directories are pruned before they are searched
+    """
+    # given
+    finder = FeatureFinder(['node_modules', 'build'])
+    search_directory = mocker.spy(finder, '_search_directory')
+
+    # when
+    finder.find(str(feature_tree))
+
+    # then
+    searched = get_relative_paths(feature_tree, [c[0][0][0] for c in search_directory.call_args_list])
+    assert sorted(searched) == ['.', 'other', 'sub']
+
+
+@pytest.mark.parametrize('pattern, name, path, is_dir, expected_match', [
+    ('build', 'build', '/root/a/build', False, True),
+    ('build/', 'build', '/root/a/build', False, False),
+    ('build/', 'build', '/root/a/build', True, True),
+    ('a/build', 'build', '/root/a/build', True, True),
+    ('/build', 'build', '/root/a/build', True, False),
+    ('*.feature', 'x.feature', '/root/a/x.feature', False, True),
+], ids=[
+    'name',
+    'directory pattern does not match file',
+    'directory pattern matches directory',
+    'relative path',
+    'anchored pattern in sub directory',
+    'wildcard',
+])
+def test_ignore_pattern_matches(pattern, name, path, is_dir, expected_match):
+    """
+    Test matching files and directories with an ignore pattern
+    """
+    # given
+    ignore_pattern = IgnorePattern(pattern, '/root')
+
+    # when
+    match = ignore_pattern.matches(name, path, is_dir)
+
+    # then
+    assert match == expected_match
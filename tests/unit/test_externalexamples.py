@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+"""
+    radish
+    ~~~~~~
+
+    Behavior Driven Development tool for Python - the root from red to green
+
+    Copyright: MIT, Timo Furrer <tuxtimo@gmail.com>
+"""
+
+import pickle
+
+import pytest
+
+from radish.externalexamples import ExternalExamples, CSVExamples, JSONLinesExamples, ProviderExamples
+from radish.examplesproviderregistry import examples_provider
+from radish.exceptions import RadishError
+
+
+def test_csv_examples_are_streamed(tmpdir, mocker):
+    """
+    Test that the rows of CSV Examples are read in order without reading the file again
+    """
+    # given
+    examplesfile = tmpdir.join('examples.csv')
+    examplesfile.write('x,y\n' + ''.join('{0},"{1}, {1}"\n'.format(i, i + 1) for i in range(100)))
+    examples = CSVExamples(str(examplesfile), 'foo.feature', 1)
+    read_rows = mocker.spy(examples, '_read_rows')
+
+    # when
+    header = examples.header
+    rows = [examples[i] for i in range(len(examples))]
+
+    # then - the file is read once for the header and the amount of rows and once for all rows
+    assert read_rows.call_count == 2
+    assert header == ['x', 'y']
+    assert rows[-1].data == ['99', '100, 100']
+    assert rows[-1].line == 101
+    assert rows[-1].path == str(examplesfile)
+
+
+def test_provider_examples_read_header_and_amount_of_rows_once():
+    """
+    Test that the Examples provider is called once for the header and the amount of rows and once per iteration
+    """
+    # given
+    calls = []
+
+    @examples_provider('counted')
+    def counted():
+        calls.append(None)
+        return [['x'], ['1'], ['2']]
+
+    examples = ProviderExamples('counted', 'foo.feature', 1)
+
+    # when
+    examples.validate(['x'])
+    amount = len(examples)
+    first_rows = [e.data for e in examples]
+    second_rows = [e.data for e in examples]
+
+    # then
+    assert amount == len(examples) == 2
+    assert examples.header == ['x']
+    assert first_rows == second_rows == [['1'], ['2']]
+    assert len(calls) == 3
+
+
+def test_external_examples_are_abstract():
+    """
+    Test that external Examples without a source cannot be created
+    """
+    # when & then
+    with pytest.raises(TypeError):
+        ExternalExamples('foo.feature', 1)
+
+
+def test_external_examples_read_previous_row_again(tmpdir):
+    """
+    Test that a previous row of external Examples is read from the beginning again
+    """
+    # given
+    examplesfile = tmpdir.join('examples.jsonl')
+    examplesfile.write('{"x": 1, "y": true}\n{"x": 2, "y": null}\n{"x": 3, "y": "foo"}\n')
+    examples = JSONLinesExamples(str(examplesfile), 'foo.feature', 1)
+
+    # when
+    last_row = examples[-1]
+    first_row = examples[0]
+
+    # then
+    assert last_row.data == ['3', 'foo']
+    assert first_row.data == ['1', 'true']
+    assert [e.data for e in examples] == [['1', 'true'], ['2', 'null'], ['3', 'foo']]
+    with pytest.raises(IndexError):
+        examples[3]
+
+
+def test_external_examples_row_with_invalid_columns(tmpdir):
+    """
+    Test that an external Examples row with another amount of columns than the header is reported
+    """
+    # given
+    examplesfile = tmpdir.join('examples.csv')
+    examplesfile.write('x,y\n1,2\n3\n')
+    examples = CSVExamples(str(examplesfile), 'foo.feature', 1)
+
+    # when
+    with pytest.raises(RadishError) as exc:
+        list(examples)
+
+    # then
+    assert str(exc.value) == 'The Examples row {0}:3 has 1 columns but the header has 2'.format(examplesfile)
+
+
+def test_external_examples_pickled_without_cursor(tmpdir):
+    """
+    Test that external Examples are pickled without their open cursor
+    """
+    # given
+    examplesfile = tmpdir.join('examples.csv')
+    examplesfile.write('x\n1\n2\n')
+    examples = CSVExamples(str(examplesfile), 'foo.feature', 1)
+    examples[0]
+
+    # when
+    unpickled_examples = pickle.loads(pickle.dumps(examples))
+
+    # then
+    assert len(unpickled_examples) == 2
+    assert unpickled_examples[1].data == ['2']
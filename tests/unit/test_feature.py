@@ -9,9 +9,12 @@
     Copyright: MIT, Timo Furrer <tuxtimo@gmail.com>
 """
 
+import pickle
+
 import pytest
 
 from radish.feature import Feature
+from radish.scenario import Scenario
 from radish.scenariooutline import ScenarioOutline
 from radish.scenarioloop import ScenarioLoop
 from radish.stepmodel import Step
@@ -134,6 +137,47 @@ def test_feature_get_scenario_as_item(scenario_sentences, needle_scenario, expec
         assert actual_scenario.sentence == expected_scenario
 
 
+def test_feature_scenario_index_in_sync(mocker):
+    """
+    Test that the Scenario lookup of a Feature is in sync with its Scenarios
+    """
+    # given
+    feature = Feature(1, 'Feature', 'I am a feature', 'foo.feature', 1, tags=None)
+    foo, bar, baz = [mocker.MagicMock(sentence=s) for s in ('foo', 'bar', 'baz')]
+    feature.scenarios.extend([foo, bar])
+
+    # when & then
+    assert feature['foo'] is foo
+    feature.scenarios.append(baz)
+    assert feature['baz'] is baz
+    feature.scenarios.remove(foo)
+    assert 'foo' not in feature
+    feature.scenarios[0] = foo
+    assert feature['foo'] is foo
+    assert 'bar' not in feature
+    feature.scenarios = [bar]
+    assert 'bar' in feature
+    assert 'foo' not in feature
+
+
+def test_feature_scenario_index_pickled():
+    """
+    Test that the Scenario lookup of a pickled Feature is in sync with its Scenarios
+    """
+    # given
+    feature = Feature(1, 'Feature', 'I am a feature', 'foo.feature', 1, tags=None)
+    feature.scenarios.append(Scenario(1, 'Scenario', 'foo', 'foo.feature', 2, feature))
+    assert 'foo' in feature
+
+    # when
+    unpickled_feature = pickle.loads(pickle.dumps(feature))
+    unpickled_feature.scenarios.append(Scenario(2, 'Scenario', 'bar', 'foo.feature', 3, feature))
+
+    # then
+    assert unpickled_feature['foo'] is unpickled_feature.scenarios[0]
+    assert unpickled_feature['bar'] is unpickled_feature.scenarios[1]
+
+
 def test_feature_all_scenarios(mocker):
     """
     Test getting expanded list of all Scenarios of a Feature
@@ -248,6 +292,30 @@ def test_feature_state(mocker):
     assert feature.state == Step.State.PASSED
 
 
+def test_feature_state_of_released_scenario_loop_iterations(mocker):
+    """
+    Test that the state of a Feature is known from the released Scenario Loop iterations without building them again
+    """
+    # given
+    feature = Feature(1, 'Feature', 'I am a feature', 'foo.feature', 1, tags=None)
+    scenario_loop = ScenarioLoop(1, 'Scenario Loop', 'Iterations', 'I am a Scenario Loop', 'foo.feature', 2, parent=feature)
+    scenario_loop.steps.append(Step(1, 'Given I have 1', 'foo.feature', 3, scenario_loop, False))
+    scenario_loop.iterations = 3
+    feature.scenarios.append(scenario_loop)
+    for iteration in scenario_loop.scenarios:
+        iteration.steps[0].state = Step.State.FAILED if iteration.iteration == 1 else Step.State.PASSED
+        scenario_loop.scenarios.release(iteration)
+    build_scenario = mocker.spy(scenario_loop, 'build_scenario')
+
+    # when
+    state = feature.state
+
+    # then
+    assert state == Step.State.FAILED
+    assert build_scenario.call_count == 0
+    assert scenario_loop.scenarios[1].steps[0].state == Step.State.FAILED
+
+
 @pytest.mark.parametrize('scenario_ids, scenario_choice, expected_has_to_run', [
     ((1, 2, 3), [], True),
     ((1, 2, 3), [1], True),
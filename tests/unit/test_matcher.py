@@ -17,6 +17,10 @@ from parse_type.cfparse import Parser
 
 import radish.matcher as matcher
 import radish.exceptions as errors
+from radish.feature import Feature
+from radish.scenarioloop import ScenarioLoop
+from radish.scenariooutline import ScenarioOutline
+from radish.stepmodel import Step
 
 
 @pytest.mark.parametrize('regex, string, expected_args, expected_kwargs', [
@@ -70,6 +74,37 @@ def test_parse_step_arguments_object(parse_pattern, string, expected_args, expec
     assert actual_kwargs == expected_kwargs
 
 
+@pytest.mark.parametrize('converter, expected_conversions', [
+    (int, 1),
+    (lambda text: [text], 2),
+], ids=[
+    'immutable converted arguments',
+    'mutable converted arguments',
+])
+def test_parse_step_arguments_evaluated_once(converter, expected_conversions):
+    """
+    Test that immutable converted arguments of a ParseStepArguments object are only evaluated once
+    """
+    # given
+    conversions = []
+
+    def number_type(text):
+        conversions.append(text)
+        return converter(text)
+    number_type.pattern = r'\d+'
+    parser = Parser('Given I have the number {number:Number}', {'Number': number_type})
+    args = matcher.ParseStepArguments(parser.search('Given I have the number 5', evaluate_result=False))
+
+    # when
+    first_args, first_kwargs = args.evaluate()
+    second_args, second_kwargs = args.evaluate()
+
+    # then
+    assert first_kwargs == second_kwargs
+    assert first_kwargs is not second_kwargs
+    assert len(conversions) == expected_conversions
+
+
 @pytest.mark.parametrize('given_sentence, given_steps, expected_argument_match_type, expected_func_match', [
     (
         'Given I have a number', {re.compile('Given I have a number'): 1}, matcher.RegexStepArguments, 1
@@ -160,6 +195,33 @@ def test_match_sentence_with_steps(given_sentence, given_steps, expected_argumen
     assert match.func == expected_func_match
 
 
+def test_merging_only_steps_to_run(mocker):
+    """
+    Test that only the steps of the chosen Scenarios are merged
+    """
+    # given
+    def create_scenario(absolute_id, steps):
+        return mocker.MagicMock(
+            all_steps=steps, has_to_run=lambda choice: not choice or absolute_id in choice)
+
+    precondition_step = mocker.MagicMock(runable=True, context_sensitive_sentence='Given I have 1 number')
+    first_step = mocker.MagicMock(runable=True, context_sensitive_sentence='Given I have 2 numbers')
+    second_step = mocker.MagicMock(runable=True, context_sensitive_sentence='Given I have 3 numbers')
+    template_step = mocker.MagicMock(runable=False, context_sensitive_sentence='Given I have <n> numbers')
+    feature = mocker.MagicMock(scenarios=[
+        create_scenario(1, [precondition_step, first_step]),
+        create_scenario(2, [precondition_step, second_step, template_step]),
+        create_scenario(3, [precondition_step, second_step]),
+    ])
+    merge_step = mocker.patch('radish.matcher.merge_step')
+
+    # when
+    matcher.merge_steps([feature], {}, scenario_choice=[2, 3])
+
+    # then
+    assert [c[0][0] for c in merge_step.call_args_list] == [precondition_step, second_step]
+
+
 @pytest.mark.parametrize('given_sentence, given_steps', [
     ('Given I have the number', {re.compile('Given I have a number'): 1}),
     ('Given I have the number foo', {re.compile(r'Given I have number (\d+)'): 1}),
@@ -230,6 +292,87 @@ def test_merging_step(given_sentence, given_steps, expected_func, expected_args,
     assert actual_kwargs == expected_kwargs
 
 
+def test_merging_scenario_loop_steps_once(mocker):
+    """
+    Test that the steps of a Scenario Loop are merged once for all iterations
+    """
+    # given
+    feature = Feature(1, 'Feature', 'I am a feature', 'foo.feature', 1, tags=None)
+    scenario_loop = ScenarioLoop(1, 'Scenario Loop', 'Iterations', 'I am a Scenario Loop', 'foo.feature', 2, parent=feature)
+    scenario_loop.steps.extend([
+        Step(1, 'Given I have the number 5', 'foo.feature', 3, scenario_loop, False),
+        Step(2, 'When I add them up', 'foo.feature', 4, scenario_loop, False),
+    ])
+    scenario_loop.iterations = 1000
+    feature.scenarios.append(scenario_loop)
+    steps = {'Given I have the number {:d}': 1, 'When I add them up': 2}
+    match_step = mocker.spy(matcher, 'match_step')
+
+    # when
+    matcher.merge_steps([feature], steps)
+    first_iteration = scenario_loop.scenarios[0]
+    last_iteration = scenario_loop.scenarios[-1]
+
+    # then
+    assert match_step.call_count == 2
+    assert [s.definition_func for s in last_iteration.steps] == [1, 2]
+    assert last_iteration.steps[0].argument_match is first_iteration.steps[0].argument_match
+    assert last_iteration.steps[0].argument_match.evaluate() == ((5,), {})
+
+
+def create_scenario_outline(rows):
+    """
+    Create a Feature with a Scenario Outline with the given Examples rows
+    """
+    feature = Feature(1, 'Feature', 'I am a feature', 'foo.feature', 1, tags=None)
+    scenario_outline = ScenarioOutline(1, 'Scenario Outline', 'Examples', 'I am a Scenario Outline', 'foo.feature', 2,
+                                       parent=feature)
+    scenario_outline.steps.extend([
+        Step(1, 'Given I have the number <number>', 'foo.feature', 3, scenario_outline, False),
+        Step(2, 'When I add <operand>', 'foo.feature', 4, scenario_outline, False),
+    ])
+    scenario_outline.examples_header = ['number', 'operand']
+    scenario_outline.examples = [ScenarioOutline.Example(row, 'foo.feature', 6 + i) for i, row in enumerate(rows)]
+    feature.scenarios.append(scenario_outline)
+    return feature, scenario_outline
+
+
+def test_merging_scenario_outline_steps_without_building_examples(mocker):
+    """
+    Test that the steps of the examples of a Scenario Outline are merged without building the examples
+    """
+    # given
+    feature, scenario_outline = create_scenario_outline([[str(i), 'them up'] for i in range(100)])
+    steps = {'Given I have the number {:d}': 1, 'When I add them up': 2}
+    build_scenario = mocker.spy(scenario_outline, 'build_scenario')
+    match_step = mocker.spy(matcher, 'match_step')
+
+    # when
+    matcher.merge_steps([feature], steps)
+    example = scenario_outline.scenarios[42]
+
+    # then
+    assert build_scenario.call_count == 1
+    assert match_step.call_count == 2
+    assert [s.definition_func for s in example.steps] == [1, 2]
+    assert example.steps[0].argument_match.evaluate() == ((42, ), {})
+
+
+def test_merging_scenario_outline_with_unmatched_example_step():
+    """
+    Test failure when the step of an example of a Scenario Outline cannot be merged
+    """
+    # given
+    feature, _ = create_scenario_outline([['1', 'them up'], ['2', 'them down']])
+    steps = {'Given I have the number {:d}': 1, 'When I add them up': 2}
+
+    # when
+    with pytest.raises(errors.StepDefinitionNotFoundError) as exc:
+        matcher.merge_steps([feature], steps)
+
+    # then
+    assert "step 'When I add them down' in foo.feature:7" in str(exc.value)
+
 @pytest.mark.parametrize('given_sentence, given_steps', [
     ('Given I have the number', {re.compile('Given I have a number'): 1}),
     ('Given I have the number foo', {re.compile(r'Given I have number (\d+)'): 1}),
@@ -256,3 +399,385 @@ def test_no_step_definition_merge(given_sentence, given_steps, mocker):
 
     # then
     assert str(exc.value).startswith('Cannot find step definition for step')
+
+
+def test_step_index_compiles_step_patterns():
+    """
+    Test that a StepIndex keeps a compiled Step pattern for every registered Step
+    """
+    # given
+    regex_pattern = re.compile(r'Given I have the number (\d+)')
+    parse_pattern = 'Given I have the number {:d}'
+
+    # when
+    index = matcher.StepIndex({regex_pattern: 1})
+    index[parse_pattern] = 2
+
+    # then
+    assert len(index) == 2
+    assert isinstance(index.step_patterns[regex_pattern], matcher.RegexStepPattern)
+    assert isinstance(index.step_patterns[parse_pattern], matcher.ParseStepPattern)
+    assert index.step_patterns[parse_pattern].func == 2
+    assert index.generation == 2
+
+    # when
+    del index[regex_pattern]
+
+    # then
+    assert list(index.step_patterns.keys()) == [parse_pattern]
+    assert index.generation == 3
+
+
+def test_parse_step_pattern_compiled_once(mocker):
+    """
+    Test that a Parse Step pattern is only compiled once and rebuilt when the custom types change
+    """
+    # given
+    parser_mock = mocker.patch('radish.matcher.Parser', side_effect=Parser)
+    index = matcher.StepIndex({'Given I have the number {:d}': 1})
+
+    # when
+    matcher.match_step('Given I have the number 5', index)
+    matcher.match_step('Given I have the number 6', index)
+
+    # then
+    assert parser_mock.call_count == 1
+
+    # when - the custom types change
+    mocker.patch.object(matcher.CustomTypeRegistry(), 'generation', -1)
+    match = matcher.match_step('Given I have the number 7', index)
+
+    # then
+    assert parser_mock.call_count == 2
+    assert match.argument_match.evaluate() == ((7,), {})
+
+
+def test_match_step_caches_matches():
+    """
+    Test that recurring sentences are only matched once
+    """
+    # given
+    index = matcher.StepIndex({'Given I have the number {:d}': 1})
+
+    # when
+    first_match = matcher.match_step('Given I have the number 5', index)
+    second_match = matcher.match_step('Given I have the number 5', index)
+    not_matching = matcher.match_step('Given I have no number', index)
+    not_matching_again = matcher.match_step('Given I have no number', index)
+
+    # then
+    assert first_match is second_match
+    assert not_matching is None
+    assert not_matching_again is None
+    assert index.match_cache.info() == matcher.MatchCacheInfo(
+        hits=2, misses=2, maxsize=matcher.MatchCache.DEFAULT_MAXSIZE, currsize=2)
+
+
+def test_match_cache_invalidated_by_new_steps():
+    """
+    Test that cached matches are not used anymore if Steps are registered
+    """
+    # given
+    index = matcher.StepIndex({'Given I have a number': 1})
+    first_match = matcher.match_step('Given I have a number', index)
+
+    # when
+    index['Given I have a'] = 2
+    second_match = matcher.match_step('Given I have a number', index)
+
+    # then
+    assert first_match is not second_match
+    assert second_match.func == 1
+    assert index.match_cache.misses == 2
+
+
+def test_match_cache_discards_least_recently_used_entries():
+    """
+    Test that the match cache is bounded
+    """
+    # given
+    cache = matcher.MatchCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+
+    # when
+    cache.get('a')
+    cache.put('c', 3)
+
+    # then
+    assert len(cache) == 2
+    assert cache.get('a') == 1
+    assert cache.get('b') is matcher.MatchCache.MISSING
+    assert cache.get('c') == 3
+
+
+@pytest.mark.parametrize('regex, expected_prefix', [
+    (re.compile(r'Given I have the number (\d+)'), 'Given I have the number '),
+    (re.compile(r'^Given I have a number$'), 'Given I have a number'),
+    (re.compile(r'Given I have the numbers? (\d+)'), 'Given I have the number'),
+    (re.compile(r'Given I have 5\.0 apples'), 'Given I have 5.0 apples'),
+    (re.compile(r'Given I have (a|the) number'), 'Given I have '),
+    (re.compile(r'Given I have a number|When I add'), ''),
+    (re.compile(r'Given I have a number', re.VERBOSE), ''),
+    (re.compile(r'\w+ I have a number'), ''),
+], ids=[
+    'Regex with group',
+    'Regex with anchors',
+    'Regex with quantified literal',
+    'Regex with escaped literal',
+    'Regex with alternation in group',
+    'Regex with top-level alternation',
+    'Verbose Regex',
+    'Regex starting with special sequence',
+])
+def test_regex_literal_prefix(regex, expected_prefix):
+    """
+    Test getting the literal prefix of a Regex Step pattern
+    """
+    # when
+    prefix = matcher.get_regex_literal_prefix(regex)
+
+    # then
+    assert prefix == expected_prefix
+
+
+@pytest.mark.parametrize('pattern, expected_prefix', [
+    ('Given I have the number {:d}', 'Given I have the number '),
+    ('Given I have a number', 'Given I have a number'),
+    ('Given I have {{braces}} and {:d}', 'Given I have {braces} and '),
+    ('{:d} is a number', ''),
+], ids=[
+    'Parse pattern with field',
+    'Parse pattern without field',
+    'Parse pattern with escaped braces',
+    'Parse pattern starting with field',
+])
+def test_parse_literal_prefix(pattern, expected_prefix):
+    """
+    Test getting the literal prefix of a Parse Step pattern
+    """
+    # when
+    prefix = matcher.get_parse_literal_prefix(pattern)
+
+    # then
+    assert prefix == expected_prefix
+
+
+@pytest.mark.parametrize('regex, expected_suffix', [
+    (re.compile(r'Given I have (\d+) apples'), ' apples'),
+    (re.compile(r'^Given I have a number$'), 'Given I have a number'),
+    (re.compile(r'Given I have (\d+) apples?'), ''),
+    (re.compile(r'Given I have (\d+) apple{1,2}s\Z'), 's'),
+    (re.compile(r'Given I have [0-9] apples\.'), ' apples.'),
+    (re.compile(r'Given I have a number|When I add'), ''),
+    (re.compile(r'Given I have (\d+)'), ''),
+], ids=[
+    'Regex with group',
+    'Regex with anchors',
+    'Regex with quantified literal',
+    'Regex with counted quantifier',
+    'Regex with character class and escaped literal',
+    'Regex with top-level alternation',
+    'Regex ending with group',
+])
+def test_regex_literal_suffix(regex, expected_suffix):
+    """
+    Test getting the literal suffix of a Regex Step pattern
+    """
+    # when
+    suffix = matcher.get_regex_literal_suffix(regex)
+
+    # then
+    assert suffix == expected_suffix
+
+
+@pytest.mark.parametrize('pattern, expected_suffix', [
+    ('Given I have {:d} apples', ' apples'),
+    ('Given I have a number', 'Given I have a number'),
+    ('Given I have {:d} {{braces}}', ' {braces}'),
+    ('Given I have {:d}', ''),
+], ids=[
+    'Parse pattern with field',
+    'Parse pattern without field',
+    'Parse pattern with escaped braces',
+    'Parse pattern ending with field',
+])
+def test_parse_literal_suffix(pattern, expected_suffix):
+    """
+    Test getting the literal suffix of a Parse Step pattern
+    """
+    # when
+    suffix = matcher.get_parse_literal_suffix(pattern)
+
+    # then
+    assert suffix == expected_suffix
+
+
+def test_template_step_pattern():
+    """
+    Test matching the Steps of a Scenario Outline with the Step pattern of the first example
+    """
+    # given
+    steps = matcher.StepIndex()
+    steps[re.compile(r'Given I have (\d+) apples')] = 'apples'
+    steps[re.compile(r'Given I have 0 pears')] = 'no pears'
+    steps[re.compile(r'Given I have (\d+) pears')] = 'pears'
+    sentences = ['Given I have 1 pears', 'Given I have 0 pears', 'Given I have 5 pears', 'Given I have 5 big pears']
+    first_match = matcher.match_step(sentences[0], steps)
+
+    # when
+    template_step_pattern = matcher.TemplateStepPattern(first_match.step_pattern, steps, sentences)
+    matches = [template_step_pattern.match(s) for s in sentences[1:]]
+
+    # then
+    assert matches[0].func == 'no pears'
+    assert matches[1].func == 'pears'
+    assert matches[1].argument_match.evaluate() == (('5', ), {})
+    assert matches[2] is None
+    assert len(template_step_pattern._rivals) == 1
+
+
+def test_step_index_candidates():
+    """
+    Test filtering the candidate Step patterns of a sentence with the literal prefix trie
+    """
+    # given
+    index = matcher.StepIndex()
+    index['{:d} is a number'] = 1
+    index['Given I have the number {:d}'] = 2
+    index['When I add the numbers'] = 3
+    index['I have the number {:d}'] = 4
+    index[re.compile(r'Given I have (\d+) apples')] = 5
+    index['Given I add the numbers'] = 6
+
+    # when
+    candidates = index.candidates('given I have the number 5')
+
+    # then
+    assert [c.func for c in candidates] == [1, 2, 4, 5]
+
+
+@pytest.mark.parametrize('regex, expected_pattern', [
+    (re.compile(r'Given I have a number'), 'Given I have a number'),
+    (re.compile(r'Given I have (\d+) and (?P<number>\d+)'), r'Given I have (?:\d+) and (?:\d+)'),
+    (re.compile(r'Given I have [(]\d+[)] (?:apples)'), r'Given I have [(]\d+[)] (?:apples)'),
+    (re.compile(r'Given I have (\d+) and \1'), None),
+    (re.compile(r'(?i)Given I have a number'), None),
+], ids=[
+    'Regex without groups',
+    'Regex with capturing groups',
+    'Regex with parentheses in character class and non-capturing group',
+    'Regex with backreference',
+    'Regex with global inline flag',
+])
+def test_fusable_pattern(regex, expected_pattern):
+    """
+    Test preparing a Regex to be fused with others
+    """
+    # when
+    pattern = matcher.get_fusable_pattern(regex)
+
+    # then
+    assert pattern == expected_pattern
+
+
+@pytest.mark.parametrize('sentence, expected_candidates', [
+    ('Bob has 5 apples', [2]),
+    ('Given Bob has 5 pears', [1, 2, 3]),
+    ('Bob has no apples', []),
+], ids=[
+    'whole sentence matched',
+    'part of the sentence matched',
+    'no match',
+])
+def test_fused_regex_candidates(sentence, expected_candidates):
+    """
+    Test picking the candidate Regex Step patterns of a sentence with a single search in the fused Regex
+    """
+    # given
+    step_patterns = [
+        matcher.RegexStepPattern(re.compile(r'(\w+) has (\d+) pears'), 1),
+        matcher.RegexStepPattern(re.compile(r'(\w+) has (\d+) apples$'), 2),
+        matcher.RegexStepPattern(re.compile(r'(?P<name>\w+) has (\d+) (?:apples|pears)'), 3),
+        matcher.RegexStepPattern(re.compile(r'(\w+) has (\d+) apples', re.IGNORECASE), 4),
+        matcher.RegexStepPattern(re.compile(r'(\w+) has (\d+) and \2 pears'), 5),
+        matcher.ParseStepPattern('{} has {:d} apples', 6),
+    ]
+    fused_regex = matcher.FusedRegex(step_patterns)
+
+    # when
+    candidates = fused_regex.candidates(sentence)
+
+    # then
+    assert fused_regex.fused_step_patterns == set(step_patterns[:3])
+    assert sorted(c.func for c in candidates) == expected_candidates
+
+
+def test_step_index_candidates_with_fused_regex():
+    """
+    Test that the fused Regex picks the same Step pattern as matching all Step patterns
+    """
+    # given
+    steps = {
+        re.compile(r'Given (\w+) has (\d+) apples'): 1,
+        re.compile(r'(\w+) has (\d+) apples'): 2,
+        re.compile(r'(\w+) has (\d+) (\w+)$'): 3,
+        re.compile(r'(\w+) HAS (\d+) pears', re.IGNORECASE): 4,
+        re.compile(r'When (\w+) eats (\d+) and \2 pears'): 5,
+        'Given {} has {:d} apples and pears': 6,
+        'When {} eats {:d} pears': 7,
+    }
+    sentences = [
+        'Given Bob has 5 apples', 'Bob has 5 apples', 'Bob has 5 pears', 'Bob has 5 apples and pears',
+        'Given Bob has 5 apples and pears', 'When Bob eats 5 and 5 pears', 'When Bob eats 5 pears',
+        'When Bob has 5 kiwis and more', 'Bob has no apples',
+    ]
+    index = matcher.StepIndex(steps)
+    fused_index = matcher.StepIndex(steps)
+    fused_index.use_fused_regex = True
+
+    # when
+    matches = [matcher.match_step(s, index) for s in sentences]
+    fused_matches = [matcher.match_step(s, fused_index) for s in sentences]
+
+    # then
+    assert [m and m.func for m in fused_matches] == [m and m.func for m in matches]
+    assert [m and m.argument_match.evaluate() for m in fused_matches] == \
+        [m and m.argument_match.evaluate() for m in matches]
+    assert len(fused_index.fused_regex.candidates('Given Bob has 5 apples')) == 1
+
+
+def test_fused_regex_is_rebuilt_after_registering_steps():
+    """
+    Test that the fused Regex is rebuilt lazily after the Step index has changed
+    """
+    # given
+    index = matcher.StepIndex({re.compile(r'(\w+) has (\d+) apples'): 1})
+    index.use_fused_regex = True
+    fused_regex = index.fused_regex
+
+    # when
+    index[re.compile(r'(\w+) has (\d+) pears')] = 2
+    match = matcher.match_step('Bob has 5 pears', index)
+
+    # then
+    assert index.fused_regex is not fused_regex
+    assert index.fused_regex is index.fused_regex
+    assert match.func == 2
+
+def test_match_step_patterns_without_cache():
+    """
+    Test matching a sentence with the given Step patterns without the match cache
+    """
+    # given
+    index = matcher.StepIndex()
+    index[re.compile(r'Given I have (\d+) apples')] = 1
+    index['Given I have {:d} apples and pears'] = 2
+
+    # when
+    step_match = matcher.match_step_patterns('Given I have 5 apples and pears', list(index.step_patterns.values()))
+
+    # then
+    assert step_match.func == 2
+    assert step_match.step_pattern is matcher.match_step('Given I have 5 apples and pears', index).step_pattern
+    assert index.match_cache.info().currsize == 1
@@ -276,3 +276,61 @@ def test_scenario_after_parse_logic(mocker):
     assert all(step.as_background for step in background.steps)
     # then - check as_precondition flags
     assert all(step.as_precondition for step in precondition_scenario.steps)
+
+
+def test_scenario_create_instance():
+    """
+    Test creating a copy of a Scenario to use it as precondition
+    """
+    # given
+    feature = Feature(1, 'Feature', 'I am a feature', 'foo.feature', 1)
+    background = Background('Background', 'I am a Background', 'foo.feature', 1, None)
+    background.steps.append(Step(1, 'Given I am a background step', 'foo.feature', 2, None, True))
+    scenario = Scenario(1, 'Scenario', 'I am a Scenario', 'foo.feature', 3, parent=feature, background=background)
+    step = Step(2, 'When I am a step', 'foo.feature', 4, scenario, True)
+    step.table_header = ['foo']
+    step.table_data.append(['bar'])
+    step.raw_text.append('some text')
+    scenario.steps.append(step)
+    scenario.after_parse()
+
+    # when
+    instance = scenario.create_instance()
+
+    # then
+    assert instance.parent is feature
+    assert instance.sentence == scenario.sentence
+    assert [s.sentence for s in instance.all_steps] == [s.sentence for s in scenario.all_steps]
+    assert all(s.parent is instance for s in instance.all_steps)
+    assert not set(id(s) for s in instance.all_steps) & set(id(s) for s in scenario.all_steps)
+    assert instance.all_steps[0].as_background is instance.background
+    assert instance.steps[0].table_data is step.table_data
+    assert instance.steps[0].raw_text is step.raw_text
+
+
+def test_scenario_create_instances_of_same_precondition():
+    """
+    Test that every copy of a Scenario used as precondition has its own Background steps
+    """
+    # given
+    feature = Feature(1, 'Feature', 'I am a feature', 'foo.feature', 1)
+    background = Background('Background', 'I am a Background', 'foo.feature', 1, None)
+    background.steps.append(Step(1, 'Given I am a background step', 'foo.feature', 2, None, True))
+    precondition = Scenario(1, 'Scenario', 'I am a precondition', 'foo.feature', 3, parent=feature,
+                            background=background)
+    precondition.steps.append(Step(2, 'When I am a step', 'foo.feature', 4, precondition, True))
+    precondition.after_parse()
+
+    # when
+    first = precondition.create_instance()
+    second = precondition.create_instance()
+
+    # then
+    assert first.background is not second.background
+    assert first.background.steps[0] is not second.background.steps[0]
+    for instance in (first, second):
+        background_step = instance.all_steps[0]
+        assert background_step in instance.background.steps
+        assert background_step.parent is instance
+        assert background_step.as_background is instance.background
+        assert instance.background.parent is instance
@@ -123,3 +123,25 @@ def test_scenarioloop_afterparse_logic(mocker):
     # then - expect 2 built Scenarios
     assert len(scenario_loop.scenarios) == 2
     assert scenario_loop.complete is True
+
+
+def test_scenarioloop_scenarios_are_built_on_access(mocker):
+    """
+    Test that the Scenarios of a Scenario Loop are built when they are accessed
+    """
+    # given
+    scenario_loop = ScenarioLoop(1, 'Scenario Loop', 'Iterations', 'I am a Scenario Loop', 'foo.feature', 1, parent=None,
+                                 tags=None, preconditions=None, background=None)
+    scenario_loop.steps.append(mocker.MagicMock(sentence='Given I have 1', path='foo.feature'))
+    scenario_loop.iterations = 100000
+    build_scenario = mocker.spy(scenario_loop, 'build_scenario')
+
+    # when
+    scenario_loop.after_parse()
+    last_scenario = scenario_loop.scenarios[-1]
+
+    # then - only the accessed Scenario is built
+    assert len(scenario_loop.scenarios) == 100000
+    assert build_scenario.call_count == 1
+    assert last_scenario.id == 100001
+    assert last_scenario.sentence == 'I am a Scenario Loop - iteration 99999'
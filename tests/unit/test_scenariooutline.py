@@ -11,6 +11,7 @@
 
 import pytest
 
+from radish.feature import Feature
 from radish.scenariooutline import ScenarioOutline
 from radish.examplescenario import ExampleScenario
 from radish.background import Background
@@ -116,6 +117,38 @@ def test_building_scenariooutline_scenarios_with_background(mocker):
     assert scenario_outline.scenarios[1].background.sentence == 'I am a Background'
 
 
+def test_scenariooutline_example_sentences_without_building_scenarios(mocker):
+    """
+    Test that the Step sentences of the Example Scenarios are the same as the ones of the built Scenarios
+    """
+    # given
+    feature = Feature(1, 'Feature', 'I am a feature', 'foo.feature', 1, tags=None)
+    feature.context.constants = [('unit', 'EUR')]
+    background = Background('Background', 'I am a Background', 'foo.feature', 1, parent=feature)
+    background.steps.append(Step(1, 'Given I have 0 ${unit}', 'foo.feature', 2, background, False, context_class='given'))
+    scenario_outline = ScenarioOutline(1, 'Scenario Outline', 'Examples', 'I am a Scenario Outline', 'foo.feature', 3,
+                                       parent=feature, tags=None, preconditions=None, background=background)
+    scenario_outline.context.constants = [('amount', '<foo>')]
+    scenario_outline.steps.extend([
+        Step(1, 'and I have <foo> ${unit}', 'foo.feature', 4, scenario_outline, False, context_class='given'),
+        Step(2, 'When I add ${amount} and <bar>', 'foo.feature', 5, scenario_outline, False, context_class='when'),
+    ])
+    scenario_outline.examples_header = ['foo', 'bar']
+    scenario_outline.examples = [
+        ScenarioOutline.Example(['1', '${unit}'], 'foo.feature', 7),
+        ScenarioOutline.Example(['3', '4'], 'foo.feature', 8),
+    ]
+    build_scenario = mocker.spy(scenario_outline, 'build_scenario')
+
+    # when
+    sentences = list(scenario_outline.iter_example_sentences())
+
+    # then
+    assert build_scenario.call_count == 0
+    assert sentences == [[s.context_sensitive_sentence for s in e.all_steps] for e in scenario_outline.scenarios]
+    assert sentences[0] == ['Given I have 0 EUR', 'Given I have 1 EUR', 'When I add <foo> and EUR']
+
+
 def test_scenariooutline_example_colum_width():
     """
     Test calculation for maximum width of Example columns
@@ -195,3 +228,70 @@ def test_scenariooutline_afterparse_logic(mocker):
     # then - expect 2 built Scenarios
     assert len(scenario_outline.scenarios) == 2
     assert scenario_outline.complete is True
+
+
+def test_scenariooutline_scenarios_are_built_on_access(mocker):
+    """
+    Test that the Scenarios of a Scenario Outline are built when they are accessed
+    """
+    # given
+    scenario_outline = ScenarioOutline(1, 'Scenario Outline', 'Examples', 'I am a Scenario Outline', 'foo.feature', 1, parent=None,
+                                       tags=None, preconditions=None, background=None)
+    scenario_outline.steps.append(mocker.MagicMock(sentence='Given I have <foo>', path='foo.feature'))
+    scenario_outline.examples_header = ['foo']
+    scenario_outline.examples = [ScenarioOutline.Example([str(i)], 'foo.feature', i) for i in range(3)]
+    build_scenario = mocker.spy(scenario_outline, 'build_scenario')
+
+    # when
+    scenario_outline.after_parse()
+    last_scenario = scenario_outline.scenarios[-1]
+
+    # then - only the accessed Scenario is built and it's built once
+    assert len(scenario_outline.scenarios) == 3
+    assert build_scenario.call_count == 1
+    assert last_scenario.sentence == 'I am a Scenario Outline - row 2'
+    assert scenario_outline.scenarios[2] is last_scenario
+    assert build_scenario.call_count == 1
+
+
+def test_scenariooutline_released_scenario_keeps_results(mocker):
+    """
+    Test that a released Scenario of a Scenario Outline is built again with its results
+    """
+    # given
+    scenario_outline = ScenarioOutline(1, 'Scenario Outline', 'Examples', 'I am a Scenario Outline', 'foo.feature', 1, parent=None,
+                                       tags=None, preconditions=None, background=None)
+    scenario_outline.steps.append(mocker.MagicMock(sentence='Given I have <foo>', path='foo.feature'))
+    scenario_outline.examples_header = ['foo']
+    scenario_outline.examples = [ScenarioOutline.Example(['1'], 'foo.feature', 1)]
+    scenario = scenario_outline.scenarios[0]
+    scenario.steps[0].state = Step.State.FAILED
+    scenario.steps[0].failure = 'some failure'
+
+    # when
+    scenario_outline.scenarios.release(scenario)
+    reported_scenario = scenario_outline.scenarios[0]
+
+    # then
+    assert reported_scenario is not scenario
+    assert reported_scenario.steps[0].sentence == 'Given I have 1'
+    assert reported_scenario.steps[0].state == Step.State.FAILED
+    assert reported_scenario.steps[0].failure == 'some failure'
+
+
+def test_scenariooutline_example_colum_width_with_changed_examples():
+    """
+    Test that the cached width of Example columns changes with the Examples
+    """
+    # given
+    scenario_outline = ScenarioOutline(1, 'Scenario Outline', 'Examples', 'I am a Scenario Outline', 'foo.feature', 1, parent=None,
+                                       tags=None, preconditions=None, background=None)
+    scenario_outline.examples_header = ['foo']
+    scenario_outline.examples = [ScenarioOutline.Example(['Peter'], 'foo.feature', 1)]
+    assert scenario_outline.get_column_width(0) == len('Peter')
+
+    # when
+    scenario_outline.examples.append(ScenarioOutline.Example(['Spiderman'], 'foo.feature', 2))
+
+    # then
+    assert scenario_outline.get_column_width(0) == len('Spiderman')
@@ -9,9 +9,13 @@
     Copyright: MIT, Timo Furrer <tuxtimo@gmail.com>
 """
 
+import re
+
 import pytest
+from parse_type.cfparse import Parser
 
 from radish.stepmodel import Step
+from radish.matcher import RegexStepArguments, ParseStepArguments
 from radish.exceptions import RadishError
 
 
@@ -270,6 +274,123 @@ def test_run_debug_step_function_with_exception(debug_or_run, mocker, mock_utils
     assert step.failure.name == 'AssertionError'
 
 
+@pytest.mark.parametrize('converter, expected_conversions', [
+    (int, 1),
+    (lambda text: [int(text)], 3),
+], ids=[
+    'immutable converted arguments',
+    'mutable converted arguments',
+])
+def test_run_steps_sharing_argument_match(converter, expected_conversions, mocker):
+    """
+    Test that Steps sharing an argument match only convert immutable arguments once
+    """
+    # given
+    conversions = []
+
+    def number_type(text):
+        conversions.append(text)
+        return converter(text)
+    number_type.pattern = r'\d+'
+    parser = Parser('I have the number {number:Number}', {'Number': number_type})
+    argument_match = ParseStepArguments(parser.search('I have the number 5', evaluate_result=False))
+    step_func = mocker.MagicMock()
+    steps = [Step(i, 'I am a Step', 'foo.feature', 1, parent=None, runable=True, context_class=None) for i in range(3)]
+    for step in steps:
+        step.definition_func = step_func
+        step.argument_match = argument_match
+        step.bind()
+
+    # when
+    states = [step.run() for step in steps]
+
+    # then
+    assert states == [Step.State.PASSED] * 3
+    assert len(conversions) == expected_conversions
+    assert step_func.call_args_list == [mocker.call(s, number=converter('5')) for s in steps]
+
+
+def test_run_bound_step_without_evaluating_arguments(mocker):
+    """
+    Test that running a bound Step only calls the step function
+    """
+    # given
+    step = Step(1, 'I am a Step', 'foo.feature', 1, parent=None, runable=True, context_class=None)
+    step.definition_func = mocker.MagicMock()
+    step.argument_match = mocker.MagicMock()
+    step.argument_match.evaluate.return_value = ((1, 2), {})
+    step.bind()
+
+    # when
+    state = step.run()
+
+    # then
+    assert state == Step.State.PASSED
+    assert step.argument_match.evaluate.call_count == 1
+    step.definition_func.assert_called_once_with(step, 1, 2)
+
+
+def test_run_step_with_arguments_failing_to_evaluate(mocker):
+    """
+    Test that a Step fails when it runs if its arguments cannot be evaluated when it's bound
+    """
+    # given
+    step = Step(1, 'I am a Step', 'foo.feature', 1, parent=None, runable=True, context_class=None)
+    step.definition_func = mocker.MagicMock()
+    step.argument_match = mocker.MagicMock()
+    step.argument_match.evaluate.side_effect = ValueError('invalid number')
+    step.bind()
+
+    # when
+    state = step.run()
+
+    # then
+    assert state == Step.State.FAILED
+    assert step.failure.reason == 'invalid number'
+    assert not step.definition_func.called
+
+
+def test_failed_step_traceback_without_wrapper_frames():
+    """
+    Test that the traceback of a failed Step goes straight from running the Step to the step function
+    """
+    # given
+    def failing_step(step, number):
+        assert number == '2'
+
+    step = Step(1, 'I am a Step', 'foo.feature', 1, parent=None, runable=True, context_class=None)
+    step.definition_func = failing_step
+    step.argument_match = RegexStepArguments(re.search(r'I am (\d) Step', 'I am 1 Step'))
+
+    # when
+    step.run()
+
+    # then
+    assert step.state == Step.State.FAILED
+    frames = [line.rsplit(' in ', 1)[1] for line in step.failure.traceback.splitlines() if line.startswith('  File')]
+    assert frames == ['run', 'failing_step']
+
+
+def test_run_step_with_new_definition_func(mocker):
+    """
+    Test that a Step calls the new definition function after it was changed and bound again
+    """
+    # given
+    step = Step(1, 'I am a Step', 'foo.feature', 1, parent=None, runable=True, context_class=None)
+    step.definition_func = mocker.MagicMock()
+    step.argument_match = mocker.MagicMock()
+    step.argument_match.evaluate.return_value = ((1, ), {})
+    step.run()
+
+    # when
+    step.definition_func = new_func = mocker.MagicMock()
+    step.bind()
+    step.run()
+
+    # then
+    new_func.assert_called_once_with(step, 1)
+
+
 def test_skip_a_step():
     """
     Test skipping a Step
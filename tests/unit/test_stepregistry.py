@@ -268,3 +268,23 @@ def test_getting_pattern_of_specific_func(stepregistry):
     assert pattern_a == 'step_pattern_a'
     assert pattern_b == 'step_pattern_b'
     assert pattern_c == 'Unknown'
+
+
+def test_registered_steps_are_compiled(stepregistry):
+    """
+    Test that registered Steps are kept as compiled Step patterns
+    """
+    # given
+    def step_a(): pass
+
+    # when
+    stepregistry.register('step_pattern_a', step_a)
+
+    # then
+    assert stepregistry.steps.step_patterns['step_pattern_a'].func == step_a
+
+    # when
+    stepregistry.clear()
+
+    # then
+    assert not stepregistry.steps.step_patterns
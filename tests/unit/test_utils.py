@@ -30,3 +30,33 @@ def test_flattened_basedirs(basedirs, expected_basedirs):
 
     # then
     assert actual_basedirs == expected_basedirs
+
+
+@pytest.mark.parametrize('value, expected_immutable', [
+    (1, True),
+    ('foo', True),
+    (None, True),
+    ((1, ('foo', 2.5)), True),
+    ([1], False),
+    ((1, [2]), False),
+    ({'foo': 1}, False),
+    (type('Number', (int, ), {})(1), False),
+], ids=[
+    'integer',
+    'string',
+    'None',
+    'nested tuple',
+    'list',
+    'tuple with list',
+    'dict',
+    'instance of subclass',
+])
+def test_is_immutable(value, expected_immutable):
+    """
+    Test checking if values cannot be changed
+    """
+    # when
+    immutable = utils.is_immutable(value)
+
+    # then
+    assert immutable is expected_immutable
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+"""
+    radish
+    ~~~~~~
+
+    Behavior Driven Development tool for Python - the root from red to green
+
+    Copyright: MIT, Timo Furrer <tuxtimo@gmail.com>
+"""
+
+import json
+
+import pytest
+
+import radish.testing.benchmark as benchmark
+from radish.matcher import StepIndex, match_step
+
+
+def test_generated_regex_sentences_match_generated_steps():
+    """
+    Test that every generated sentence is matched by a generated Regex Step pattern
+    """
+    # given
+    steps = benchmark.generate_regex_steps(30)
+
+    # when
+    sentences = benchmark.generate_regex_sentences(30, 10)
+
+    # then
+    assert len(steps) == 30
+    assert len(sentences) == 10
+    assert all(any(p.match(s) for p in steps) for s in sentences)
+
+
+def test_benchmark_regex_engines():
+    """
+    Test running the Regex engine benchmark
+    """
+    # when
+    results = benchmark.benchmark_regex_engines(sizes=(10, 20), sentences=5, repeat=1)
+
+    # then
+    assert [r['patterns'] for r in results] == [10, 20]
+    assert all(r['loop'] > 0 and r['trie'] > 0 and r['fused'] > 0 for r in results)
+    assert all(r['trie_build'] >= 0 and r['fused_build'] >= 0 for r in results)
+
+
+def test_generated_sentences_match_generated_steps():
+    """
+    Test that every generated sentence is matched by a generated Step pattern
+    """
+    # given
+    steps = StepIndex(benchmark.generate_steps(12))
+
+    # when
+    sentences = benchmark.generate_sentences(12, 24)
+
+    # then
+    assert len(sentences) == 24
+    assert all(match_step(s, steps) for s in sentences)
+
+
+def test_run_benchmarks():
+    """
+    Test running all benchmarks against a synthetic step registry and feature corpus
+    """
+    # when
+    report = benchmark.run_benchmarks(patterns=12, sentences=10, features=2, scenarios=2, steps=3,
+                                      examples=2, repeat=1)
+
+    # then
+    json.dumps(report)
+    assert report['parameters']['patterns'] == 12
+    assert report['results']['match_step']['cold']['calls'] == 10
+    assert report['results']['parse_features']['features'] == 2
+    assert report['results']['parse_features']['lines'] > 0
+    # 2 features with the Steps of 2 Scenarios, 1 Scenario Outline and its 2 examples
+    assert report['results']['merge_steps']['steps'] == 2 * (2 * 3 + 3 + 2 * 3)
+
+
+def test_generated_feature_corpus_with_tables_step_texts_tags_and_preconditions(tmpdir):
+    """
+    Test that a generated feature corpus with all optional elements is parsed
+    """
+    # given
+    feature_files = benchmark.generate_feature_corpus(str(tmpdir), 2, 12, scenarios=3, steps=2, examples=4,
+                                                      table_rows=3, step_text_lines=2, tags=2, preconditions=1)
+
+    # when
+    _, parsed_features = benchmark.benchmark_parse_features(feature_files, repeat=1)
+
+    # then - the feature file of the precondition is parsed, too
+    assert len(parsed_features) == 3
+    features = [f for f in parsed_features if f.path in feature_files]
+    assert len(features) == 2
+    first_scenario, second_scenario = features[0].scenarios[:2]
+    assert [t.name for t in first_scenario.tags] == ['synthetic0', 'synthetic1', 'precondition']
+    assert first_scenario.preconditions[0].sentence == benchmark.PRECONDITION_FEATURE[1]
+    assert not second_scenario.preconditions
+    assert len(first_scenario.steps[0].table) == 3
+    assert first_scenario.steps[-1].raw_text == ['Synthetic step text line 0', 'Synthetic step text line 1']
+    assert len(features[0].scenarios[-1].scenarios) == 4
+
+
+def test_benchmark_parse_features(tmpdir):
+    """
+    Test benchmarking parsing feature files with Core.parse_features
+    """
+    # given
+    feature_files = benchmark.generate_feature_corpus(str(tmpdir), 3, 12, scenarios=2, steps=2, examples=2)
+
+    # when
+    result, parsed_features = benchmark.benchmark_parse_features(feature_files, repeat=2)
+
+    # then
+    assert result['calls'] == 2
+    assert result['features'] == len(parsed_features) == 3
+    assert result['lines'] == benchmark.count_lines(feature_files)
+    assert result['files_throughput'] > 0
+    assert result['lines_throughput'] == pytest.approx(result['files_throughput'] * result['lines'] / 3)
+    if benchmark.tracemalloc is not None:
+        assert result['peak_memory'] >= result['retained_memory'] > 0
+
+
+@pytest.mark.parametrize('results, expected_regressions', [
+    ({'parse_features': {'lines_throughput': 95.0, 'peak_memory': 1050}}, []),
+    ({'parse_features': {'lines_throughput': 80.0, 'peak_memory': 1000}},
+     ['parse_features.lines_throughput: 100 -> 80 (-20.0%)']),
+    ({'parse_features': {'lines_throughput': 100.0, 'peak_memory': 1200}},
+     ['parse_features.peak_memory: 1000 -> 1200 (+20.0%)']),
+    ({'parse_features': {'lines_throughput': 200.0, 'peak_memory': None}}, []),
+], ids=[
+    'within tolerance',
+    'throughput regression',
+    'memory regression',
+    'faster without memory results',
+])
+def test_comparing_benchmark_results(results, expected_regressions):
+    """
+    Test comparing benchmark results with a baseline
+    """
+    # given
+    baseline = {'parameters': {'features': 1}, 'results': {
+        'parse_features': {'lines_throughput': 100.0, 'peak_memory': 1000}}}
+    report = {'parameters': {'features': 1}, 'results': results}
+
+    # when
+    regressions = benchmark.compare_results(baseline, report, tolerance=0.1)
+
+    # then
+    assert regressions == expected_regressions
+
+
+def test_comparing_benchmark_results_with_other_parameters():
+    """
+    Test that benchmark results measured with other parameters than the baseline are reported
+    """
+    # given
+    baseline = {'parameters': {'features': 1}, 'results': {}}
+    report = {'parameters': {'features': 2}, 'results': {}}
+
+    # when
+    regressions = benchmark.compare_results(baseline, report)
+
+    # then
+    assert regressions == ['parameters: the baseline was measured with other parameters']